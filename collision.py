@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import math
+
+import pygame
+
+import settings
+from world import (
+    get_field_boss_arena_door_rect,
+    get_field_boss_arena_rect,
+    get_field_boss_arena_wall_rects,
+    get_field_house_solid_rects,
+    get_room3_table_rect,
+    get_shopkeeper_rect,
+)
+
+# Gates decide when a rect takes part in collision; None means always.
+GATE_DOOR = "door"  # boss door shut, or the spirit is holding the exit
+GATE_SPIRIT = "spirit"  # post-boss spirit is standing in the doorway
+
+
+def push_circle_out_of_rect(pos: pygame.Vector2, radius: float, rect: pygame.Rect):
+    """Push a circle center out of a rect if overlapping (minimal axis push)."""
+    closest_x = max(rect.left, min(pos.x, rect.right))
+    closest_y = max(rect.top, min(pos.y, rect.bottom))
+    dx = pos.x - closest_x
+    dy = pos.y - closest_y
+    dist_sq = dx * dx + dy * dy
+    if dist_sq == 0:
+        # Center is exactly at a corner; push upward by radius
+        pos.y = rect.top - radius
+        return
+    if dist_sq < radius * radius:
+        dist = math.sqrt(dist_sq)
+        push = radius - dist
+        if dist > 0:
+            pos.x += dx / dist * push
+            pos.y += dy / dist * push
+
+
+def push_circle_out_of_circle(center: pygame.Vector2, radius: float, other_center: pygame.Vector2, other_radius: float):
+    """Push a circle center away from another circle if overlapping."""
+    delta = center - other_center
+    dist_sq = delta.length_squared()
+    min_dist = radius + other_radius
+    if dist_sq == 0:
+        # Perfect overlap; push upward.
+        center.y -= min_dist
+        return
+    dist = math.sqrt(dist_sq)
+    if dist < min_dist:
+        push = min_dist - dist
+        dir_vec = delta / dist
+        center.x += dir_vec.x * push
+        center.y += dir_vec.y * push
+
+
+def clamp_circle_in_rect(center: pygame.Vector2, radius: float, rect: pygame.Rect):
+    """Clamp a circle center so the whole circle stays inside rect."""
+    center.x = max(rect.left + radius, min(center.x, rect.right - radius))
+    center.y = max(rect.top + radius, min(center.y, rect.bottom - radius))
+
+
+def get_spirit_rect(field_width: int, field_height: int) -> pygame.Rect:
+    """World rect for the post-boss spirit that blocks the boss arena exit."""
+    door = get_field_boss_arena_door_rect(field_width, field_height)
+    rect = pygame.Rect(0, 0, settings.NPC_WIDTH, settings.NPC_HEIGHT)
+    rect.midbottom = door.midbottom
+    return rect
+
+
+class _RectIndex:
+    """Rects bucketed into a coarse grid; queries return indices in insertion order."""
+
+    def __init__(self, rects: list[pygame.Rect], cell_size: int):
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], tuple[int, ...]] = {}
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, rect in enumerate(rects):
+            cx0, cy0, cx1, cy1 = self._cell_span(rect.left, rect.top, rect.right, rect.bottom)
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    cells.setdefault((cx, cy), []).append(i)
+        self._cells = {cell: tuple(ids) for cell, ids in cells.items()}
+
+    def _cell_span(self, left: float, top: float, right: float, bottom: float) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        return int(left // size), int(top // size), int(right // size), int(bottom // size)
+
+    def query(self, left: float, top: float, right: float, bottom: float) -> tuple[int, ...]:
+        cx0, cy0, cx1, cy1 = self._cell_span(left, top, right, bottom)
+        cells = self._cells
+        if cx0 == cx1 and cy0 == cy1:
+            return cells.get((cx0, cy0), ())
+        found: set[int] = set()
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                found.update(cells.get((cx, cy), ()))
+        return tuple(sorted(found))
+
+
+class StaticCollisionWorld:
+    """Solid geometry for one world, built once and queried with circles and sight lines.
+
+    Rects are checked in a fixed order (table, shopkeeper, houses, arena walls, arena door, spirit)
+    so push-outs resolve the same way they did when each caller walked its own list. The boss door
+    and spirit gate are toggled each frame with set_gates instead of rebuilding anything.
+    """
+
+    def __init__(self, width: int, height: int, field: bool = False):
+        self.width = width
+        self.height = height
+        self.boss_door_closed = False
+        self.spirit_gate = False
+        self.arena_rect: pygame.Rect | None = None
+        self.arena_inner: pygame.Rect | None = None
+        self.spirit_rect: pygame.Rect | None = None
+        self.solids: list[pygame.Rect] = []
+        self._solid_gates: list[str | None] = []
+        self._arena_wall_ids: list[int] = []
+        self._arena_door_id: int | None = None
+        self.safe_zones: list[pygame.Rect] = []
+        self._safe_gates: list[str | None] = []
+        if field:
+            self._add_field_geometry()
+        cell = int(settings.COLLISION_CELL_SIZE)
+        self._solid_index = _RectIndex(self.solids, cell)
+        self._safe_index = _RectIndex(self.safe_zones, cell)
+
+    def _add_field_geometry(self):
+        w, h = self.width, self.height
+        table = get_room3_table_rect(None, pygame.Vector2(0, 0))
+        keeper = get_shopkeeper_rect(None)
+        door = get_field_boss_arena_door_rect(w, h)
+        self.spirit_rect = get_spirit_rect(w, h)
+        self.arena_rect = get_field_boss_arena_rect(w, h)
+        thickness = 36
+        self.arena_inner = self.arena_rect.inflate(-thickness * 2, -thickness * 2)
+
+        self._add_solid(table)
+        self._add_solid(keeper)
+        for rect in get_field_house_solid_rects(w, h):
+            self._add_solid(rect)
+        for rect in get_field_boss_arena_wall_rects(w, h):
+            self._arena_wall_ids.append(len(self.solids))
+            self._add_solid(rect)
+        self._arena_door_id = len(self.solids)
+        self._add_solid(door, GATE_DOOR)
+        self._add_solid(self.spirit_rect, GATE_SPIRIT)
+
+        # Enemies keep clear of the NPCs so the shop and the spirit stay safe to talk to.
+        pad = getattr(settings, "NPC_ENEMY_EXCLUSION_PADDING", 240)
+        self._add_safe_zone(table.inflate(pad * 2, pad * 2))
+        self._add_safe_zone(keeper.inflate(pad * 2, pad * 2))
+        self._add_safe_zone(self.spirit_rect.inflate(pad * 2, pad * 2), GATE_SPIRIT)
+
+    def _add_solid(self, rect: pygame.Rect, gate: str | None = None):
+        self.solids.append(pygame.Rect(rect))
+        self._solid_gates.append(gate)
+
+    def _add_safe_zone(self, rect: pygame.Rect, gate: str | None = None):
+        self.safe_zones.append(pygame.Rect(rect))
+        self._safe_gates.append(gate)
+
+    def set_gates(self, boss_door_closed: bool, spirit_gate: bool):
+        """Open or shut the dynamic blockers for this frame."""
+        self.boss_door_closed = bool(boss_door_closed)
+        self.spirit_gate = bool(spirit_gate)
+
+    def _gate_open(self, gate: str | None) -> bool:
+        if gate is None:
+            return True
+        if gate == GATE_DOOR:
+            return self.boss_door_closed or self.spirit_gate
+        return self.spirit_gate
+
+    def active_solids(self) -> list[pygame.Rect]:
+        """Solids that currently block, in collision order."""
+        return [rect for rect, gate in zip(self.solids, self._solid_gates) if self._gate_open(gate)]
+
+    def resolve_circle(self, pos: pygame.Vector2, radius: float, keep_in_arena: bool = False):
+        """Push a circle out of every active solid it touches, then keep it inside the world.
+
+        With keep_in_arena, a circle is also held inside the arena while the boss door is shut.
+        """
+        self.push_out_of_solids(pos, radius)
+        self.clamp_to_world(pos, radius)
+        if keep_in_arena:
+            self.keep_in_arena(pos, radius)
+
+    def push_out_of_solids(self, pos: pygame.Vector2, radius: float, include_spirit: bool = True):
+        """Push a circle out of every active solid it touches (pigs pass include_spirit=False)."""
+        ids = self._solid_index.query(pos.x - radius, pos.y - radius, pos.x + radius, pos.y + radius)
+        for i in ids:
+            gate = self._solid_gates[i]
+            if gate == GATE_SPIRIT and not include_spirit:
+                continue
+            if self._gate_open(gate):
+                push_circle_out_of_rect(pos, radius, self.solids[i])
+
+    def push_out_of_arena_walls(self, pos: pygame.Vector2, radius: float):
+        """Push a circle out of the arena walls, and the door while it is shut."""
+        for i in self._arena_wall_ids:
+            push_circle_out_of_rect(pos, radius, self.solids[i])
+        if self.boss_door_closed and self._arena_door_id is not None:
+            push_circle_out_of_rect(pos, radius, self.solids[self._arena_door_id])
+
+    def clamp_to_world(self, pos: pygame.Vector2, radius: float):
+        """Keep a circle inside the world bounds."""
+        pos.x = max(radius, min(pos.x, self.width - radius))
+        pos.y = max(radius, min(pos.y, self.height - radius))
+
+    def keep_in_arena(self, pos: pygame.Vector2, radius: float):
+        """Hold a circle inside the arena interior while the boss door is shut."""
+        if self.boss_door_closed and self.arena_inner is not None:
+            clamp_circle_in_rect(pos, radius, self.arena_inner)
+
+    def push_out_of_safe_zones(self, pos: pygame.Vector2, radius: float):
+        """Push an enemy out of the areas kept clear around NPCs."""
+        ids = self._safe_index.query(pos.x - radius, pos.y - radius, pos.x + radius, pos.y + radius)
+        for i in ids:
+            if self._gate_open(self._safe_gates[i]):
+                push_circle_out_of_rect(pos, radius, self.safe_zones[i])
+
+    def line_of_sight_clear(self, a: pygame.Vector2, b: pygame.Vector2) -> bool:
+        """Return True if segment a->b does not cross any active solid."""
+        ax, ay = int(a.x), int(a.y)
+        bx, by = int(b.x), int(b.y)
+        ids = self._solid_index.query(min(ax, bx), min(ay, by), max(ax, bx), max(ay, by))
+        for i in ids:
+            if self._gate_open(self._solid_gates[i]) and self.solids[i].clipline(ax, ay, bx, by):
+                return False
+        return True
+
+
+_WORLDS: dict[tuple[int, int, bool], StaticCollisionWorld] = {}
+
+
+def get_static_collision_world(width: int, height: int, field: bool = False) -> StaticCollisionWorld:
+    """The collision world for a world size, built on first use."""
+    key = (int(width), int(height), bool(field))
+    world = _WORLDS.get(key)
+    if world is None:
+        world = StaticCollisionWorld(key[0], key[1], key[2])
+        _WORLDS[key] = world
+    return world
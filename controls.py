@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import pygame
+
+# One-shot actions an input source can queue for the next tick.
+ACTION_SWING = "swing"
+ACTION_FIRE = "fire"
+ACTION_DODGE = "dodge"
+ACTION_RAISE_SHIELD = "raise_shield"
+ACTIONS = (ACTION_SWING, ACTION_FIRE, ACTION_DODGE, ACTION_RAISE_SHIELD)
+
+
+@dataclass
+class InputSnapshot:
+    """Gameplay input for one simulation tick; update_game reads nothing else."""
+
+    # Summed WASD axes (-1..1 each), not normalized
+    move: pygame.Vector2 = field(default_factory=lambda: pygame.Vector2(0, 0))
+    sprint: bool = False
+    block: bool = False
+    # One-shot actions: true only on the tick after they were triggered
+    swing: bool = False
+    fire: bool = False
+    dodge: bool = False
+    # World point under the cursor (None when there is no pointer)
+    aim: pygame.Vector2 | None = None
+    # Right-click pressed: blocks at once, even mid-swing (holding block waits for the swing to end)
+    raise_shield: bool = False
+
+
+class InputSource:
+    """Produces one InputSnapshot per tick. Actions queued between ticks go out with the next one."""
+
+    def __init__(self):
+        self._queued: set[str] = set()
+
+    def queue_action(self, action: str):
+        if action in ACTIONS:
+            self._queued.add(action)
+
+    def _take_actions(self) -> dict[str, bool]:
+        queued, self._queued = self._queued, set()
+        return {action: action in queued for action in ACTIONS}
+
+    def snapshot(self, state) -> InputSnapshot:
+        return InputSnapshot(**self._take_actions())
+
+    def poll_events(self) -> list[pygame.event.Event]:
+        """UI events (menus, dialogue, map) for handle_events."""
+        return pygame.event.get()
+
+    def key_mods(self) -> int:
+        """Modifier keys held now (pygame.KMOD_* bits); decides what a click does."""
+        return pygame.key.get_mods()
+
+
+class DeviceInput(InputSource):
+    """Keyboard and mouse. handle_events queues clicks and the dodge key as actions."""
+
+    def poll_events(self) -> list[pygame.event.Event]:
+        """Pending pygame events; wheel events get the cursor position as pos (pygame leaves it out)."""
+        events = pygame.event.get()
+        for i, event in enumerate(events):
+            if event.type == pygame.MOUSEWHEEL and not hasattr(event, "pos"):
+                events[i] = pygame.event.Event(event.type, event.dict, pos=pygame.mouse.get_pos())
+        return events
+
+    def snapshot(self, state) -> InputSnapshot:
+        keys = pygame.key.get_pressed()
+        move = pygame.Vector2(0, 0)
+        if keys[pygame.K_w]:
+            move.y -= 1
+        if keys[pygame.K_s]:
+            move.y += 1
+        if keys[pygame.K_a]:
+            move.x -= 1
+        if keys[pygame.K_d]:
+            move.x += 1
+        zoom = float(getattr(state, "camera_zoom", 1.0)) or 1.0
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        return InputSnapshot(
+            move=move,
+            sprint=bool(keys[pygame.K_SPACE]),
+            block=bool(pygame.mouse.get_pressed()[2]),
+            aim=state.camera_offset + pygame.Vector2(mouse_x / zoom, mouse_y / zoom),
+            **self._take_actions(),
+        )
+
+
+class ScriptedInput(InputSource):
+    """Input set from code (bots, soak tests): held fields persist until changed.
+
+    UI keys and clicks can still be queued as pygame events with tap and click.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.move = pygame.Vector2(0, 0)
+        self.sprint = False
+        self.block = False
+        self.aim: pygame.Vector2 | None = None
+        # Held modifiers (e.g. pygame.KMOD_SHIFT makes a left click fire the bow)
+        self.mods = 0
+        self._events: list[pygame.event.Event] = []
+
+    def tap(self, key: int):
+        self._events.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0))
+        self._events.append(pygame.event.Event(pygame.KEYUP, key=key, mod=0))
+
+    def click(self, pos: tuple[int, int], button: int = 1):
+        self._events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=pos))
+        self._events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, button=button, pos=pos))
+
+    def poll_events(self) -> list[pygame.event.Event]:
+        events, self._events = self._events, []
+        return events
+
+    def key_mods(self) -> int:
+        return self.mods
+
+    def snapshot(self, state) -> InputSnapshot:
+        return InputSnapshot(
+            move=pygame.Vector2(self.move),
+            sprint=self.sprint,
+            block=self.block,
+            aim=pygame.Vector2(self.aim) if self.aim is not None else None,
+            **self._take_actions(),
+        )
+
+
+class RecordedInput(InputSource):
+    """Plays back a list of snapshots, one per tick, then idles."""
+
+    def __init__(self, snapshots: list[InputSnapshot]):
+        super().__init__()
+        self.snapshots = snapshots
+        self.index = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.index >= len(self.snapshots)
+
+    def poll_events(self) -> list[pygame.event.Event]:
+        return []
+
+    def key_mods(self) -> int:
+        return 0
+
+    def snapshot(self, state) -> InputSnapshot:
+        if self.finished:
+            return InputSnapshot()
+        snap = self.snapshots[self.index]
+        self.index += 1
+        return snap
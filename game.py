@@ -1,18 +1,19 @@
 import math
-import random
 import sys
 from typing import List
 
 import pygame
 
+import profiler
 import settings
-from combat import (
-    deal_damage_if_hit,
-    get_swing_dir,
-    sword_polygon_points,
-    swing_ease,
-    swing_reach_multiplier,
+from collision import (
+    StaticCollisionWorld,
+    get_spirit_rect,
+    get_static_collision_world,
+    push_circle_out_of_circle,
 )
+from combat import deal_damage_if_hit, get_swing_dir
+from controls import ACTION_DODGE, ACTION_FIRE, ACTION_RAISE_SHIELD, ACTION_SWING, InputSnapshot
 from effects import spawn_blood_splatter
 from game_state import GameState, create_game_state
 from hud import (
@@ -34,21 +35,23 @@ from inventory import (
     get_grouped_slot_rects,
 )
 from pig import spawn_pigs, make_pig
-from utils import line_of_sight_clear
+from spatial import SpatialHash
+from sprites import draw_pig_sprite, draw_player_sprite
 from world import (
     blit_field_environment,
+    blit_field_map,
     get_field_boss_arena_door_rect,
     get_field_boss_arena_rect,
-    get_field_boss_arena_wall_rects,
     get_field_farm_rects,
     get_field_house_solid_rects,
     get_field_house_rects,
-    get_field_map_surface,
     get_field_pond_rect,
     get_field_ruins_rects,
     get_field_shrine_rect,
     get_room3_table_rect,
     get_shopkeeper_rect,
+    prebuild_field_map_surface,
+    prefetch_field_tiles,
 )
 
 DIALOGUE_BOX_PADDING = 10
@@ -92,6 +95,68 @@ VILLAGE_EDGE_PAD = 1200
 # - top-right: snowy/icy biome
 VILLAGE_SW_POS_WORLD = pygame.Vector2(int(ROOM3_FIELD_WIDTH * 0.16), int(ROOM3_FIELD_HEIGHT * 0.84))
 VILLAGE_SE_POS_WORLD = pygame.Vector2(int(ROOM3_FIELD_WIDTH * 0.86), int(ROOM3_FIELD_HEIGHT * 0.14))
+# Map background + landmarks from the last frame the map was open (see get_map_base_layer).
+_MAP_BASE_LAYER: dict = {"key": None, "surface": None, "pending": False}
+# Off-screen surfaces for the zoomed world, kept across frames (see get_world_layer).
+_WORLD_LAYERS: dict[tuple, pygame.Surface] = {}
+
+
+def get_world_layer(size: tuple[int, int], alpha: bool = False, role: str = "world") -> pygame.Surface:
+    """Persistent off-screen surface of the given size, reallocated only when the size changes."""
+    key = (role, int(size[0]), int(size[1]), bool(alpha))
+    layer = _WORLD_LAYERS.get(key)
+    if layer is None:
+        # Drop stale sizes for this role (zoom or window changed).
+        for old in [k for k in _WORLD_LAYERS if k[0] == role]:
+            del _WORLD_LAYERS[old]
+        layer = pygame.Surface(key[1:3], pygame.SRCALPHA) if alpha else pygame.Surface(key[1:3])
+        _WORLD_LAYERS[key] = layer
+    return layer
+
+
+def present_world_layer(layer: pygame.Surface, real_screen: pygame.Surface, blend: bool):
+    """Resize the world layer onto the screen (over what's already there when blending)."""
+    size = real_screen.get_size()
+    if getattr(settings, "RENDER_SMOOTH_SCALE", False):
+        resize = pygame.transform.smoothscale
+    else:
+        resize = pygame.transform.scale
+    if not blend:
+        resize(layer, size, real_screen)
+        return
+    scaled = get_world_layer(size, alpha=True, role="scaled")
+    resize(layer, size, scaled)
+    real_screen.blit(scaled, (0, 0))
+
+
+def to_layer(pos, scale: float):
+    """Camera-space point (world position minus the camera) in world-layer pixels."""
+    return pos if scale == 1.0 else pygame.Vector2(pos) * scale
+
+
+def to_layer_rect(rect: pygame.Rect, scale: float) -> pygame.Rect:
+    """Camera-space rect in world-layer pixels."""
+    if scale == 1.0:
+        return rect
+    return pygame.Rect(
+        int(rect.x * scale),
+        int(rect.y * scale),
+        max(1, round(rect.width * scale)),
+        max(1, round(rect.height * scale)),
+    )
+
+
+def to_layer_len(length: float, scale: float) -> int:
+    """Radius / line width in world-layer pixels (never thinner than one pixel)."""
+    return length if scale == 1.0 else max(1, round(length * scale))
+
+
+def blit_to_layer(layer: pygame.Surface, image: pygame.Surface, pos, scale: float):
+    """Blit an image made at world size (e.g. rendered text) at a camera-space position."""
+    if scale != 1.0:
+        size = (max(1, round(image.get_width() * scale)), max(1, round(image.get_height() * scale)))
+        image = pygame.transform.smoothscale(image, size)
+    layer.blit(image, to_layer(pos, scale))
 
 
 def current_world_size(state: GameState) -> tuple[int, int]:
@@ -100,6 +165,17 @@ def current_world_size(state: GameState) -> tuple[int, int]:
     return ROOM_WORLD_WIDTH, ROOM_WORLD_HEIGHT
 
 
+def get_collision_world(state: GameState) -> StaticCollisionWorld:
+    """Static solids for the current level, with the boss door and spirit gate set from state."""
+    world_w, world_h = current_world_size(state)
+    collision = get_static_collision_world(world_w, world_h, field=state.level_index == FIELD_LEVEL)
+    collision.set_gates(
+        getattr(state, "boss_door_closed", False),
+        state.spirit_spawned and not state.spirit_departed,
+    )
+    return collision
+
+
 def get_door_rect_world(state: GameState) -> pygame.Rect:
     """Door rect in world coordinates (not camera-adjusted)."""
     world_w, world_h = current_world_size(state)
@@ -112,11 +188,71 @@ def get_door_rect_world(state: GameState) -> pygame.Rect:
     return pygame.Rect(x, y, settings.DOOR_WIDTH, settings.DOOR_HEIGHT)
 
 
+def get_map_rect(screen: pygame.Surface) -> pygame.Rect:
+    """Where the map overlay sits on the screen."""
+    full_rect = screen.get_rect()
+    map_rect = pygame.Rect(0, 0, int(full_rect.width * 0.985), int(full_rect.height * 0.975))
+    map_rect.center = full_rect.center
+    return map_rect
+
+
+def get_map_base_layer(
+    state: GameState, map_rect: pygame.Rect, center_world: pygame.Vector2, map_zoom: float
+) -> pygame.Surface:
+    """Map background plus landmark outlines; only redrawn when the view changes or map detail arrives."""
+    cache = _MAP_BASE_LAYER
+    key = (map_rect.size, map_zoom, round(center_world.x, 2), round(center_world.y, 2))
+    if cache["surface"] is not None and cache["key"] == key and not cache["pending"]:
+        return cache["surface"]
+
+    layer = cache["surface"]
+    if layer is None or layer.get_size() != map_rect.size:
+        layer = pygame.Surface(map_rect.size)
+    layer.fill((40, 52, 70))
+    layer_rect = layer.get_rect()
+    pending = blit_field_map(layer, layer_rect, center_world, map_zoom, ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
+
+    scale_x = map_rect.width / ROOM3_FIELD_WIDTH * map_zoom
+    scale_y = map_rect.height / ROOM3_FIELD_HEIGHT * map_zoom
+
+    def world_rect_to_map(rect_world: pygame.Rect) -> pygame.Rect:
+        left = layer_rect.centerx + (rect_world.left - center_world.x) * scale_x
+        top = layer_rect.centery + (rect_world.top - center_world.y) * scale_y
+        w = max(1, int(rect_world.width * scale_x))
+        h = max(1, int(rect_world.height * scale_y))
+        return pygame.Rect(int(left), int(top), w, h)
+
+    arena_rect = world_rect_to_map(get_field_boss_arena_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT))
+    pygame.draw.rect(layer, (255, 120, 120), arena_rect, 3, border_radius=10)
+    pond_rect = world_rect_to_map(get_field_pond_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT))
+    pygame.draw.ellipse(layer, (110, 190, 255), pond_rect, 3)
+    for farm in get_field_farm_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
+        pygame.draw.rect(layer, (120, 240, 150), world_rect_to_map(farm), 3, border_radius=8)
+    for house in get_field_house_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
+        pygame.draw.rect(layer, (240, 220, 180), world_rect_to_map(house), 2, border_radius=6)
+    for rr in get_field_ruins_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
+        pygame.draw.rect(layer, (200, 200, 220), world_rect_to_map(rr), 2, border_radius=10)
+    shrine = world_rect_to_map(get_field_shrine_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT))
+    pygame.draw.rect(layer, (210, 190, 255), shrine, 3, border_radius=10)
+
+    table = get_room3_table_rect(state.screen, pygame.Vector2(0, 0))
+    pygame.draw.rect(layer, (255, 220, 80), world_rect_to_map(table), 3, border_radius=8)
+
+    cache.update(key=key, surface=layer, pending=pending)
+    return layer
+
+
+def give_map(state: GameState):
+    """Hand the player the map and start drawing its overview in the background."""
+    state.has_map = True
+    prebuild_field_map_surface(get_map_rect(state.screen).size, ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
+
+
 def apply_field_start_progress(state: GameState):
     """Set story flags for starting in the field post-evil fight."""
     state.level_index = FIELD_LEVEL
     state.coin_count = 50
-    state.has_map = True
+    give_map(state)
     state.shopkeeper_greeted = True
     state.map_tested = True
     state.rumor_shown = True
@@ -140,7 +276,7 @@ def apply_field_start_progress(state: GameState):
 def apply_post_bow_start(state: GameState, coin_count: int = 10):
     """Dev shortcut: start in the field after receiving the bow (saves early dialogue/combat)."""
     state.coin_count = coin_count
-    state.has_map = True
+    give_map(state)
     state.shopkeeper_greeted = True
     state.map_tested = True
     state.rumor_shown = True
@@ -165,7 +301,7 @@ def apply_post_boss_start(state: GameState, coin_count: int = 75):
     """Dev shortcut: start in the field after the pig boss is defeated."""
     state.level_index = FIELD_LEVEL
     state.coin_count = coin_count
-    state.has_map = True
+    give_map(state)
     state.shopkeeper_greeted = True
     state.map_tested = True
     state.rumor_shown = True
@@ -217,10 +353,7 @@ def apply_post_boss_start(state: GameState, coin_count: int = 75):
 
 def get_spirit_rect_world() -> pygame.Rect:
     """World rect for the post-boss spirit that blocks the boss arena exit."""
-    door = get_field_boss_arena_door_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
-    rect = pygame.Rect(0, 0, settings.NPC_WIDTH, settings.NPC_HEIGHT)
-    rect.midbottom = door.midbottom
-    return rect
+    return get_spirit_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
 
 
 def spawn_boss_reward_chest(state: GameState, pos_world: pygame.Vector2):
@@ -310,7 +443,7 @@ def spawn_field_roaming_pigs(state: GameState, count: int = 35):
     """Generate spawn locations for overworld pigs (spawned when the player is nearby)."""
     if state.level_index != FIELD_LEVEL:
         return
-    rng = random.Random(pygame.time.get_ticks())
+    rng = state.rng
     arena = get_field_boss_arena_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT).inflate(160, 160)
     pond = get_field_pond_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT).inflate(40, 40)
     farms = [r.inflate(40, 40) for r in get_field_farm_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)]
@@ -459,58 +592,64 @@ def start_field_intro(state: GameState):
     if state.level_index != FIELD_LEVEL or state.shopkeeper_greeted:
         return
     state.shopkeeper_greeted = True
-    state.has_map = True
+    give_map(state)
     state.treasure_hint_visible = False
     start_dialogue(state, [MAP_INTRO_LINE1, MAP_INTRO_LINE2])
 
 
-def push_circle_out_of_rect(pos: pygame.Vector2, radius: float, rect: pygame.Rect):
-    """Push a circle center out of a rect if overlapping (minimal axis push)."""
-    closest_x = max(rect.left, min(pos.x, rect.right))
-    closest_y = max(rect.top, min(pos.y, rect.bottom))
-    dx = pos.x - closest_x
-    dy = pos.y - closest_y
-    dist_sq = dx * dx + dy * dy
-    if dist_sq == 0:
-        # Center is exactly at a corner; push upward by radius
-        pos.y = rect.top - radius
-        return
-    if dist_sq < radius * radius:
-        dist = math.sqrt(dist_sq)
-        push = radius - dist
-        if dist > 0:
-            pos.x += dx / dist * push
-            pos.y += dy / dist * push
-
-
-def push_circle_out_of_circle(center: pygame.Vector2, radius: float, other_center: pygame.Vector2, other_radius: float):
-    """Push a circle center away from another circle if overlapping."""
-    delta = center - other_center
-    dist_sq = delta.length_squared()
-    min_dist = radius + other_radius
-    if dist_sq == 0:
-        # Perfect overlap; push upward.
-        center.y -= min_dist
-        return
-    dist = math.sqrt(dist_sq)
-    if dist < min_dist:
-        push = min_dist - dist
-        dir_vec = delta / dist
-        center.x += dir_vec.x * push
-        center.y += dir_vec.y * push
-
-
-def clamp_circle_in_rect(center: pygame.Vector2, radius: float, rect: pygame.Rect):
-    """Clamp a circle center so the whole circle stays inside rect."""
-    center.x = max(rect.left + radius, min(center.x, rect.right - radius))
-    center.y = max(rect.top + radius, min(center.y, rect.bottom - radius))
+def separate_pigs_once(pigs: list, grid: SpatialHash):
+    """One i < j pass of pushing overlapping pigs apart, visiting only grid neighbours of each pig."""
+    index = {id(p): i for i, p in enumerate(pigs)}
+    index_of = index.get
+    for i, a in enumerate(pigs):
+        reach = a.radius + grid.max_radius + 6
+        later = sorted(
+            ((j, b) for b in grid.neighbors(a, reach) if (j := index_of(id(b), -1)) > i),
+            key=lambda pair: pair[0],
+        )
+        a_pos = a.pos
+        for j, b in later:
+            b_pos = b.pos
+            dx = b_pos.x - a_pos.x
+            dy = b_pos.y - a_pos.y
+            dist_sq = dx * dx + dy * dy
+            min_dist = a.radius + b.radius + 6
+            if dist_sq == 0:
+                # Perfect overlap: pick a direction deterministically from indices.
+                dx, dy = pygame.Vector2(1, 0).rotate((i * 97 + j * 193) % 360)
+                dist_sq = 1.0
+            if dist_sq > (min_dist + 1) * (min_dist + 1):
+                continue
+            dist = math.sqrt(dist_sq)
+            if dist < min_dist:
+                push = (min_dist - dist) / 2.0
+                ux = dx / dist * push
+                uy = dy / dist * push
+                a_pos.x -= ux
+                a_pos.y -= uy
+                b_pos.x += ux
+                b_pos.y += uy
+                grid.update(b)
+        grid.update(a)
+
+
+def push_pigs_out_of_solids(pigs: list, grid: SpatialHash, collision: StaticCollisionWorld):
+    """Push pigs out of solids (and enemies out of NPC safe zones), keeping the grid current."""
+    for pig in pigs:
+        # Pigs are never blocked by the spirit itself, only by the doorway it holds.
+        collision.push_out_of_solids(pig.pos, pig.radius, include_spirit=False)
+        if pig.in_boss_arena:
+            collision.keep_in_arena(pig.pos, pig.radius)
+        if not getattr(pig, "is_ally", False):
+            collision.push_out_of_safe_zones(pig.pos, pig.radius)
+        grid.update(pig)
 
 
 def start_dialogue(state: GameState, lines: List[str], *, tag: str | None = None):
     """Begin showing dialogue lines with typewriter reveal."""
     state.dialogue_lines = list(lines)
     state.dialogue_index = 0
-    state.dialogue_start_time = pygame.time.get_ticks() / 1000.0
+    state.dialogue_start_time = state.get_ticks() / 1000.0
     state.resume_lines = list(lines)
     state.resume_index = 0
     state.dialogue_tag = tag
@@ -521,14 +660,85 @@ def restore_dialogue(state: GameState):
     if state.resume_lines and not state.dialogue_lines:
         state.dialogue_lines = list(state.resume_lines)
         state.dialogue_index = max(0, state.resume_index)
-        state.dialogue_start_time = pygame.time.get_ticks() / 1000.0
+        state.dialogue_start_time = state.get_ticks() / 1000.0
+
+
+def get_view_size(state: GameState) -> tuple[float, float]:
+    """World-space size of the visible area (screen size divided by the camera zoom)."""
+    zoom = float(getattr(state, "camera_zoom", 1.0))
+    if zoom <= 0:
+        zoom = 1.0
+    return state.screen.get_width() / zoom, state.screen.get_height() / zoom
+
+
+def get_view_rect_world(state: GameState) -> pygame.Rect:
+    """World-space rect currently on screen."""
+    return pygame.Rect(
+        int(state.camera_offset.x),
+        int(state.camera_offset.y),
+        *map(int, get_view_size(state)),
+    )
+
+
+def _cull_list(items: list, view: pygame.Rect, pos_radius) -> list:
+    """Items whose bounding circle (from pos_radius(item) -> (pos, radius)) touches view."""
+    visible = []
+    for item in items:
+        pos, radius = pos_radius(item)
+        if (
+            pos.x + radius >= view.left
+            and pos.x - radius <= view.right
+            and pos.y + radius >= view.top
+            and pos.y - radius <= view.bottom
+        ):
+            visible.append(item)
+    return visible
+
+
+def cull_world_draw_lists(state: GameState) -> dict[str, list]:
+    """Per-frame lists of the world objects that can show up on screen; counts go to state.cull_stats."""
+    view = state.view_rect_world
+    # update_game doesn't run every frame (dialogue, map, intro), so catch up with the camera.
+    if view is None or view.topleft != (int(state.camera_offset.x), int(state.camera_offset.y)):
+        view = get_view_rect_world(state)
+        state.view_rect_world = view
+    sword_reach = settings.PIG_SWING_DISTANCE + settings.SWORD_LENGTH
+    waystone_r = int(getattr(settings, "WAYSTONE_RADIUS", 34))
+    # Text prompts drawn above chests / waystones are wider than the objects themselves.
+    prompt_pad = 140
+    lists = {
+        "pigs": _cull_list(
+            [p for p in state.pigs if p.health > 0], view, lambda p: (p.pos, p.radius * 2 + sword_reach)
+        ),
+        "coins": _cull_list(state.coin_pickups, view, lambda c: (c["pos"], 10)),
+        "arrows": _cull_list(state.arrows, view, lambda a: (a["pos"], 16)),
+        "blood": _cull_list(state.blood_splats, view, lambda b: (b["center"], 32)),
+        "chests": _cull_list(state.chests, view, lambda c: (c["pos"], prompt_pad)),
+        "waystones": _cull_list(
+            getattr(state, "waystones", []),
+            view,
+            lambda w: (pygame.Vector2(w.get("pos", (0, 0))), waystone_r + prompt_pad),
+        ),
+    }
+    total = (
+        sum(1 for p in state.pigs if p.health > 0)
+        + len(state.coin_pickups)
+        + len(state.arrows)
+        + len(state.blood_splats)
+        + len(state.chests)
+        + len(getattr(state, "waystones", []))
+    )
+    drawn = sum(len(v) for v in lists.values())
+    state.cull_stats = {"drawn": drawn, "culled": total - drawn}
+    return lists
 
 
 def spawn_evil_creature(state: GameState):
     """Spawn a single pig-like enemy once when warned."""
     if state.evil_spawned:
         return
-    spawn_pos = pygame.Vector2(state.screen.get_width() * 0.75, state.screen.get_height() / 2)
+    view_w, view_h = get_view_size(state)
+    spawn_pos = pygame.Vector2(view_w * 0.75, view_h / 2)
     state.pigs.append(make_pig(spawn_pos, is_evil=True))
     state.evil_spawned = True
 
@@ -673,34 +883,46 @@ def try_open_chest(state: GameState, open_radius: float = 110.0) -> bool:
     return False
 
 
-def draw_room1_chests(state: GameState, cam: pygame.Vector2, *, surface: pygame.Surface | None = None):
-    """Render chests and prompts."""
-    if not state.chests:
+def draw_room1_chests(
+    state: GameState,
+    cam: pygame.Vector2,
+    *,
+    surface: pygame.Surface | None = None,
+    chests: list[dict] | None = None,
+    scale: float = 1.0,
+):
+    """Render chests and prompts (only the given ones, e.g. the visible ones, when passed).
+
+    scale is surface pixels per world pixel (see RENDER_SCALE).
+    """
+    if chests is None:
+        chests = state.chests
+    if not chests:
         return
     screen = surface if surface is not None else state.screen
     font = state.font
     chest_size = 54
     prompt_radius = 140
-    for chest in state.chests:
+    for chest in chests:
         pos = chest["pos"] - cam
         rect = pygame.Rect(int(pos.x - chest_size / 2), int(pos.y - chest_size / 2), chest_size, chest_size)
         base_color = (130, 90, 50) if not chest["opened"] else (70, 70, 70)
         trim_color = (210, 170, 90) if not chest["opened"] else (160, 160, 160)
-        pygame.draw.rect(screen, base_color, rect, border_radius=6)
-        pygame.draw.rect(screen, trim_color, rect, 4, border_radius=6)
+        pygame.draw.rect(screen, base_color, to_layer_rect(rect, scale), border_radius=to_layer_len(6, scale))
+        pygame.draw.rect(screen, trim_color, to_layer_rect(rect, scale), to_layer_len(4, scale), border_radius=to_layer_len(6, scale))
         latch = pygame.Rect(rect.centerx - 6, rect.centery - 6, 12, 12)
-        pygame.draw.rect(screen, trim_color, latch, border_radius=3)
+        pygame.draw.rect(screen, trim_color, to_layer_rect(latch, scale), border_radius=to_layer_len(3, scale))
         if not chest["opened"]:
             dist = (state.player.pos - chest["pos"]).length()
             if dist <= prompt_radius and font:
                 prompt = font.render("Press E to open", True, (255, 255, 255))
-                screen.blit(prompt, (rect.centerx - prompt.get_width() // 2, rect.top - 40))
+                blit_to_layer(screen, prompt, (rect.centerx - prompt.get_width() // 2, rect.top - 40), scale)
         else:
             if chest.get("reveal_timer", 0) > 0 and font:
                 icon_center = pygame.Vector2(rect.centerx - 30, rect.top - 32)
-                draw_item_icon(screen, icon_center, chest["item"], size=28)
+                draw_item_icon(screen, to_layer(icon_center, scale), chest["item"], size=to_layer_len(28, scale))
                 name = font.render(chest["item"], True, (240, 240, 240))
-                screen.blit(name, (icon_center.x + 30, icon_center.y - name.get_height() // 2))
+                blit_to_layer(screen, name, (icon_center.x + 30, icon_center.y - name.get_height() // 2), scale)
 
 
 def current_dialogue_text(state: GameState):
@@ -714,7 +936,7 @@ def dialogue_reveal(state: GameState):
     line = current_dialogue_text(state)
     if line is None:
         return "", True
-    now = pygame.time.get_ticks() / 1000.0
+    now = state.get_ticks() / 1000.0
     elapsed = max(0.0, now - state.dialogue_start_time)
     chars = int(elapsed * settings.DIALOGUE_CHARS_PER_SEC)
     if chars >= len(line):
@@ -728,7 +950,7 @@ def handle_dialogue_click(state: GameState):
     if line is None:
         return
     shown, full = dialogue_reveal(state)
-    now = pygame.time.get_ticks() / 1000.0
+    now = state.get_ticks() / 1000.0
     finished_tag: str | None = None
     if not full:
         # Instantly finish this line
@@ -850,7 +1072,7 @@ def advance_intro(state: GameState):
         state.intro_line_start = 0.0
         reset_round(state)
         return
-    state.intro_line_start = pygame.time.get_ticks() / 1000.0
+    state.intro_line_start = state.get_ticks() / 1000.0
 
 
 def update_intro(state: GameState, events: list[pygame.event.Event]):
@@ -862,7 +1084,7 @@ def update_intro(state: GameState, events: list[pygame.event.Event]):
             state.running = False
         elif event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
             advance_intro(state)
-    now = pygame.time.get_ticks() / 1000.0
+    now = state.get_ticks() / 1000.0
     dur_list = state.intro_durations or []
     current_dur = dur_list[state.intro_index] if state.intro_index < len(dur_list) else INTRO_LINE_DURATION
     if now - state.intro_line_start >= current_dur:
@@ -1028,12 +1250,7 @@ def handle_events(state: GameState, events: list[pygame.event.Event]):
                 state.quests_open = False
         return
     if state.map_open:
-        screen = state.screen
-        full_rect = pygame.Rect(0, 0, screen.get_width(), screen.get_height())
-        map_w = int(full_rect.width * 0.985)
-        map_h = int(full_rect.height * 0.975)
-        map_rect = pygame.Rect(0, 0, map_w, map_h)
-        map_rect.center = full_rect.center
+        map_rect = get_map_rect(state.screen)
 
         base_scale_x = map_rect.width / ROOM3_FIELD_WIDTH
         base_scale_y = map_rect.height / ROOM3_FIELD_HEIGHT
@@ -1104,7 +1321,8 @@ def handle_events(state: GameState, events: list[pygame.event.Event]):
                 new_zoom = old_zoom + (event.y * step)
                 new_zoom = max(getattr(settings, "MAP_ZOOM_MIN", 1.0), min(new_zoom, getattr(settings, "MAP_ZOOM_MAX", 6.0)))
                 if new_zoom != old_zoom:
-                    mouse_pos = pygame.mouse.get_pos()
+                    # DeviceInput stamps the cursor on wheel events, so replays zoom about the same point.
+                    mouse_pos = getattr(event, "pos", pygame.mouse.get_pos())
                     center = pygame.Vector2(getattr(state, "map_center_world", pygame.Vector2(ROOM3_FIELD_WIDTH / 2, ROOM3_FIELD_HEIGHT / 2)))
                     old_scale_x = base_scale_x * old_zoom
                     old_scale_y = base_scale_y * old_zoom
@@ -1213,7 +1431,7 @@ def handle_events(state: GameState, events: list[pygame.event.Event]):
                             state.dialogue_index = min(state.resume_index, len(state.resume_lines) - 1)
                         else:
                             state.dialogue_index = 0
-                        state.dialogue_start_time = pygame.time.get_ticks() / 1000.0
+                        state.dialogue_start_time = state.get_ticks() / 1000.0
                         return
                     if state.post_boss_return_to_shopkeeper and not state.post_boss_shopkeeper_done:
                         state.post_boss_return_to_shopkeeper = False
@@ -1232,7 +1450,7 @@ def handle_events(state: GameState, events: list[pygame.event.Event]):
                         return
                     if not state.shopkeeper_greeted:
                         state.shopkeeper_greeted = True
-                        state.has_map = True
+                        give_map(state)
                         state.treasure_hint_visible = False
                         start_dialogue(
                             state,
@@ -1293,41 +1511,14 @@ def handle_events(state: GameState, events: list[pygame.event.Event]):
                             ],
                         )
                         return
-            # Left-click does sword swing; Shift+left-click fires the bow.
-            if player.health > 0 and not player.is_drinking_potion:
-                mods = pygame.key.get_mods()
-                is_shift_held = mods & pygame.KMOD_SHIFT
-                if is_shift_held and player.bow_equipped and player.bow_cooldown <= 0:
-                    # Ctrl+left-click fires the bow
-                    dir_vec = pygame.Vector2(player.facing)
-                    if dir_vec.length_squared() == 0:
-                        dir_vec = pygame.Vector2(1, 0)
-                    dir_vec = dir_vec.normalize()
-                    spawn_pos = player.pos + dir_vec * (settings.PLAYER_RADIUS + 10)
-                    state.arrows.append({
-                        "pos": spawn_pos,
-                        "dir": dir_vec,
-                    })
-                    player.bow_cooldown = settings.BOW_COOLDOWN
-                elif not is_shift_held and player.cooldown <= 0 and player.swing_timer <= 0:
-                    # Left-click does sword swing
-                    player.swing_timer = settings.PLAYER_SWING_TIME
-                    player.swing_recover_timer = 0.0
-                    player.cooldown = settings.PLAYER_COOLDOWN
-                    player.is_blocking = False  # Stop blocking when attacking
-                    if player.facing.length_squared() > 0:
-                        player.swing_base_dir = player.facing.normalize()
-                    else:
-                        player.swing_base_dir = pygame.Vector2(1, 0)
+            # Left-click does sword swing; Shift+left-click fires the bow (applied by update_game).
+            if state.input_source.key_mods() & pygame.KMOD_SHIFT:
+                state.input_source.queue_action(ACTION_FIRE)
+            else:
+                state.input_source.queue_action(ACTION_SWING)
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
-            # Only start blocking if the player has a shield equipped
-            if (
-                player.health > 0
-                and getattr(player, "shield_item", "") == settings.ITEM_RUSTY_SHIELD
-            ):
-                player.is_blocking = True
-        if event.type == pygame.MOUSEBUTTONUP and event.button == 3:
-            player.is_blocking = False
+            # Right-click raises the shield at once, even mid-swing (applied by update_game).
+            state.input_source.queue_action(ACTION_RAISE_SHIELD)
         if event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
             if not getattr(state, "inventory_open", False) and not state.map_open:
                 state.quests_open = not getattr(state, "quests_open", False)
@@ -1417,21 +1608,9 @@ def handle_events(state: GameState, events: list[pygame.event.Event]):
             state.inventory_open = not state.inventory_open
         # Use Shift key to dodge (press)
         if event.type == pygame.KEYDOWN and event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
-            start_dodge(state)
+            state.input_source.queue_action(ACTION_DODGE)
         if event.type == pygame.KEYDOWN and event.key == pygame.K_j:
-            if player.bow_equipped and player.bow_cooldown <= 0 and player.health > 0:
-                dir_vec = pygame.Vector2(player.facing)
-                if dir_vec.length_squared() == 0:
-                    dir_vec = pygame.Vector2(1, 0)
-                dir_vec = dir_vec.normalize()
-                spawn_pos = player.pos + dir_vec * (settings.PLAYER_RADIUS + 10)
-                state.arrows.append(
-                    {
-                        "pos": spawn_pos,
-                        "dir": dir_vec,
-                    }
-                )
-                player.bow_cooldown = settings.BOW_COOLDOWN
+            state.input_source.queue_action(ACTION_FIRE)
         if event.type == pygame.KEYDOWN and event.key == pygame.K_m:
             if state.has_map:
                 state.map_open = not state.map_open
@@ -1441,21 +1620,11 @@ def handle_events(state: GameState, events: list[pygame.event.Event]):
                     restore_dialogue(state)
 
 
-def start_dodge(state: GameState):
+def start_dodge(state: GameState, move: pygame.Vector2):
     """Start a quick dodge if ready, using the movement input direction when available."""
     player = state.player
     if player.health <= 0 or player.is_dodging or player.dodge_cooldown > 0:
         return
-    keys = pygame.key.get_pressed()
-    move = pygame.Vector2(0, 0)
-    if keys[pygame.K_w]:
-        move.y -= 1
-    if keys[pygame.K_s]:
-        move.y += 1
-    if keys[pygame.K_a]:
-        move.x -= 1
-    if keys[pygame.K_d]:
-        move.x += 1
     if move.length_squared() == 0:
         dir_vec = pygame.Vector2(player.facing)
         if dir_vec.length_squared() == 0:
@@ -1468,9 +1637,51 @@ def start_dodge(state: GameState):
     player.dodge_cooldown = settings.DODGE_COOLDOWN
 
 
+def fire_arrow(state: GameState):
+    """Loose an arrow along the player's facing if the bow is ready."""
+    player = state.player
+    if not player.bow_equipped or player.bow_cooldown > 0 or player.health <= 0:
+        return
+    dir_vec = pygame.Vector2(player.facing)
+    if dir_vec.length_squared() == 0:
+        dir_vec = pygame.Vector2(1, 0)
+    dir_vec = dir_vec.normalize()
+    spawn_pos = player.pos + dir_vec * (settings.PLAYER_RADIUS + 10)
+    state.arrows.append({
+        "pos": spawn_pos,
+        "dir": dir_vec,
+    })
+    player.bow_cooldown = settings.BOW_COOLDOWN
+
+
+def apply_player_actions(state: GameState, inp: InputSnapshot):
+    """Start the swings, shots, dodges and blocks this tick's input asks for."""
+    player = state.player
+    if inp.dodge:
+        start_dodge(state, inp.move)
+    if inp.fire:
+        fire_arrow(state)
+    if inp.swing and player.health > 0 and not player.is_drinking_potion:
+        if player.cooldown <= 0 and player.swing_timer <= 0:
+            player.swing_timer = settings.PLAYER_SWING_TIME
+            player.swing_recover_timer = 0.0
+            player.cooldown = settings.PLAYER_COOLDOWN
+            player.is_blocking = False  # Stop blocking when attacking
+            if player.facing.length_squared() > 0:
+                player.swing_base_dir = player.facing.normalize()
+            else:
+                player.swing_base_dir = pygame.Vector2(1, 0)
+    if inp.raise_shield and player.health > 0:
+        # Only start blocking if the player has a shield equipped
+        if getattr(player, "shield_item", "") == settings.ITEM_RUSTY_SHIELD:
+            player.is_blocking = True
+    if not inp.block:
+        player.is_blocking = False
+
+
 def update_game(state: GameState):
     player = state.player
-    keys = pygame.key.get_pressed()
+    inp = state.input_snapshot = state.input_source.snapshot(state)
     # Freeze world updates while the map or inventory is open so the player
     # and enemies can't move or attack while managing inventory/map.
     for chest in state.chests:
@@ -1503,6 +1714,9 @@ def update_game(state: GameState):
     if state.map_open or getattr(state, "inventory_open", False) or getattr(state, "quests_open", False):
         return
 
+    apply_player_actions(state, inp)
+    laps = profiler.laps("update/")
+
     def _clamp01(v: float) -> float:
         return max(0.0, min(1.0, v))
 
@@ -1510,16 +1724,9 @@ def update_game(state: GameState):
         t = _clamp01(t)
         return 0.5 - 0.5 * math.cos(math.pi * t)
 
+    prev_player_pos = pygame.Vector2(player.pos)
     if player.health > 0:
-        move = pygame.Vector2(0, 0)
-        if keys[pygame.K_w]:
-            move.y -= 1
-        if keys[pygame.K_s]:
-            move.y += 1
-        if keys[pygame.K_a]:
-            move.x -= 1
-        if keys[pygame.K_d]:
-            move.x += 1
+        move = pygame.Vector2(inp.move)
         move_input = pygame.Vector2(move)
         if player.is_dodging:
             dur = max(0.001, float(settings.DODGE_DURATION))
@@ -1541,7 +1748,7 @@ def update_game(state: GameState):
                 move = move.normalize()
                 # Hold Space to sprint
                 can_sprint = (not getattr(player, "stamina_exhausted", False)) and player.stamina > 0
-                sprinting = keys[pygame.K_SPACE] and can_sprint
+                sprinting = inp.sprint and can_sprint
                 player.is_sprinting = sprinting and move.length_squared() > 0
                 speed_mult = settings.SPRINT_SPEED_MULT if player.is_sprinting else 1.0
                 player.pos += move * player.speed * speed_mult * state.dt
@@ -1550,47 +1757,17 @@ def update_game(state: GameState):
             player.pos += player.knockback_vec * (settings.KNOCKBACK_SPEED * state.dt)
             player.knockback_timer -= state.dt
 
-        # Prevent walking through the table in the field (level 4)
-        if state.level_index == FIELD_LEVEL:
-            table_rect = get_room3_table_rect(state.screen, pygame.Vector2(0, 0))
-            push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, table_rect)
-            # Shopkeeper is also solid
-            keeper_rect = get_shopkeeper_rect(state.screen)
-            push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, keeper_rect)
-            for house_rect in get_field_house_solid_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
-                push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, house_rect)
-
-            for wall_rect in get_field_boss_arena_wall_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
-                push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, wall_rect)
-            if getattr(state, "boss_door_closed", False):
-                push_circle_out_of_rect(
-                    player.pos,
-                    settings.PLAYER_RADIUS,
-                    get_field_boss_arena_door_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT),
-                )
-            if state.spirit_spawned and not state.spirit_departed:
-                # Block the arena exit until the spirit departs.
-                push_circle_out_of_rect(
-                    player.pos,
-                    settings.PLAYER_RADIUS,
-                    get_field_boss_arena_door_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT),
-                )
-                push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, get_spirit_rect_world())
-
-        # Keep player inside the current world's bounds so they can't walk off-screen.
-        world_w, world_h = current_world_size(state)
-        player.pos.x = max(settings.PLAYER_RADIUS, min(player.pos.x, world_w - settings.PLAYER_RADIUS))
-        player.pos.y = max(settings.PLAYER_RADIUS, min(player.pos.y, world_h - settings.PLAYER_RADIUS))
+        # Keep the player out of solids (table, shopkeeper, houses, arena) and inside the world.
+        collision = get_collision_world(state)
+        collision.resolve_circle(player.pos, settings.PLAYER_RADIUS)
 
         if state.level_index == FIELD_LEVEL:
-            arena = get_field_boss_arena_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
+            arena = collision.arena_rect
             if arena.collidepoint(player.pos.x, player.pos.y) and not getattr(state, "boss_spawned", False):
                 spawn_pig_boss_encounter(state)
+                collision = get_collision_world(state)
             # If the boss door is closed, keep the player inside the arena interior so they can't clip out.
-            if getattr(state, "boss_door_closed", False):
-                thickness = 36
-                arena_inner = arena.inflate(-thickness * 2, -thickness * 2)
-                clamp_circle_in_rect(player.pos, settings.PLAYER_RADIUS, arena_inner)
+            collision.keep_in_arena(player.pos, settings.PLAYER_RADIUS)
 
         # Facing: lock-on target (Tab) or last movement direction.
         lock = state.lock_target if state.lock_target and state.lock_target.health > 0 else None
@@ -1600,8 +1777,9 @@ def update_game(state: GameState):
                 player.facing = pygame.Vector2(player.dodge_dir).normalize()
             elif move_input.length_squared() > 0:
                 target_facing = move_input.normalize()
-                # Smooth interpolation for reduced jitter (25% move towards target per frame).
-                player.facing = player.facing.lerp(target_facing, 0.25)
+                # Smooth interpolation for reduced jitter (25% of the way to the target per 60 Hz
+                # frame, scaled by dt so turning speed does not depend on SIM_HZ).
+                player.facing = player.facing.lerp(target_facing, 1.0 - 0.75 ** (state.dt * 60.0))
         else:
             to_target = lock.pos - player.pos
             if to_target.length_squared() > 0:
@@ -1614,57 +1792,21 @@ def update_game(state: GameState):
                 settings.PLAYER_SWING_TIME,
                 player.facing,
             )
+    if state.dt > 0:
+        player.velocity = (player.pos - prev_player_pos) / state.dt
+    laps.lap("player")
 
-    arena_walls: list[pygame.Rect] = []
-    arena_door = pygame.Rect(0, 0, 0, 0)
-    boss_door_closed = False
-    arena_inner: pygame.Rect | None = None
-    field_table_rect: pygame.Rect | None = None
-    field_keeper_rect: pygame.Rect | None = None
-    field_house_solids: list[pygame.Rect] = []
-    if state.level_index == FIELD_LEVEL:
-        arena_walls = get_field_boss_arena_wall_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
-        arena_door = get_field_boss_arena_door_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
-        boss_door_closed = getattr(state, "boss_door_closed", False)
-        field_table_rect = get_room3_table_rect(state.screen, pygame.Vector2(0, 0))
-        field_keeper_rect = get_shopkeeper_rect(state.screen)
-        field_house_solids = get_field_house_solid_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
-        if boss_door_closed:
-            thickness = 36
-            arena = get_field_boss_arena_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
-            arena_inner = arena.inflate(-thickness * 2, -thickness * 2)
+    collision = get_collision_world(state)
 
-    view_rect_world = pygame.Rect(
-        int(state.camera_offset.x),
-        int(state.camera_offset.y),
-        int(state.screen.get_width() / float(getattr(state, "camera_zoom", 1.0))),
-        int(state.screen.get_height() / float(getattr(state, "camera_zoom", 1.0))),
-    )
-
-    sight_blockers: list[pygame.Rect] = []
-    npc_exclusion_rects: list[pygame.Rect] = []
-    if state.level_index == FIELD_LEVEL:
-        if field_table_rect is not None:
-            sight_blockers.append(field_table_rect)
-        if field_keeper_rect is not None:
-            sight_blockers.append(field_keeper_rect)
-        sight_blockers.extend(field_house_solids)
-        sight_blockers.extend(arena_walls)
-        if boss_door_closed or (state.spirit_spawned and not state.spirit_departed):
-            sight_blockers.append(arena_door)
-        if state.spirit_spawned and not state.spirit_departed:
-            sight_blockers.append(get_spirit_rect_world())
-        safe_pad = getattr(settings, "NPC_ENEMY_EXCLUSION_PADDING", 240)
-        if field_table_rect is not None:
-            npc_exclusion_rects.append(field_table_rect.inflate(safe_pad * 2, safe_pad * 2))
-        if field_keeper_rect is not None:
-            npc_exclusion_rects.append(field_keeper_rect.inflate(safe_pad * 2, safe_pad * 2))
-        if state.spirit_spawned and not state.spirit_departed:
-            npc_exclusion_rects.append(get_spirit_rect_world().inflate(safe_pad * 2, safe_pad * 2))
+    view_rect_world = get_view_rect_world(state)
+    state.view_rect_world = view_rect_world
 
     spawn_pending_pigs_near_player(state, view_rect_world)
     sync_bacon_companion(state)
     despawn_far_enemies(state, view_rect_world)
+    pig_grid = state.pig_grid
+    pig_grid.sync([p for p in state.pigs if p.health > 0])
+    visible_enemies = [p for p in pig_grid.query_rect(view_rect_world) if not getattr(p, "is_ally", False)]
 
     for pig in state.pigs:
         if pig.health <= 0:
@@ -1673,13 +1815,7 @@ def update_game(state: GameState):
             to_player_for_leash = player.pos - pig.pos
             dist_to_player = to_player_for_leash.length()
             return_dist = getattr(settings, "ALLY_RETURN_DISTANCE", 520)
-            targets = [
-                p
-                for p in state.pigs
-                if p.health > 0
-                and not getattr(p, "is_ally", False)
-                and view_rect_world.collidepoint(p.pos.x, p.pos.y)
-            ]
+            targets = [p for p in visible_enemies if p.health > 0]
             # If the companion falls far behind, ignore enemies and catch up first.
             if dist_to_player > return_dist:
                 targets = []
@@ -1716,7 +1852,7 @@ def update_game(state: GameState):
             can_see_player = (
                 can_player_see_pig
                 and dist < state.chase_range
-                and line_of_sight_clear(pig.pos, player.pos, sight_blockers)
+                and collision.line_of_sight_clear(pig.pos, player.pos)
             )
             if can_see_player and dist > 0:
                 pig.facing = to_player / dist
@@ -1737,110 +1873,38 @@ def update_game(state: GameState):
             pig.knockback_timer -= state.dt
 
         if state.level_index == FIELD_LEVEL and pig.in_boss_arena:
-            for wall_rect in arena_walls:
-                push_circle_out_of_rect(pig.pos, pig.radius, wall_rect)
-            if boss_door_closed:
-                push_circle_out_of_rect(pig.pos, pig.radius, arena_door)
-            if boss_door_closed and arena_inner is not None:
-                clamp_circle_in_rect(pig.pos, pig.radius, arena_inner)
+            collision.push_out_of_arena_walls(pig.pos, pig.radius)
+            collision.keep_in_arena(pig.pos, pig.radius)
+    laps.lap("pig_ai")
 
     # Prevent pigs from overlapping/squishing together (simple circle separation).
     live_pigs = [p for p in state.pigs if p.health > 0]
+    pig_grid.sync(live_pigs)
     if len(live_pigs) > 1:
         # A couple passes makes the separation feel much more stable.
         for _ in range(2):
-            for i in range(len(live_pigs)):
-                a = live_pigs[i]
-                for j in range(i + 1, len(live_pigs)):
-                    b = live_pigs[j]
-                    delta = b.pos - a.pos
-                    dist_sq = delta.length_squared()
-                    min_dist = a.radius + b.radius + 6
-                    if dist_sq == 0:
-                        # Perfect overlap: pick a direction deterministically from indices.
-                        delta = pygame.Vector2(1, 0).rotate((i * 97 + j * 193) % 360)
-                        dist_sq = 1.0
-                    dist = math.sqrt(dist_sq)
-                    if dist < min_dist:
-                        push = (min_dist - dist) / 2.0
-                        dir_vec = delta / dist
-                        a.pos -= dir_vec * push
-                        b.pos += dir_vec * push
-
-            # Keep pigs inside bounds and re-apply boss arena walls after separation.
-            world_w, world_h = current_world_size(state)
+            separate_pigs_once(live_pigs, pig_grid)
+
+            # Keep pigs inside bounds and re-apply solids and boss arena walls after separation.
             for pig in live_pigs:
-                pig.pos.x = max(pig.radius, min(pig.pos.x, world_w - pig.radius))
-                pig.pos.y = max(pig.radius, min(pig.pos.y, world_h - pig.radius))
-                if state.level_index == FIELD_LEVEL:
-                    if field_table_rect is not None:
-                        push_circle_out_of_rect(pig.pos, pig.radius, field_table_rect)
-                    if field_keeper_rect is not None:
-                        push_circle_out_of_rect(pig.pos, pig.radius, field_keeper_rect)
-                    for house_rect in field_house_solids:
-                        push_circle_out_of_rect(pig.pos, pig.radius, house_rect)
-                    for wall_rect in arena_walls:
-                        push_circle_out_of_rect(pig.pos, pig.radius, wall_rect)
-                    if boss_door_closed or (state.spirit_spawned and not state.spirit_departed):
-                        push_circle_out_of_rect(pig.pos, pig.radius, arena_door)
-                    if boss_door_closed and pig.in_boss_arena and arena_inner is not None:
-                        clamp_circle_in_rect(pig.pos, pig.radius, arena_inner)
-                    if not getattr(pig, "is_ally", False) and npc_exclusion_rects:
-                        for safe_rect in npc_exclusion_rects:
-                            push_circle_out_of_rect(pig.pos, pig.radius, safe_rect)
+                collision.clamp_to_world(pig.pos, pig.radius)
+                pig_grid.update(pig)
+            if state.level_index == FIELD_LEVEL:
+                push_pigs_out_of_solids(live_pigs, pig_grid, collision)
 
     # Keep field pigs out of major solids (table/shop/houses/arena walls).
     if state.level_index == FIELD_LEVEL and live_pigs:
-        for pig in live_pigs:
-            if field_table_rect is not None:
-                push_circle_out_of_rect(pig.pos, pig.radius, field_table_rect)
-            if field_keeper_rect is not None:
-                push_circle_out_of_rect(pig.pos, pig.radius, field_keeper_rect)
-            for house_rect in field_house_solids:
-                push_circle_out_of_rect(pig.pos, pig.radius, house_rect)
-            for wall_rect in arena_walls:
-                push_circle_out_of_rect(pig.pos, pig.radius, wall_rect)
-            if boss_door_closed or (state.spirit_spawned and not state.spirit_departed):
-                push_circle_out_of_rect(pig.pos, pig.radius, arena_door)
-            if boss_door_closed and pig.in_boss_arena and arena_inner is not None:
-                clamp_circle_in_rect(pig.pos, pig.radius, arena_inner)
-            if not getattr(pig, "is_ally", False) and npc_exclusion_rects:
-                for safe_rect in npc_exclusion_rects:
-                    push_circle_out_of_rect(pig.pos, pig.radius, safe_rect)
+        push_pigs_out_of_solids(live_pigs, pig_grid, collision)
 
     # Treat pigs as solid so the player can't overlap them.
     if player.health > 0 and live_pigs:
         for pig in live_pigs:
             push_circle_out_of_circle(player.pos, settings.PLAYER_RADIUS, pig.pos, pig.radius)
-        world_w, world_h = current_world_size(state)
-        player.pos.x = max(settings.PLAYER_RADIUS, min(player.pos.x, world_w - settings.PLAYER_RADIUS))
-        player.pos.y = max(settings.PLAYER_RADIUS, min(player.pos.y, world_h - settings.PLAYER_RADIUS))
-        if state.level_index == FIELD_LEVEL:
-            table_rect = get_room3_table_rect(state.screen, pygame.Vector2(0, 0))
-            push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, table_rect)
-            keeper_rect = get_shopkeeper_rect(state.screen)
-            push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, keeper_rect)
-            for house_rect in get_field_house_solid_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
-                push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, house_rect)
-            for wall_rect in get_field_boss_arena_wall_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
-                push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, wall_rect)
-            if getattr(state, "boss_door_closed", False):
-                push_circle_out_of_rect(
-                    player.pos,
-                    settings.PLAYER_RADIUS,
-                    get_field_boss_arena_door_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT),
-                )
-                thickness = 36
-                arena = get_field_boss_arena_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
-                arena_inner = arena.inflate(-thickness * 2, -thickness * 2)
-                clamp_circle_in_rect(player.pos, settings.PLAYER_RADIUS, arena_inner)
-            if state.spirit_spawned and not state.spirit_departed:
-                push_circle_out_of_rect(
-                    player.pos,
-                    settings.PLAYER_RADIUS,
-                    get_field_boss_arena_door_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT),
-                )
-                push_circle_out_of_rect(player.pos, settings.PLAYER_RADIUS, get_spirit_rect_world())
+        # Bounds, then solids, then the arena interior.
+        collision.clamp_to_world(player.pos, settings.PLAYER_RADIUS)
+        collision.push_out_of_solids(player.pos, settings.PLAYER_RADIUS)
+        collision.keep_in_arena(player.pos, settings.PLAYER_RADIUS)
+    laps.lap("separation")
 
     if player.swing_timer > 0:
         prev_swing = player.swing_timer
@@ -1852,11 +1916,8 @@ def update_game(state: GameState):
         player.cooldown -= state.dt
     
     # Re-enable shield if right-click is held and swing is done
-    keys = pygame.key.get_pressed()
-    mouse_buttons = pygame.mouse.get_pressed()
-    if mouse_buttons[2]:  # Right mouse button (index 2)
-        if player.health > 0 and player.swing_timer <= 0:
-            player.is_blocking = True
+    if inp.block and player.health > 0 and player.swing_timer <= 0:
+        player.is_blocking = True
     if player.bow_cooldown > 0:
         player.bow_cooldown -= state.dt
         if player.bow_cooldown < 0:
@@ -1908,6 +1969,10 @@ def update_game(state: GameState):
         state.shake_timer -= state.dt
         if state.shake_timer < 0:
             state.shake_timer = 0
+    laps.lap("timers")
+
+    # Pigs are done moving for this frame; hits below look them up by position.
+    pig_grid.sync([p for p in state.pigs if p.health > 0])
 
     # Move arrows and apply damage
     if state.arrows:
@@ -1915,10 +1980,10 @@ def update_game(state: GameState):
         for arrow in state.arrows:
             arrow["pos"] = arrow["pos"] + arrow["dir"] * (settings.BOW_SPEED * state.dt)
             pos = arrow["pos"]
-            if not (0 <= pos.x <= state.screen.get_width() and 0 <= pos.y <= state.screen.get_height()):
+            if not view_rect_world.collidepoint(pos.x, pos.y):
                 continue
             hit = False
-            for pig in state.pigs:
+            for pig in pig_grid.query_radius(pos, 0):
                 if pig.health <= 0:
                     continue
                 if getattr(pig, "is_ally", False):
@@ -1944,9 +2009,12 @@ def update_game(state: GameState):
             if s["timer"] > 0:
                 keep.append(s)
         state.blood_splats = keep
+    laps.lap("arrows")
 
+    # Anything a sword can touch this frame is within this distance of the swinger.
+    sword_reach = max(settings.PLAYER_SWING_DISTANCE, settings.PIG_SWING_DISTANCE) + settings.SWORD_LENGTH + settings.SWORD_WIDTH
     if player.health > 0:
-        for pig in state.pigs:
+        for pig in pig_grid.query_radius(player.pos, sword_reach):
             if pig.health <= 0:
                 continue
             if getattr(pig, "is_ally", False):
@@ -1983,7 +2051,7 @@ def update_game(state: GameState):
                     pig.knockback_vec = dir_vec.normalize()
                     pig.knockback_timer = settings.KNOCKBACK_DURATION
                 state.shake_timer = max(state.shake_timer, settings.SHAKE_DURATION)
-                spawn_blood_splatter(pig.pos, state.blood_splats)
+                spawn_blood_splatter(pig.pos, state.blood_splats, state.rng)
                 if pig.health == 0 and not pig.coin_dropped:
                     state.coin_pickups.append({"pos": pig.pos.copy(), "value": settings.COIN_VALUE})
                     pig.coin_dropped = True
@@ -1999,16 +2067,11 @@ def update_game(state: GameState):
             state.door_revealed = False
 
     # Ally summon attacks nearby enemies (within the player's view).
+    visible_enemies = [p for p in pig_grid.query_rect(view_rect_world) if not getattr(p, "is_ally", False)]
     for ally in state.pigs:
         if ally.health <= 0 or not getattr(ally, "is_ally", False):
             continue
-        targets = [
-            p
-            for p in state.pigs
-            if p.health > 0
-            and not getattr(p, "is_ally", False)
-            and view_rect_world.collidepoint(p.pos.x, p.pos.y)
-        ]
+        targets = [p for p in visible_enemies if p.health > 0]
         if not targets:
             continue
         target = min(targets, key=lambda t: (t.pos - ally.pos).length_squared())
@@ -2042,7 +2105,7 @@ def update_game(state: GameState):
             if dir_vec.length_squared() > 0:
                 target.knockback_vec = dir_vec.normalize()
                 target.knockback_timer = settings.KNOCKBACK_DURATION
-            spawn_blood_splatter(target.pos, state.blood_splats)
+            spawn_blood_splatter(target.pos, state.blood_splats, state.rng)
             if target.health == 0:
                 if target.is_boss:
                     handle_boss_defeated(state, target.pos)
@@ -2051,7 +2114,7 @@ def update_game(state: GameState):
                     target.coin_dropped = True
 
     if player.health > 0:
-        for pig in state.pigs:
+        for pig in pig_grid.query_radius(player.pos, sword_reach + settings.PLAYER_RADIUS):
             if pig.health <= 0:
                 continue
             if getattr(pig, "is_ally", False):
@@ -2090,10 +2153,11 @@ def update_game(state: GameState):
                         player.knockback_vec = dir_vec.normalize()
                         player.knockback_timer = settings.KNOCKBACK_DURATION
                     state.shake_timer = max(state.shake_timer, settings.SHAKE_DURATION)
-                    spawn_blood_splatter(player.pos, state.blood_splats)
+                    spawn_blood_splatter(player.pos, state.blood_splats, state.rng)
                     if player.health == 0:
                         player.is_blocking = False
                         state.game_over = True
+    laps.lap("combat")
 
     if state.coin_pickups and player.health > 0:
         remaining = []
@@ -2111,13 +2175,13 @@ def update_game(state: GameState):
             state.level_index += 1
             reset_round(state)
             state.door_revealed = False
-            player.pos.update(settings.PLAYER_RADIUS + 20, state.screen.get_height() / 2)
+            player.pos.update(settings.PLAYER_RADIUS + 20, get_view_size(state)[1] / 2)
+    laps.lap("pickups")
 
 
 def draw_game(state: GameState):
     real_screen = state.screen
     player = state.player
-    keys = pygame.key.get_pressed()
     cam = state.camera_offset
     zoom = float(getattr(state, "camera_zoom", 1.0))
     if zoom <= 0:
@@ -2134,10 +2198,7 @@ def draw_game(state: GameState):
         pygame.draw.rect(screen, (28, 34, 48), full_rect)  # dark but not gloomy
         pygame.draw.rect(screen, (90, 120, 150), full_rect, 6)
 
-        map_w = int(full_rect.width * 0.985)
-        map_h = int(full_rect.height * 0.975)
-        map_rect = pygame.Rect(0, 0, map_w, map_h)
-        map_rect.center = full_rect.center
+        map_rect = get_map_rect(screen)
         pygame.draw.rect(screen, (40, 52, 70), map_rect, border_radius=12)
 
         map_zoom = float(getattr(state, "map_zoom", 1.0))
@@ -2182,12 +2243,6 @@ def draw_game(state: GameState):
                 max(inner.top, min(pos.y, inner.bottom)),
             )
 
-        def world_rect_to_map(rect_world: pygame.Rect) -> pygame.Rect:
-            tl = world_to_map(pygame.Vector2(rect_world.left, rect_world.top))
-            w = max(1, int(rect_world.width * scale_x))
-            h = max(1, int(rect_world.height * scale_y))
-            return pygame.Rect(int(tl.x), int(tl.y), w, h)
-
         placed_markers: list[tuple[pygame.Vector2, float]] = []
 
         def place_marker(pos: pygame.Vector2, radius: float) -> pygame.Vector2 | None:
@@ -2217,37 +2272,7 @@ def draw_game(state: GameState):
         # Map background + details clipped to the map area (so zoom/pan doesn't paint outside).
         prev_clip = screen.get_clip()
         screen.set_clip(map_rect)
-        env_base = get_field_map_surface((map_rect.width, map_rect.height), ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
-        if abs(map_zoom - 1.0) < 0.001:
-            env_map = env_base
-        else:
-            env_map = pygame.transform.smoothscale(
-                env_base,
-                (max(1, int(map_rect.width * map_zoom)), max(1, int(map_rect.height * map_zoom))),
-            )
-        origin = pygame.Vector2(
-            map_rect.centerx - center_world.x * scale_x,
-            map_rect.centery - center_world.y * scale_y,
-        )
-        screen.blit(env_map, (int(origin.x), int(origin.y)))
-
-        # No grid lines: keep the map looking natural.
-
-        arena_rect = world_rect_to_map(get_field_boss_arena_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT))
-        pygame.draw.rect(screen, (255, 120, 120), arena_rect, 3, border_radius=10)
-        pond_rect = world_rect_to_map(get_field_pond_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT))
-        pygame.draw.ellipse(screen, (110, 190, 255), pond_rect, 3)
-        for farm in get_field_farm_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
-            pygame.draw.rect(screen, (120, 240, 150), world_rect_to_map(farm), 3, border_radius=8)
-        for house in get_field_house_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
-            pygame.draw.rect(screen, (240, 220, 180), world_rect_to_map(house), 2, border_radius=6)
-        for rr in get_field_ruins_rects(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT):
-            pygame.draw.rect(screen, (200, 200, 220), world_rect_to_map(rr), 2, border_radius=10)
-        shrine = world_rect_to_map(get_field_shrine_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT))
-        pygame.draw.rect(screen, (210, 190, 255), shrine, 3, border_radius=10)
-
-        table = get_room3_table_rect(state.screen, pygame.Vector2(0, 0))
-        pygame.draw.rect(screen, (255, 220, 80), world_rect_to_map(table), 3, border_radius=8)
+        screen.blit(get_map_base_layer(state, map_rect, center_world, map_zoom), map_rect.topleft)
 
         # Waystones on map (clickable if discovered).
         for ws in getattr(state, "waystones", []):
@@ -2328,7 +2353,26 @@ def draw_game(state: GameState):
 
     view_w = max(1, int(real_screen.get_width() / zoom))
     view_h = max(1, int(real_screen.get_height() / zoom))
-    screen = pygame.Surface((view_w, view_h))
+    # Below 1.0 the world is drawn with RENDER_SCALE layer pixels per world pixel and resized to
+    # the screen; the HUD below is still drawn at full resolution.
+    rs = state.render_scale if 0 < state.render_scale < 1.0 else 1.0
+    layer_size = (max(1, int(view_w * rs)), max(1, int(view_h * rs)))
+    # Zoomed out on the field, the ground goes straight onto the real screen from the smaller
+    # tile mip levels; the world layer on top is transparent so it can be scaled over it.
+    ground_on_real_screen = state.level_index == FIELD_LEVEL and zoom < 1.0
+    if layer_size == real_screen.get_size():
+        # Nothing to resize: draw the world straight onto the screen.
+        screen = real_screen
+    elif ground_on_real_screen:
+        screen = get_world_layer(layer_size, alpha=True)
+        screen.fill((0, 0, 0, 0))
+    else:
+        # The ground / room fill below covers the whole layer, so no clear is needed.
+        screen = get_world_layer(layer_size)
+
+    laps = profiler.laps("draw/")
+    visible = cull_world_draw_lists(state)
+    laps.lap("cull")
 
     if state.level_index != FIELD_LEVEL:
         bg_gray = (120, 120, 120)
@@ -2342,14 +2386,28 @@ def draw_game(state: GameState):
             (room_w * 0.8, room_h * 0.6),
         ]
         for rx, ry in rock_positions:
-            center = pygame.Vector2(rx, ry) - cam
-            pygame.draw.circle(screen, rock_color, (int(center.x), int(center.y)), 36)
-            pygame.draw.circle(screen, rock_highlight, (int(center.x - 12), int(center.y - 14)), 10)
+            center = to_layer(pygame.Vector2(rx, ry) - cam, rs)
+            highlight = to_layer(pygame.Vector2(rx - 12, ry - 14) - cam, rs)
+            pygame.draw.circle(screen, rock_color, (int(center.x), int(center.y)), to_layer_len(36, rs))
+            pygame.draw.circle(screen, rock_highlight, (int(highlight.x), int(highlight.y)), to_layer_len(10, rs))
+        laps.lap("tiles")
         if state.level_index == 1:
-            draw_room1_chests(state, cam, surface=screen)
+            draw_room1_chests(state, cam, surface=screen, chests=visible["chests"], scale=rs)
     else:
-        blit_field_environment(screen, cam, ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
-        draw_room1_chests(state, cam, surface=screen)
+        if ground_on_real_screen:
+            blit_field_environment(real_screen, cam, ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT, scale=zoom)
+        else:
+            blit_field_environment(screen, cam, ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT, scale=rs)
+        prefetch_field_tiles(
+            cam,
+            real_screen.get_size(),
+            ROOM3_FIELD_WIDTH,
+            ROOM3_FIELD_HEIGHT,
+            velocity=player.velocity,
+            zoom=zoom,
+        )
+        laps.lap("tiles")
+        draw_room1_chests(state, cam, surface=screen, chests=visible["chests"], scale=rs)
 
         table_color = (150, 100, 40)
         table_outline = (90, 60, 20)
@@ -2357,8 +2415,8 @@ def draw_game(state: GameState):
         leg_w, leg_h = 10, 36
         t_rect_world = get_room3_table_rect(real_screen, pygame.Vector2(0, 0))
         t_rect = t_rect_world.move(int(-cam.x), int(-cam.y))
-        pygame.draw.rect(screen, table_color, t_rect)
-        pygame.draw.rect(screen, table_outline, t_rect, 2)
+        pygame.draw.rect(screen, table_color, to_layer_rect(t_rect, rs))
+        pygame.draw.rect(screen, table_outline, to_layer_rect(t_rect, rs), to_layer_len(2, rs))
         legs = [
             pygame.Rect(t_rect.left + 12, t_rect.bottom, leg_w, leg_h),
             pygame.Rect(t_rect.right - 12 - leg_w, t_rect.bottom, leg_w, leg_h),
@@ -2366,56 +2424,58 @@ def draw_game(state: GameState):
             pygame.Rect(t_rect.right - 12 - leg_w, t_rect.bottom + leg_h + 2, leg_w, 2),
         ]
         for lr in legs:
-            pygame.draw.rect(screen, leg_color, lr)
+            pygame.draw.rect(screen, leg_color, to_layer_rect(lr, rs))
 
         # Shopkeeper behind the table
         npc_rect_world = get_shopkeeper_rect(real_screen)
         npc_rect = npc_rect_world.move(int(-cam.x), int(-cam.y))
-        pygame.draw.rect(screen, (90, 60, 20), npc_rect)
-        pygame.draw.rect(screen, (70, 40, 10), npc_rect, 2)
+        pygame.draw.rect(screen, (90, 60, 20), to_layer_rect(npc_rect, rs))
+        pygame.draw.rect(screen, (70, 40, 10), to_layer_rect(npc_rect, rs), to_layer_len(2, rs))
         head_r = max(10, int(min(npc_rect.width, npc_rect.height) * 0.18))
-        head_center = (npc_rect.centerx, npc_rect.top + head_r + 2)
-        pygame.draw.circle(screen, (240, 210, 180), head_center, head_r)
+        head_center = to_layer((npc_rect.centerx, npc_rect.top + head_r + 2), rs)
+        pygame.draw.circle(screen, (240, 210, 180), head_center, to_layer_len(head_r, rs))
         prompt = state.font.render('Click on me to talk', True, (255, 255, 200))
-        screen.blit(prompt, (npc_rect.centerx - prompt.get_width() // 2, npc_rect.top - 26))
+        blit_to_layer(screen, prompt, (npc_rect.centerx - prompt.get_width() // 2, npc_rect.top - 26), rs)
 
         # Waystones (stepping-stone circles)
-        for ws in getattr(state, "waystones", []):
+        for ws in visible["waystones"]:
             pos = pygame.Vector2(ws.get("pos", (0, 0))) - cam
             ws_id = ws.get("id", "")
             discovered = (not ws_id) or (ws_id in getattr(state, "discovered_waystones", set()))
             r = int(getattr(settings, "WAYSTONE_RADIUS", 34))
             base = (130, 140, 150) if discovered else (80, 90, 100)
-            pygame.draw.circle(screen, base, (int(pos.x), int(pos.y)), r)
-            pygame.draw.circle(screen, (40, 50, 60), (int(pos.x), int(pos.y)), r, 4)
-            pygame.draw.circle(screen, (180, 200, 220), (int(pos.x), int(pos.y)), max(6, r // 5), 2)
+            lp = to_layer(pos, rs)
+            center = (int(lp.x), int(lp.y))
+            pygame.draw.circle(screen, base, center, to_layer_len(r, rs))
+            pygame.draw.circle(screen, (40, 50, 60), center, to_layer_len(r, rs), to_layer_len(4, rs))
+            pygame.draw.circle(screen, (180, 200, 220), center, to_layer_len(max(6, r // 5), rs), to_layer_len(2, rs))
             if discovered and (player.pos - pygame.Vector2(ws.get("pos", (0, 0)))).length() <= getattr(settings, "WAYSTONE_DISCOVER_RADIUS", 140):
                 if state.font:
                     ptxt = state.font.render("Press E to attune", True, (240, 240, 255))
-                    screen.blit(ptxt, (int(pos.x - ptxt.get_width() / 2), int(pos.y - r - 34)))
+                    blit_to_layer(screen, ptxt, (int(pos.x - ptxt.get_width() / 2), int(pos.y - r - 34)), rs)
 
         if getattr(state, "boss_door_closed", False):
             boss_door_world = get_field_boss_arena_door_rect(ROOM3_FIELD_WIDTH, ROOM3_FIELD_HEIGHT)
-            boss_door = boss_door_world.move(int(-cam.x), int(-cam.y))
+            boss_door = to_layer_rect(boss_door_world.move(int(-cam.x), int(-cam.y)), rs)
             pygame.draw.rect(screen, (90, 60, 20), boss_door)
-            pygame.draw.rect(screen, (180, 140, 60), boss_door, 3)
+            pygame.draw.rect(screen, (180, 140, 60), boss_door, to_layer_len(3, rs))
 
         if state.spirit_spawned and not state.spirit_departed:
             spirit_world = get_spirit_rect_world()
             spirit_rect = spirit_world.move(int(-cam.x), int(-cam.y))
-            glow = spirit_rect.inflate(24, 24)
+            glow = to_layer_rect(spirit_rect.inflate(24, 24), rs)
             pygame.draw.ellipse(screen, (140, 220, 255), glow)
-            pygame.draw.ellipse(screen, (40, 80, 120), glow, 3)
-            pygame.draw.ellipse(screen, (220, 250, 255), spirit_rect)
-            pygame.draw.ellipse(screen, (40, 80, 120), spirit_rect, 2)
+            pygame.draw.ellipse(screen, (40, 80, 120), glow, to_layer_len(3, rs))
+            pygame.draw.ellipse(screen, (220, 250, 255), to_layer_rect(spirit_rect, rs))
+            pygame.draw.ellipse(screen, (40, 80, 120), to_layer_rect(spirit_rect, rs), to_layer_len(2, rs))
             if state.font and spirit_world.inflate(160, 160).collidepoint(player.pos.x, player.pos.y):
                 prompt = state.font.render("Press E to talk", True, (240, 240, 255))
-                screen.blit(prompt, (spirit_rect.centerx - prompt.get_width() // 2, spirit_rect.top - 30))
+                blit_to_layer(screen, prompt, (spirit_rect.centerx - prompt.get_width() // 2, spirit_rect.top - 30), rs)
 
         icon_x = t_rect.centerx - 16
         icon_y = t_rect.centery - 16
         if LEATHER_ARMOR_UNLOCKED and not state.leather_armor_bought:
-            pygame.draw.rect(screen, (139, 69, 19), (icon_x, icon_y, 32, 32))
+            pygame.draw.rect(screen, (139, 69, 19), to_layer_rect(pygame.Rect(icon_x, icon_y, 32, 32), rs))
         label = "Leather Armor - unavailable"
         tip = "Not available yet"
         if LEATHER_ARMOR_UNLOCKED:
@@ -2427,545 +2487,64 @@ def draw_game(state: GameState):
             tip = "Press E to buy" if not state.leather_armor_bought else "You own it!"
         label_surf = state.font.render(label, True, (255, 255, 255))
         tip_surf = state.font.render(tip, True, (220, 220, 220))
-        screen.blit(label_surf, (t_rect.centerx - label_surf.get_width() // 2, t_rect.top - 28))
-        screen.blit(tip_surf, (t_rect.centerx - tip_surf.get_width() // 2, t_rect.bottom + 14))
+        blit_to_layer(screen, label_surf, (t_rect.centerx - label_surf.get_width() // 2, t_rect.top - 28), rs)
+        blit_to_layer(screen, tip_surf, (t_rect.centerx - tip_surf.get_width() // 2, t_rect.bottom + 14), rs)
 
+    laps.lap("entities")
     if player.health > 0:
-        p_screen = player.pos - cam
-        screen_out = screen
-        player_layer: pygame.Surface | None = None
-        layer_offset = pygame.Vector2(0, 0)
-        if player.is_dodging:
-            layer_size = max(220, int(settings.PLAYER_RADIUS * 7))
-            player_layer = pygame.Surface((layer_size, layer_size), pygame.SRCALPHA)
-            screen = player_layer
-            layer_offset = pygame.Vector2(layer_size / 2 - p_screen.x, layer_size / 2 - p_screen.y)
-
-        p = p_screen + layer_offset
-        hip_y = p.y + settings.PLAYER_RADIUS * 0.6
-        leg_len = settings.PLAYER_RADIUS + 16
-        leg_swing = 0
-        move_speed = player.speed if player.health > 0 else 0
-        keys_down = keys[pygame.K_w] or keys[pygame.K_a] or keys[pygame.K_s] or keys[pygame.K_d]
-        time_tick = pygame.time.get_ticks()
-        if move_speed > 0 and keys_down:
-            leg_swing = int(18 * math.sin(time_tick * 0.011))
-        # small idle bob for breathing / animation
-        bob = math.sin(time_tick * 0.004) * 2
-        leg_thickness = 12
-        left_hip = (int(p.x - 18), int(hip_y))
-        left_foot = (int(p.x - 20 + leg_swing), int(hip_y + leg_len))
-        right_hip = (int(p.x + 18), int(hip_y))
-        right_foot = (int(p.x + 20 - leg_swing), int(hip_y + leg_len))
-        pygame.draw.line(screen, (60, 0, 0), left_hip, left_foot, leg_thickness)
-        pygame.draw.line(screen, (60, 0, 0), right_hip, right_foot, leg_thickness)
-
-        move_dir = pygame.Vector2(0, 0)
-        if keys[pygame.K_w]:
-            move_dir.y -= 1
-        if keys[pygame.K_s]:
-            move_dir.y += 1
-        if keys[pygame.K_a]:
-            move_dir.x -= 1
-        if keys[pygame.K_d]:
-            move_dir.x += 1
-
-        walking_vertical = (
-            keys_down
-            and move_dir.length_squared() > 0
-            and move_dir.y != 0
-            and abs(move_dir.y) >= abs(move_dir.x)
-        )
+        # Pre-rendered per pose, and per roll angle while dodging (see sprites.py)
+        p_screen = to_layer(player.pos - cam, rs)
+        draw_player_sprite(screen, player, p_screen, state.input_snapshot.move, state.get_ticks(), scale=rs)
+    laps.lap("player")
 
-        # Small boots at the feet (wide, short) for more character.
-        boot_w, boot_h = 18, 8
-        boot_col = (35, 25, 20)
-        boot_outline = (10, 10, 10)
-        boot_highlight = (80, 60, 45)
-
-        boot_face_dir = pygame.Vector2(0, 0)
-        if walking_vertical:
-            boot_face_dir = pygame.Vector2(0, -1)
-        elif keys_down and move_dir.length_squared() > 0 and move_dir.x != 0:
-            boot_face_dir = pygame.Vector2(1 if move_dir.x > 0 else -1, 0)
-        else:
-            look_x = float(player.facing.x)
-            if abs(look_x) >= 0.25:
-                boot_face_dir = pygame.Vector2(1 if look_x > 0 else -1, 0)
-            else:
-                boot_face_dir = pygame.Vector2(1, 0)
-
-        def draw_boot(fx: int, fy: int):
-            boot = pygame.Rect(int(fx - boot_w / 2), int(fy - boot_h / 2), boot_w, boot_h)
-            pygame.draw.rect(screen, boot_col, boot, border_radius=3)
-            pygame.draw.rect(screen, boot_outline, boot, 2, border_radius=3)
-
-            toe_len = max(4, int(boot_h * 0.9))
-            toe = None
-            if boot_face_dir.x > 0.1:
-                toe = pygame.Rect(boot.right - 2, boot.top + 1, toe_len, max(1, boot.height - 2))
-            elif boot_face_dir.x < -0.1:
-                toe = pygame.Rect(boot.left - toe_len + 2, boot.top + 1, toe_len, max(1, boot.height - 2))
-            elif boot_face_dir.y < -0.1:
-                toe = pygame.Rect(boot.left + 1, boot.top - toe_len + 2, max(1, boot.width - 2), toe_len)
-            elif boot_face_dir.y > 0.1:
-                toe = pygame.Rect(boot.left + 1, boot.bottom - 2, max(1, boot.width - 2), toe_len)
-
-            if toe is not None:
-                pygame.draw.rect(screen, boot_col, toe, border_radius=3)
-                pygame.draw.rect(screen, boot_outline, toe, 2, border_radius=3)
-
-            # Highlight on the "front" edge so the boot reads as facing a direction.
-            if boot_face_dir.x > 0.1:
-                pygame.draw.line(
-                    screen,
-                    boot_highlight,
-                    (boot.right - 2, boot.top + 2),
-                    (boot.right - 2, boot.bottom - 2),
-                    2,
-                )
-            elif boot_face_dir.x < -0.1:
-                pygame.draw.line(
-                    screen,
-                    boot_highlight,
-                    (boot.left + 2, boot.top + 2),
-                    (boot.left + 2, boot.bottom - 2),
-                    2,
-                )
-            elif boot_face_dir.y < -0.1:
-                pygame.draw.line(
-                    screen,
-                    boot_highlight,
-                    (boot.left + 2, boot.top + 2),
-                    (boot.right - 2, boot.top + 2),
-                    2,
-                )
-            else:
-                pygame.draw.line(
-                    screen,
-                    boot_highlight,
-                    (boot.left + 2, boot.bottom - 2),
-                    (boot.right - 2, boot.bottom - 2),
-                    2,
-                )
-
-        for fx, fy in (left_foot, right_foot):
-            draw_boot(int(fx), int(fy))
-        attack_dir = (
-            get_swing_dir(player.swing_base_dir, player.swing_timer, settings.PLAYER_SWING_TIME, player.facing)
-            if player.swing_timer > 0
-            else (player.facing if player.facing.length_squared() > 0 else pygame.Vector2(1, 0))
-        )
-        base_body_color = (200, 90, 80)
-        if player.is_dodging:
-            base_body_color = (120, 200, 120)
-        head_center = pygame.Vector2(p.x, p.y - settings.PLAYER_RADIUS * 0.85 + bob)
-        head_radius = settings.PLAYER_RADIUS // 2
-        body_width = int(settings.PLAYER_RADIUS * 1.4)
-        body_height = int(settings.PLAYER_RADIUS * 1.8)
-        body_rect = pygame.Rect(
-            int(p.x - body_width // 2),
-            int(p.y - body_height // 2 + bob),
-            body_width,
-            body_height,
-        )
-        leg_center = (int(p.x), int(p.y + settings.PLAYER_RADIUS * 0.6))
-        leg_radius = settings.PLAYER_RADIUS // 2 + 6
-
-        head_color = (235, 205, 160) if player.head_item else (200, 180, 160)
-        body_color = (170, 100, 90) if not player.armor_equipped else (150, 120, 80)
-        leg_color = (100, 60, 50)
-        arm_color = (170, 110, 80)
-        arm_len = int(settings.PLAYER_SWING_DISTANCE * 0.8)
-        shoulder_y = body_rect.top + int(body_height * 0.2)
-        arm_x_offset = body_width // 2 - 4  # keep close to torso without being flush
-        arm_drop = settings.PLAYER_RADIUS * 0.05
-
-        # Idle pose: arms hang down with ~30 deg outward angle, with light swing tied to legs
-        rest_angle = math.radians(30)
-        sway_angle = math.radians(leg_swing * 0.3)
-        arm_angle = rest_angle + sway_angle
-        idle_arm_dir = pygame.Vector2(math.sin(arm_angle), math.cos(arm_angle))  # right arm points down/out
-        if move_dir.length_squared() > 0:
-            # bias arm slightly toward movement direction without opening the armpit too wide
-            idle_arm_dir = idle_arm_dir.lerp(move_dir.normalize(), 0.25)
-        if idle_arm_dir.length_squared() == 0:
-            idle_arm_dir = pygame.Vector2(0.5, 1)
-        idle_arm_dir = idle_arm_dir.normalize()
-
-        swing_progress = swing_ease(player.swing_timer, settings.PLAYER_SWING_TIME) if player.swing_timer > 0 else 0.0
-        swing_reach = swing_reach_multiplier(player.swing_timer, settings.PLAYER_SWING_TIME) if player.swing_timer > 0 else 1.0
-        arm_dir = pygame.Vector2(idle_arm_dir)
-        reach_mult = 1.0
-
-        if player.swing_timer > 0:
-            target_dir = pygame.Vector2(attack_dir)
-            if target_dir.length_squared() == 0:
-                target_dir = pygame.Vector2(1, 0)
-            target_dir = target_dir.normalize()
-            arm_dir = idle_arm_dir.lerp(target_dir, swing_progress).normalize()
-            reach_mult = swing_reach
-            player.last_swing_reach = reach_mult
-        elif player.swing_recover_timer > 0:
-            recover_blend = swing_ease(player.swing_recover_timer, settings.PLAYER_SWING_RECOVER_TIME)
-            arm_dir = pygame.Vector2(player.last_attack_dir).lerp(idle_arm_dir, recover_blend)
-            if arm_dir.length_squared() == 0:
-                arm_dir = pygame.Vector2(idle_arm_dir)
-            arm_dir = arm_dir.normalize()
-            reach_mult = player.last_swing_reach + (1.0 - player.last_swing_reach) * recover_blend
-        # else: arm_dir stays at idle, reach_mult at 1
-
-        arm_drop_vec = pygame.Vector2(0, arm_drop)
-
-        # legs
-        pygame.draw.circle(screen, leg_color, leg_center, leg_radius)
-        # Body with simple outline and trim
-        outline_rect = body_rect.inflate(6, 6)
-        pygame.draw.rect(screen, (60, 40, 40), outline_rect, border_radius=6)
-        pygame.draw.rect(screen, base_body_color, body_rect, border_radius=6)
-        inner_body = body_rect.inflate(-8, -8)
-        pygame.draw.rect(screen, body_color, inner_body, border_radius=4)
-        panel_rect = inner_body.inflate(
-            -int(inner_body.width * 0.35),
-            -int(inner_body.height * 0.2),
-        )
-        pygame.draw.rect(screen, (210, 160, 160) if not player.armor_equipped else (190, 150, 90), panel_rect, border_radius=4)
-        belt_rect = pygame.Rect(inner_body.left, inner_body.centery + 6, inner_body.width, 10)
-        pygame.draw.rect(screen, (60, 40, 20), belt_rect, border_radius=4)
-        hem_rect = pygame.Rect(inner_body.left, inner_body.bottom - 10, inner_body.width, 8)
-        pygame.draw.rect(screen, (80, 40, 40), hem_rect, border_radius=3)
-
-        left_arm_start = pygame.Vector2(p.x - arm_x_offset, shoulder_y)
-        if player.swing_timer > 0 or player.swing_recover_timer > 0:
-            # Freeze shield arm during sword swings
-            left_arm_end_vec = left_arm_start + pygame.Vector2(0, arm_len * 0.6)
-        else:
-            # left arm swings opposite to right
-            left_arm_dir = pygame.Vector2(-arm_dir.x, arm_dir.y * 0.9)
-            left_arm_end_vec = left_arm_start + left_arm_dir.normalize() * int(arm_len * 0.9) + arm_drop_vec
-        right_arm_start = pygame.Vector2(p.x + arm_x_offset, shoulder_y)
-        right_arm_end_vec = right_arm_start + arm_dir * arm_len + arm_drop_vec
-
-        pygame.draw.line(screen, arm_color, left_arm_start, left_arm_end_vec, 8)
-        pygame.draw.line(screen, arm_color, right_arm_start, right_arm_end_vec, 8)
-
-        # Weapon held in right hand (moves with arm/facing)
-        sword_dir = arm_dir
-        grip_len = int(settings.SWORD_LENGTH * 0.3 * reach_mult)
-        blade_len = int(settings.SWORD_LENGTH * reach_mult)
-        grip_end = right_arm_end_vec + sword_dir * grip_len
-        blade_tip = grip_end + sword_dir * blade_len
-        cross_half = int(settings.SWORD_LENGTH * 0.18)
-        perp = pygame.Vector2(-sword_dir.y, sword_dir.x)
-        cross_left = grip_end + perp * cross_half
-        cross_right = grip_end - perp * cross_half
-
-        # Draw sword only if it's equipped
-        if player.weapon_item == settings.ITEM_RUSTY_SWORD:
-            # If bow is equipped and active, show bow animation instead
-            if player.bow_equipped and player.bow_cooldown > 0:
-                bow_base_left = right_arm_end_vec + perp * cross_half
-                bow_base_right = right_arm_end_vec - perp * cross_half
-                bow_tip = right_arm_end_vec + sword_dir * (settings.SWORD_LENGTH * 0.9)
-                pygame.draw.polygon(
-                    screen,
-                    (200, 200, 255),
-                    [
-                        (int(bow_base_left.x), int(bow_base_left.y)),
-                        (int(bow_base_right.x), int(bow_base_right.y)),
-                        (int(bow_tip.x), int(bow_tip.y)),
-                    ],
-                    2,
-                )
-                pygame.draw.circle(screen, (80, 50, 30), right_arm_end_vec, 6)  # hand/pommel
-            else:
-                # Zelda-like sword visuals
-                pygame.draw.line(screen, (120, 80, 40), right_arm_end_vec, grip_end, 8)  # grip
-                pygame.draw.line(screen, (220, 180, 70), cross_left, cross_right, 6)  # crossguard
-                pygame.draw.line(screen, (180, 210, 255), grip_end, blade_tip, 8)  # blade
-                pygame.draw.circle(screen, (80, 50, 30), right_arm_end_vec, 6)  # pommel/hand
-        elif player.bow_equipped:
-            # Draw bow when equipped (idle or firing)
-            bow_base_left = right_arm_end_vec + perp * cross_half
-            bow_base_right = right_arm_end_vec - perp * cross_half
-            bow_tip = right_arm_end_vec + sword_dir * (settings.SWORD_LENGTH * 0.9)
-            if player.bow_cooldown > 0:
-                pygame.draw.polygon(
-                    screen,
-                    (200, 200, 255),
-                    [
-                        (int(bow_base_left.x), int(bow_base_left.y)),
-                        (int(bow_base_right.x), int(bow_base_right.y)),
-                        (int(bow_tip.x), int(bow_tip.y)),
-                    ],
-                    2,
-                )
-            else:
-                # idle bow as a filled triangle
-                pygame.draw.polygon(screen, (180, 200, 230), [
-                    (int(bow_base_left.x), int(bow_base_left.y)),
-                    (int(bow_base_right.x), int(bow_base_right.y)),
-                    (int(bow_tip.x), int(bow_tip.y)),
-                ])
-        if player.armor_equipped:
-            # Simple chest plate overlay plus shoulder pads
-            pygame.draw.rect(screen, (200, 170, 90), inner_body.inflate(-10, -10), 4, border_radius=6)
-            pad_radius = 10
-            pad_offset = body_width // 2 - 6
-            pygame.draw.circle(screen, (180, 150, 80), (int(p.x - pad_offset), shoulder_y), pad_radius)
-            pygame.draw.circle(screen, (180, 150, 80), (int(p.x + pad_offset), shoulder_y), pad_radius)
-        else:
-            # Cloth collar/trim when not armored
-            collar = pygame.Rect(inner_body.left, inner_body.top - 6, inner_body.width, 8)
-            pygame.draw.rect(screen, (220, 200, 200), collar, border_radius=4)
-        if getattr(player, "shield_item", "") == settings.ITEM_RUSTY_SHIELD:
-            # Zelda-like shield: equilateral top linked to a lower triangle, always visible on left arm
-            body_center = pygame.Vector2(p.x, p.y)
-            # Shift toward torso when blocking but stop halfway instead of centering on the body
-            shift_toward_body = 0.5 if player.is_blocking else 0.25
-            anchor_base = left_arm_end_vec + (body_center - left_arm_end_vec) * shift_toward_body
-            # Keep the shield locked in place during sword swings so it doesn't slide when attacking
-            if player.swing_timer > 0 or player.swing_recover_timer > 0:
-                shield_anchor = body_center + player.shield_anchor_offset
-            else:
-                shield_anchor = anchor_base
-                player.shield_anchor_offset = shield_anchor - body_center
-
-            base_half = 28  # smaller shield
-            top_height = base_half * math.sqrt(3)  # equilateral triangle height for side = base_half*2
-            bottom_height = 72  # slightly shorter lower point
-
-            base_offset_y = 6
-            base_left = shield_anchor + pygame.Vector2(-base_half, base_offset_y)
-            base_right = shield_anchor + pygame.Vector2(base_half, base_offset_y)
-
-            # Equilateral top triangle (pointing upward/left-ish), shares base with bottom
-            top_tip = shield_anchor + pygame.Vector2(-base_half * 0.1, base_offset_y - top_height)
-
-            # Bottom triangle (pointing downward, slightly inset toward center)
-            bottom_tip = shield_anchor + pygame.Vector2(-base_half * 0.12, base_offset_y + bottom_height)
-
-            main_color = (96, 140, 200)
-            accent_color = (150, 200, 255)
-            outline_color = (60, 100, 160)
-
-            pygame.draw.polygon(screen, main_color, [top_tip, base_left, base_right])
-            pygame.draw.polygon(screen, accent_color, [base_left, base_right, bottom_tip])
-            pygame.draw.lines(
-                screen,
-                outline_color,
-                False,
-                [top_tip, base_left, bottom_tip, base_right, top_tip],
-                4,
-            )
-            pygame.draw.line(screen, outline_color, base_left, base_right, 3)
-
-        # Draw head last so arms/weapons don't cut across it.
-        pygame.draw.circle(screen, head_color, head_center, head_radius)
-        # Eyes: only look left/right when facing that way.
-        look_x = float(player.facing.x)
-        if abs(look_x) < 0.35:
-            pupil_dir = pygame.Vector2(0, 0)
-        else:
-            pupil_dir = pygame.Vector2(1 if look_x > 0 else -1, 0)
-        eye_sep = head_radius * 0.45
-        eye_drop = head_radius * 0.12
-        eye_r = max(3, int(head_radius * 0.20))
-        pupil_r = max(2, int(eye_r * 0.65))
-        pupil_max = max(0.0, eye_r - pupil_r - 1.0)
-        pupil_off = pupil_dir * pupil_max
-        for side in (-1, 1):
-            eye_center = head_center + pygame.Vector2(side * eye_sep, eye_drop)
-            pygame.draw.circle(screen, (250, 250, 250), (int(eye_center.x), int(eye_center.y)), eye_r)
-            pupil_center = eye_center + pupil_off
-            pygame.draw.circle(screen, (20, 20, 20), (int(pupil_center.x), int(pupil_center.y)), pupil_r)
-
-        if player_layer is not None:
-            dur = max(0.001, settings.DODGE_DURATION)
-            t = 1.0 - max(0.0, min(1.0, player.dodge_timer / dur))
-            phase = 0.5 - 0.5 * math.cos(math.pi * t)
-            roll_dir = pygame.Vector2(getattr(player, "dodge_dir", pygame.Vector2(0, 0)))
-            if roll_dir.length_squared() == 0:
-                roll_dir = pygame.Vector2(getattr(player, "facing", pygame.Vector2(0, -1)))
-            if roll_dir.length_squared() == 0:
-                roll_dir = pygame.Vector2(0, -1)
-            roll_dir = roll_dir.normalize()
-
-            # Rotate the sprite so the head leads the roll direction (head-first).
-            face_deg = math.degrees(math.atan2(roll_dir.x, -roll_dir.y))  # 0=up, 90=right, 180=down, -90=left
-
-            # Spin direction: pick a consistent "forward tumble" feel.
-            if abs(roll_dir.x) >= abs(roll_dir.y):
-                spin_sign = 1.0 if roll_dir.x < 0 else -1.0
-            else:
-                spin_sign = -1.0 if roll_dir.y > 0 else 1.0
-
-            tumble_deg = phase * 360.0 * spin_sign
-            angle = (-face_deg) + tumble_deg
-            rotated = pygame.transform.rotozoom(player_layer, angle, 1.0)
-
-            knee_bend = math.sin(math.pi * t)
-            squash_x = 1.0 + 0.10 * knee_bend
-            squash_y = 1.0 - 0.22 * knee_bend
-            scaled_w = max(1, int(rotated.get_width() * squash_x))
-            scaled_h = max(1, int(rotated.get_height() * squash_y))
-            bent = pygame.transform.smoothscale(rotated, (scaled_w, scaled_h))
-            rect = bent.get_rect(center=(int(p_screen.x), int(p_screen.y + knee_bend * 6)))
-            screen_out.blit(bent, rect)
-            screen = screen_out
-
-    for coin in state.coin_pickups:
-        cpos = coin["pos"] - cam
-        pygame.draw.circle(screen, (255, 215, 0), (int(cpos.x), int(cpos.y)), 10)
-        pygame.draw.circle(screen, (90, 70, 0), (int(cpos.x), int(cpos.y)), 10, 2)
+    for coin in visible["coins"]:
+        cpos = to_layer(coin["pos"] - cam, rs)
+        pygame.draw.circle(screen, (255, 215, 0), (int(cpos.x), int(cpos.y)), to_layer_len(10, rs))
+        pygame.draw.circle(screen, (90, 70, 0), (int(cpos.x), int(cpos.y)), to_layer_len(10, rs), to_layer_len(2, rs))
 
     if state.door_revealed:
-        door = get_door_rect_world(state).move(int(-cam.x), int(-cam.y))
+        door = to_layer_rect(get_door_rect_world(state).move(int(-cam.x), int(-cam.y)), rs)
         if state.level_index == 1:
             pygame.draw.rect(screen, settings.FIRST_ROOM_DOOR_COLOR, door)
-            pygame.draw.rect(screen, settings.FIRST_ROOM_DOOR_OUTLINE, door, 6)
+            pygame.draw.rect(screen, settings.FIRST_ROOM_DOOR_OUTLINE, door, to_layer_len(6, rs))
         else:
             pygame.draw.rect(screen, (90, 60, 20), door)
-            pygame.draw.rect(screen, (180, 140, 60), door, 3)
+            pygame.draw.rect(screen, (180, 140, 60), door, to_layer_len(3, rs))
 
-    for pig in state.pigs:
-        if pig.health <= 0:
-            continue
-        # Pig appearance: upright pink pig with head, snout, ears, arms, legs and a sword
+    for pig in visible["pigs"]:
+        # Pig appearance: pre-rendered per pose (see sprites.py), one blit per pig
         pp = pig.pos - cam
-        # Leg swing driven by distance walked; freeze while attacking
-        moving = pig.windup_timer <= 0 and pig.swing_timer <= 0
-        pig_leg_swing = int(12 * math.sin(pig.walk_cycle)) if moving else 0
-
-        # Body dimensions
-        body_w = int(pig.radius * 1.8)
-        body_h = int(pig.radius * 1.2)
-        body_rect = pygame.Rect(int(pp.x - body_w / 2), int(pp.y - body_h / 2), body_w, body_h)
-
-        if getattr(pig, "is_ally", False):
-            PINK = (140, 220, 255)
-            DARK_PINK = (60, 140, 200)
-            SNOUT = (180, 245, 255)
-        else:
-            PINK = (255, 160, 180)
-            DARK_PINK = (200, 120, 140)
-            SNOUT = (255, 140, 160)
-
-        # Draw body (oval)
-        pygame.draw.ellipse(screen, PINK, body_rect)
-        pygame.draw.ellipse(screen, DARK_PINK, body_rect, 2)
-
-        # Head above body
-        head_offset = pygame.Vector2(0, -body_h * 0.6)
-        head_center = pp + head_offset
-        head_radius = int(body_h * 0.5)
-        pygame.draw.circle(screen, PINK, (int(head_center.x), int(head_center.y)), head_radius)
-        pygame.draw.circle(screen, DARK_PINK, (int(head_center.x), int(head_center.y)), head_radius, 2)
-
-        # Snout (in front of head based on facing)
-        facing = pig.facing if pig.facing.length_squared() > 0 else pygame.Vector2(1, 0)
-        snout_dir = facing.normalize()
-        snout_center = head_center + snout_dir * (head_radius * 0.5)
-        pygame.draw.circle(screen, SNOUT, (int(snout_center.x), int(snout_center.y)), int(head_radius * 0.4))
-        pygame.draw.circle(screen, (100, 40, 40), (int(snout_center.x), int(snout_center.y)), int(head_radius * 0.12))
-
-        # Ears (two small triangles)
-        ear_offset = pygame.Vector2(head_radius * 0.6, -head_radius * 0.6)
-        left_ear = [
-            (int(head_center.x - ear_offset.x), int(head_center.y + ear_offset.y)),
-            (int(head_center.x - ear_offset.x - 6), int(head_center.y + ear_offset.y - 12)),
-            (int(head_center.x - ear_offset.x + 6), int(head_center.y + ear_offset.y - 12)),
-        ]
-        right_ear = [
-            (int(head_center.x + ear_offset.x), int(head_center.y + ear_offset.y)),
-            (int(head_center.x + ear_offset.x - 6), int(head_center.y + ear_offset.y - 12)),
-            (int(head_center.x + ear_offset.x + 6), int(head_center.y + ear_offset.y - 12)),
-        ]
-        pygame.draw.polygon(screen, PINK, left_ear)
-        pygame.draw.polygon(screen, PINK, right_ear)
-        pygame.draw.polygon(screen, DARK_PINK, left_ear, 1)
-        pygame.draw.polygon(screen, DARK_PINK, right_ear, 1)
-
-        # Eyes
-        eye_offset = pygame.Vector2(head_radius * 0.3, -head_radius * 0.1)
-        left_eye = head_center + pygame.Vector2(-eye_offset.x, eye_offset.y)
-        right_eye = head_center + pygame.Vector2(eye_offset.x, eye_offset.y)
-        pygame.draw.circle(screen, (30, 30, 30), (int(left_eye.x), int(left_eye.y)), 3)
-        pygame.draw.circle(screen, (30, 30, 30), (int(right_eye.x), int(right_eye.y)), 3)
-
-        # Tail (curly)
-        tail_base = pp + pygame.Vector2(body_w / 2, -body_h * 0.2)
-        pygame.draw.arc(screen, DARK_PINK, (int(tail_base.x), int(tail_base.y), 14, 14), 3.14, 5.0, 3)
+        draw_pig_sprite(screen, pig, to_layer(pp, rs), scale=rs)
 
         # Lock-on indicator
         if state.lock_target is pig:
-            icon_center = head_center + pygame.Vector2(0, -head_radius * 1.2)
-            pygame.draw.circle(screen, (255, 240, 150), (int(icon_center.x), int(icon_center.y)), 8, 2)
+            body_h = int(pig.radius * 1.2)
+            head_center = pp + pygame.Vector2(0, -body_h * 0.6)
+            head_radius = int(body_h * 0.5)
+            icon_center = to_layer(head_center + pygame.Vector2(0, -head_radius * 1.2), rs)
+            pygame.draw.circle(screen, (255, 240, 150), (int(icon_center.x), int(icon_center.y)), to_layer_len(8, rs), to_layer_len(2, rs))
             pygame.draw.polygon(
                 screen,
                 (255, 240, 150),
                 [
-                    (int(icon_center.x), int(icon_center.y) + 10),
-                    (int(icon_center.x) - 6, int(icon_center.y) + 2),
-                    (int(icon_center.x) + 6, int(icon_center.y) + 2),
+                    (int(icon_center.x), int(icon_center.y) + to_layer_len(10, rs)),
+                    (int(icon_center.x) - to_layer_len(6, rs), int(icon_center.y) + to_layer_len(2, rs)),
+                    (int(icon_center.x) + to_layer_len(6, rs), int(icon_center.y) + to_layer_len(2, rs)),
                 ],
                 0,
             )
 
-        # Legs
-        leg_y = int(pp.y + body_h * 0.35)
-        left_leg_start = (int(pp.x - body_w * 0.28), leg_y - 6)
-        left_leg_end = (int(pp.x - body_w * 0.28 + pig_leg_swing), int(leg_y + pig.radius * 0.5))
-        right_leg_start = (int(pp.x + body_w * 0.28), leg_y - 6)
-        right_leg_end = (int(pp.x + body_w * 0.28 - pig_leg_swing), int(leg_y + pig.radius * 0.5))
-        pygame.draw.line(screen, DARK_PINK, left_leg_start, left_leg_end, 8)
-        pygame.draw.line(screen, DARK_PINK, right_leg_start, right_leg_end, 8)
-
-        # Arms and sword
-        pig_draw_dir = (
-            get_swing_dir(pig.swing_base_dir, pig.swing_timer, pig.swing_time, pig.facing)
-            if pig.swing_timer > 0
-            else pig.facing
-        )
-        pig_swing_reach = swing_reach_multiplier(pig.swing_timer, pig.swing_time) if pig.swing_timer > 0 else 1.0
-        # Arm origin slightly above body center
-        arm_origin = pp + pygame.Vector2(0, -body_h * 0.1)
-        arm_len = int(settings.SWORD_LENGTH * 0.5 * pig_swing_reach)
-        grip_end = arm_origin + pig_draw_dir.normalize() * arm_len
-        # Draw arm
-        pygame.draw.line(screen, DARK_PINK, (int(arm_origin.x), int(arm_origin.y)), (int(grip_end.x), int(grip_end.y)), 6)
-
-        # Draw sword swing polygon or idle sword
-        es_pts = sword_polygon_points(
-            arm_origin,
-            pig_draw_dir,
-            settings.PIG_SWING_DISTANCE * pig_swing_reach,
-            settings.SWORD_LENGTH * pig_swing_reach,
-            settings.SWORD_WIDTH,
-        )
-        if pig.swing_timer > 0:
-            pygame.draw.polygon(screen, (220, 200, 180), es_pts)
-        else:
-            # idle sword: simple line + pommel
-            tip = grip_end + pig_draw_dir.normalize() * settings.SWORD_LENGTH
-            pygame.draw.line(screen, (120, 80, 40), (int(grip_end.x), int(grip_end.y)), (int(tip.x), int(tip.y)), 6)
-            perp = pygame.Vector2(-pig_draw_dir.y, pig_draw_dir.x).normalize()
-            cross_left = grip_end + perp * int(settings.SWORD_LENGTH * 0.18)
-            cross_right = grip_end - perp * int(settings.SWORD_LENGTH * 0.18)
-            pygame.draw.line(screen, (220, 180, 70), (int(cross_left.x), int(cross_left.y)), (int(cross_right.x), int(cross_right.y)), 4)
-            pygame.draw.circle(screen, (80, 50, 30), (int(arm_origin.x), int(arm_origin.y)), 5)
-
         if not pig.is_boss and not getattr(pig, "is_ally", False):
-            draw_health_bar_above(screen, pp, pig.health, pig.max_health, radius=pig.radius)
+            draw_health_bar_above(screen, to_layer(pp, rs), pig.health, pig.max_health, radius=pig.radius, scale=rs)
 
     # Draw arrows
     arrow_color = (240, 230, 200)
-    for arrow in state.arrows:
-        pos = arrow["pos"]
-        dir_vec = arrow["dir"]
+    for arrow in visible["arrows"]:
+        pos = to_layer(arrow["pos"] - cam, rs)
+        dir_vec = arrow["dir"] * rs
         tail = pos - dir_vec * 10
         head = pos + dir_vec * 16
-        pygame.draw.line(screen, arrow_color, tail, head, 6)
+        pygame.draw.line(screen, arrow_color, tail, head, to_layer_len(6, rs))
         perp = pygame.Vector2(-dir_vec.y, dir_vec.x) * 4
         pygame.draw.polygon(
             screen,
@@ -2979,20 +2558,24 @@ def draw_game(state: GameState):
 
     # Player sword swing visuals are handled by the arm/sword drawing above; no extra hitbox polygon needed.
 
-    if state.blood_splats:
+    if visible["blood"]:
         blood_color = (160, 0, 0)
-        for s in state.blood_splats:
+        for s in visible["blood"]:
             for pos, rad in s["points"]:
-                pygame.draw.circle(screen, blood_color, (int(pos.x), int(pos.y)), int(rad), 1)
+                bp = to_layer(pos - cam, rs)
+                pygame.draw.circle(screen, blood_color, (int(bp.x), int(bp.y)), to_layer_len(int(rad), rs), 1)
 
     boss = next((p for p in state.pigs if getattr(p, "is_boss", False) and p.health > 0), None)
     if boss is not None and state.font is not None:
         # Draw boss bar on the real screen later (not zoomed).
         pass
 
+    laps.lap("entities")
+
     # Scale world -> screen
-    scaled = pygame.transform.smoothscale(screen, real_screen.get_size())
-    real_screen.blit(scaled, (0, 0))
+    if screen is not real_screen:
+        present_world_layer(screen, real_screen, blend=ground_on_real_screen)
+    laps.lap("smoothscale")
 
     # UI (not zoomed)
     screen = real_screen
@@ -3038,6 +2621,7 @@ def draw_game(state: GameState):
 
     if state.dialogue_lines:
         draw_dialogue(state)
+    laps.lap("hud")
 
     if state.map_open and state.has_map:
         # map handled above
@@ -3045,22 +2629,138 @@ def draw_game(state: GameState):
     return
 
 
-def run():
+def start_game(state: GameState):
+    """Set up the first round unless the story intro is playing (honours state.debug_start)."""
+    if state.intro_active:
+        return
+    reset_round(state)
+    start_mode = getattr(state, "debug_start", None)
+    if start_mode == "post_bow":
+        apply_post_bow_start(state, coin_count=10)
+    elif start_mode == "post_boss":
+        apply_post_boss_start(state, coin_count=75)
+
+
+def snapshot_positions(state: GameState) -> dict:
+    """Remember where everything that moves each step is now, before the next step runs.
+
+    The player, pigs and arrows keep their own prev_pos, so an object created during a step has
+    none and is drawn where it is. The camera and level go in the returned dict.
+    """
+    player = state.player
+    player.prev_pos = (player.pos.x, player.pos.y)
+    for pig in state.pigs:
+        pig.prev_pos = (pig.pos.x, pig.pos.y)
+    for arrow in state.arrows:
+        arrow["prev_pos"] = (arrow["pos"].x, arrow["pos"].y)
+    return {"level": state.level_index, "camera": (state.camera_offset.x, state.camera_offset.y)}
+
+
+def step_simulation(state: GameState, frame_dt: float) -> int:
+    """Advance the game by frame_dt of real time in fixed SIM_HZ steps; returns the steps run."""
+    sim_hz = float(getattr(settings, "SIM_HZ", 0))
+    if sim_hz <= 0:
+        state.dt = frame_dt
+        state.sim_prev_positions = {}
+        state.sim_alpha = 1.0
+        update_game(state)
+        return 1
+
+    step = 1.0 / sim_hz
+    max_steps = max(1, int(getattr(settings, "SIM_MAX_STEPS", 8)))
+    state.sim_accumulator += max(0.0, frame_dt)
+    steps = 0
+    while state.sim_accumulator >= step:
+        if steps >= max_steps:
+            # Too far behind (hitch or slow machine): drop the backlog instead of spiralling.
+            state.sim_accumulator = 0.0
+            break
+        state.sim_prev_positions = snapshot_positions(state)
+        state.dt = step
+        update_game(state)
+        state.sim_accumulator -= step
+        steps += 1
+        if state.game_over or not state.running:
+            state.sim_accumulator = 0.0
+            break
+    state.sim_alpha = state.sim_accumulator / step
+    return steps
+
+
+def draw_game_interpolated(state: GameState):
+    """draw_game with moving things placed between the previous and current step by sim_alpha."""
+    prev = state.sim_prev_positions
+    alpha = state.sim_alpha
+    if (
+        not getattr(settings, "RENDER_INTERPOLATION", True)
+        or not prev
+        or alpha >= 1.0
+        or prev.get("level") != state.level_index
+    ):
+        draw_game(state)
+        return
+
+    # Anything that jumped further than this in one step (doors, fast travel) is drawn where it is.
+    max_jump_sq = 256.0 * 256.0
+    moved: list[tuple[pygame.Vector2, float, float]] = []
+
+    def blend(vec: pygame.Vector2, old: tuple[float, float] | None):
+        if old is None:
+            return
+        dx = vec.x - old[0]
+        dy = vec.y - old[1]
+        if dx * dx + dy * dy > max_jump_sq:
+            return
+        moved.append((vec, vec.x, vec.y))
+        vec.x = old[0] + dx * alpha
+        vec.y = old[1] + dy * alpha
+
+    blend(state.camera_offset, prev.get("camera"))
+    blend(state.player.pos, state.player.prev_pos)
+    for pig in state.pigs:
+        blend(pig.pos, pig.prev_pos)
+    for arrow in state.arrows:
+        blend(arrow["pos"], arrow.get("prev_pos"))
+    try:
+        draw_game(state)
+    finally:
+        for vec, x, y in moved:
+            vec.x = x
+            vec.y = y
+
+
+def handle_profiler_keys(state: GameState, events: list[pygame.event.Event]):
+    """F3 toggles the frame profiler overlay; F4 writes the frames it has recorded to CSV."""
+    for event in events:
+        if event.type != pygame.KEYDOWN:
+            continue
+        if event.key == profiler.TOGGLE_KEY:
+            profiler.toggle()
+        elif event.key == profiler.DUMP_KEY and profiler.PROFILER.frames:
+            path = profiler.dump_csv()
+            state.toast_text = f"Profile saved to {path}"
+            state.toast_timer = 2.2
+
+
+def run(recorder=None):
+    """Main loop. recorder (see replay.ReplayRecorder) captures every gameplay frame when given."""
     pygame.init()
     screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
     state = create_game_state(screen)
-    if not state.intro_active:
-        reset_round(state)
-        start_mode = getattr(state, "debug_start", None)
-        if start_mode == "post_bow":
-            apply_post_bow_start(state, coin_count=10)
-        elif start_mode == "post_boss":
-            apply_post_boss_start(state, coin_count=75)
+    # The world is drawn into a smaller layer (see draw_game); the camera and HUD are unaffected.
+    state.render_scale = float(getattr(settings, "RENDER_SCALE", 1.0))
+    if recorder is not None:
+        recorder.attach(state)
+    start_game(state)
 
     while state.running:
-        events = pygame.event.get()
+        events = state.input_source.poll_events()
         if state.intro_active:
+            if recorder is not None:
+                recorder.begin_frame(state, events, state.dt, intro=True)
             update_intro(state, events)
+            if recorder is not None:
+                recorder.end_frame(state)
             if state.intro_active:
                 draw_intro(state)
                 pygame.display.flip()
@@ -3074,10 +2774,23 @@ def run():
             handle_death_screen(state, events)
             continue
 
-        handle_events(state, events)
-        update_game(state)
-        draw_game(state)
-        pygame.display.flip()
+        if recorder is not None:
+            recorder.begin_frame(state, events, state.dt)
+        profiler.begin_frame()
+        handle_profiler_keys(state, events)
+        with profiler.scope("events"):
+            handle_events(state, events)
+        # state.dt holds the real frame time here; the simulation consumes it in fixed steps.
+        with profiler.scope("update"):
+            step_simulation(state, state.dt)
+        if recorder is not None:
+            recorder.end_frame(state)
+        with profiler.scope("draw"):
+            draw_game_interpolated(state)
+        profiler.draw_overlay(state.screen)
+        with profiler.scope("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
         state.dt = state.clock.tick(settings.TARGET_FPS) / 1000
 
     pygame.quit()
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import random
 from dataclasses import dataclass, field
-from typing import List
+from typing import Callable, List
 
 import pygame
 
 import settings
+from controls import DeviceInput, InputSnapshot, InputSource
 from player import PlayerState, create_player
 from pig import PigState
+from spatial import SpatialHash
 
 
 @dataclass
@@ -16,6 +19,8 @@ class GameState:
     clock: pygame.time.Clock
     player: PlayerState
     pigs: List[PigState] = field(default_factory=list)
+    # Live pigs bucketed by position; re-synced with pigs in update_game
+    pig_grid: SpatialHash = field(default_factory=lambda: SpatialHash(settings.PIG_GRID_CELL_SIZE))
     running: bool = True
     dt: float = 0.0
     game_over: bool = False
@@ -79,6 +84,23 @@ class GameState:
     villages_revealed: bool = False
     quests_open: bool = False
     camera_zoom: float = 1.0
+    # World layer pixels per world pixel when drawing (settings.RENDER_SCALE; gameplay ignores it)
+    render_scale: float = 1.0
+    # World-space rect the camera sees (set by update_game) and what the last draw culled
+    view_rect_world: pygame.Rect | None = None
+    cull_stats: dict = field(default_factory=dict)
+    # Fixed-step simulation: unsimulated time, camera and level before the last step (moving objects
+    # keep their own prev_pos), and how far the render sits between that step and the current one.
+    sim_accumulator: float = 0.0
+    sim_prev_positions: dict = field(default_factory=dict)
+    sim_alpha: float = 1.0
+    # Where each tick's input comes from (keyboard/mouse unless replaced) and the latest snapshot
+    input_source: InputSource = field(default_factory=DeviceInput)
+    input_snapshot: InputSnapshot = field(default_factory=InputSnapshot)
+    # Gameplay randomness and clock; replays seed the rng and swap the clock for recorded ticks
+    rng_seed: int = 0
+    rng: random.Random = field(default_factory=random.Random)
+    get_ticks: Callable[[], int] = field(default_factory=lambda: pygame.time.get_ticks)
     # Map overlay camera
     map_zoom: float = 1.0
     map_center_world: pygame.Vector2 = field(
@@ -101,14 +123,16 @@ class GameState:
     fast_travel_swapped: bool = False
 
 
-def create_game_state(screen: pygame.Surface) -> GameState:
-    """Initialize the whole game state with defaults."""
+def create_game_state(screen: pygame.Surface, seed: int | None = None) -> GameState:
+    """Initialize the whole game state with defaults (seed fixes the gameplay rng, random if None)."""
     clock = pygame.time.Clock()
     font = pygame.font.SysFont(None, settings.FONT_SIZE)
     player = create_player(
         pygame.Vector2(settings.SCREEN_WIDTH / 2, settings.SCREEN_HEIGHT / 2)
     )
     state = GameState(screen=screen, clock=clock, player=player, font=font)
+    state.rng_seed = seed if seed is not None else random.getrandbits(32)
+    state.rng = random.Random(state.rng_seed)
     # Intro text sequence shown before waking in the first room
     state.intro_lines = [
         "In the beginning, there was peace.",
@@ -0,0 +1,137 @@
+"""Run the game simulation with no window or audio, for soak tests and throughput checks.
+
+    python headless.py --minutes 30 --pigs 200 --input wander
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import pygame
+
+import settings
+from controls import ACTION_SWING, InputSource, ScriptedInput
+from game import handle_events, reset_round, start_game, step_simulation
+from game_state import GameState, create_game_state
+from pig import make_pig
+
+
+def init_headless():
+    """Start pygame on SDL's dummy video and audio drivers (must run before pygame.init elsewhere)."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+
+
+def create_headless_state(input_source: InputSource | None = None) -> GameState:
+    """A started game whose screen is an offscreen surface and whose input comes from input_source."""
+    init_headless()
+    # The simulation reads the view size from the screen, so keep the real resolution.
+    screen = pygame.Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+    state = create_game_state(screen)
+    state.input_source = input_source if input_source is not None else ScriptedInput()
+    start_game(state)
+    return state
+
+
+@dataclass
+class HeadlessStats:
+    frames: int = 0
+    steps: int = 0
+    sim_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    deaths: int = 0
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Simulated seconds per wall-clock second."""
+        return self.sim_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+def run_headless(
+    state: GameState,
+    sim_seconds: float,
+    frame_dt: float | None = None,
+    on_frame: Callable | None = None,
+) -> HeadlessStats:
+    """Simulate sim_seconds of play as fast as possible, without drawing.
+
+    Frames advance by frame_dt (default 1 / TARGET_FPS) and go through the same fixed-step
+    simulation as run(). on_frame(state, frame_index) runs before each frame to script input.
+    A death restarts the round, like pressing Continue on the death screen.
+    """
+    if frame_dt is None:
+        frame_dt = 1.0 / settings.TARGET_FPS
+    stats = HeadlessStats()
+    source = state.input_source
+    started = time.perf_counter()
+    while stats.sim_seconds < sim_seconds and state.running:
+        if on_frame is not None:
+            on_frame(state, stats.frames)
+        handle_events(state, source.poll_events())
+        stats.steps += step_simulation(state, frame_dt)
+        stats.frames += 1
+        stats.sim_seconds += frame_dt
+        if state.game_over:
+            stats.deaths += 1
+            reset_round(state)
+    stats.wall_seconds = time.perf_counter() - started
+    return stats
+
+
+def random_walk(seed: int = 0, hold_seconds: tuple[float, float] = (0.5, 2.5)) -> Callable:
+    """on_frame script that wanders with WASD, swings now and then, and blocks occasionally."""
+    rng = random.Random(seed)
+    moves = [(0, 0), (0, -1), (0, 1), (-1, 0), (1, 0), (1, -1), (-1, 1)]
+    next_change = [0.0]
+
+    def on_frame(state: GameState, frame: int):
+        source = state.input_source
+        now = frame / settings.TARGET_FPS
+        if now >= next_change[0]:
+            source.move = pygame.Vector2(moves[rng.randrange(len(moves))])
+            source.block = rng.random() < 0.15
+            next_change[0] = now + rng.uniform(*hold_seconds)
+        if rng.random() < 0.03:
+            source.queue_action(ACTION_SWING)
+
+    return on_frame
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python headless.py", description="Headless simulation soak test.")
+    parser.add_argument("--minutes", type=float, default=1.0, help="simulated minutes to run")
+    parser.add_argument("--pigs", type=int, default=0, help="extra pigs placed around the player")
+    parser.add_argument("--input", choices=("idle", "wander"), default="wander")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    state = create_headless_state()
+    if args.pigs:
+        rng = random.Random(args.seed)
+        for _ in range(args.pigs):
+            offset = pygame.Vector2(rng.uniform(-1500, 1500), rng.uniform(-1500, 1500))
+            state.pigs.append(make_pig(state.player.pos + offset))
+    on_frame = random_walk(args.seed) if args.input == "wander" else None
+
+    print(f"Simulating {args.minutes:g} min at {settings.SIM_HZ} Hz ...")
+    stats = run_headless(state, args.minutes * 60.0, on_frame=on_frame)
+    print(
+        f"{stats.steps} steps in {stats.wall_seconds:.2f}s: {stats.steps_per_second:.0f} steps/s, "
+        f"{stats.realtime_factor:.1f}x real time, {stats.deaths} deaths, {len(state.pigs)} pigs"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,11 +32,18 @@ def draw_player_stamina_bar_topleft(
     return bar_width
 
 
-def draw_health_bar_above(screen: pygame.Surface, center_pos: pygame.Vector2, current: int, maximum: int, radius: int = settings.PIG_RADIUS):
-    bar_width = 80
-    bar_height = 10
+def draw_health_bar_above(
+    screen: pygame.Surface,
+    center_pos: pygame.Vector2,
+    current: int,
+    maximum: int,
+    radius: int = settings.PIG_RADIUS,
+    scale: float = 1.0,
+):
+    bar_width = 80 if scale == 1.0 else max(1, round(80 * scale))
+    bar_height = 10 if scale == 1.0 else max(1, round(10 * scale))
     x = center_pos.x - bar_width // 2
-    y = center_pos.y - (radius + 28)
+    y = center_pos.y - (radius + 28) * scale
     pygame.draw.rect(screen, (100, 100, 100), (x, y, bar_width, bar_height))
     ratio = max(0, current) / maximum if maximum > 0 else 0
     pygame.draw.rect(screen, (255, 0, 0), (x, y, int(bar_width * ratio), bar_height))
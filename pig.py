@@ -31,6 +31,8 @@ class PigState:
     windup_timer: float = 0.0
     walk_cycle: float = 0.0
     out_of_range_timer: float = 0.0
+    # Position before the last fixed simulation step (render interpolation); None until stepped.
+    prev_pos: tuple[float, float] | None = None
 
     def __post_init__(self):
         if self.health is None:
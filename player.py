@@ -47,6 +47,10 @@ class PlayerState:
     last_attack_dir: pygame.Vector2 = field(default_factory=lambda: pygame.Vector2(1, 0))
     last_swing_reach: float = 1.0
     shield_anchor_offset: pygame.Vector2 = field(default_factory=lambda: pygame.Vector2(0, 0))
+    # World-space velocity from the last update (pixels per second).
+    velocity: pygame.Vector2 = field(default_factory=lambda: pygame.Vector2(0, 0))
+    # Position before the last fixed simulation step (render interpolation); None until stepped.
+    prev_pos: tuple[float, float] | None = None
 
 
 def create_player(start_pos: pygame.Vector2) -> PlayerState:
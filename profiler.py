@@ -0,0 +1,251 @@
+"""Per-frame timing scopes with an in-game overlay (F3) and CSV dumps (F4).
+
+    with profiler.scope("draw"):
+        draw_game(state)
+
+    laps = profiler.laps("update/")
+    ...move the player...
+    laps.lap("player")          # time since laps() (or the previous lap) goes to "update/player"
+
+While the profiler is off, scope() and laps() hand back a shared object whose methods do
+nothing, so instrumented code only pays for a function call.
+"""
+
+from __future__ import annotations
+
+import csv
+import time
+from collections import deque
+
+import pygame
+
+import settings
+
+TOGGLE_KEY = pygame.K_F3
+DUMP_KEY = pygame.K_F4
+
+# Overlay stats are recomputed this often (frames) so the numbers stay readable.
+_OVERLAY_REFRESH_FRAMES = 15
+_GRAPH_HEIGHT = 64
+
+_perf = time.perf_counter
+
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _NullScope:
+    """Stands in for scopes and laps while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def lap(self, name: str):
+        pass
+
+
+_NULL = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: FrameProfiler, name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = _perf()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, _perf() - self.start)
+        return False
+
+
+class _Laps:
+    """Splits straight-line code into consecutive named phases without re-indenting it."""
+
+    __slots__ = ("profiler", "prefix", "start")
+
+    def __init__(self, profiler: FrameProfiler, prefix: str):
+        self.profiler = profiler
+        self.prefix = prefix
+        self.start = _perf()
+
+    def lap(self, name: str):
+        now = _perf()
+        self.profiler.add(self.prefix + name, now - self.start)
+        self.start = now
+
+
+class FrameProfiler:
+    """Accumulates scope times per frame and keeps the last `history` frames of each."""
+
+    def __init__(self, history: int = 300):
+        self.enabled = False
+        self.overlay = False
+        self.history = max(1, int(history))
+        self.frames = 0
+        self.frame_ms: deque[float] = deque(maxlen=self.history)
+        # Scope name -> ms per frame, aligned with frame_ms (0 when the scope didn't run).
+        self.samples: dict[str, deque[float]] = {}
+        self._current: dict[str, float] = {}
+        self._frame_start: float | None = None
+        self._overlay_rows: list[tuple[str, float, float]] = []
+        self._overlay_font: pygame.font.Font | None = None
+
+    def add(self, name: str, seconds: float):
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def begin_frame(self):
+        if not self.enabled:
+            self._frame_start = None
+            return
+        self._current = {}
+        self._frame_start = _perf()
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        total = (_perf() - self._frame_start) * 1000.0
+        self._frame_start = None
+        current = self._current
+        for name in current:
+            if name not in self.samples:
+                # Pad so the new column lines up with frames recorded before it first ran.
+                self.samples[name] = deque([0.0] * len(self.frame_ms), maxlen=self.history)
+        self.frame_ms.append(total)
+        for name, samples in self.samples.items():
+            samples.append(current.get(name, 0.0) * 1000.0)
+        self.frames += 1
+        if self.overlay and (self.frames % _OVERLAY_REFRESH_FRAMES == 1 or not self._overlay_rows):
+            self._overlay_rows = self.stats()
+
+    def reset(self):
+        """Drop everything recorded; picks up a changed `history` too."""
+        self.frames = 0
+        self.frame_ms = deque(maxlen=self.history)
+        self.samples = {}
+        self._overlay_rows = []
+
+    def stats(self) -> list[tuple[str, float, float]]:
+        """(name, average ms, p99 ms) for the frame total and every scope, names sorted."""
+        rows = [("frame", _average(self.frame_ms), percentile(self.frame_ms, 0.99))]
+        for name in sorted(self.samples):
+            samples = self.samples[name]
+            rows.append((name, _average(samples), percentile(samples, 0.99)))
+        return rows
+
+    def dump_csv(self, path: str | None = None) -> str:
+        """Write the recorded frames (one row each, one column per scope) and return the path."""
+        if path is None:
+            path = time.strftime("profile-%Y%m%d-%H%M%S.csv")
+        names = sorted(self.samples)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms"] + names)
+            first = self.frames - len(self.frame_ms)
+            columns = [self.samples[name] for name in names]
+            for i, total in enumerate(self.frame_ms):
+                writer.writerow([first + i, f"{total:.3f}"] + [f"{column[i]:.3f}" for column in columns])
+        return path
+
+    def draw_overlay(self, surface: pygame.Surface):
+        """Rolling averages, p99s and a frame-time graph in the top-right corner."""
+        if not self.overlay:
+            return
+        if self._overlay_font is None:
+            self._overlay_font = pygame.font.SysFont("monospace", 14)
+        font = self._overlay_font
+        line_h = font.get_linesize()
+        rows = [("scope", "avg", "p99")]
+        for name, avg, p99 in self._overlay_rows:
+            indent = "  " * name.count("/")
+            rows.append((indent + name.rsplit("/", 1)[-1], f"{avg:.2f}", f"{p99:.2f}"))
+        # Columns are placed by pixel so proportional fallback fonts still line up.
+        name_w = max(font.size(row[0])[0] for row in rows) + 12
+        num_w = font.size("000.00")[0] + 8
+        graph_w = self.history
+        width = max(graph_w, name_w + num_w * 2) + 16
+        height = line_h * len(rows) + _GRAPH_HEIGHT + 24
+        panel = pygame.Rect(surface.get_width() - width - 10, 10, width, height)
+
+        backdrop = pygame.Surface(panel.size, pygame.SRCALPHA)
+        backdrop.fill((0, 0, 0, 170))
+        surface.blit(backdrop, panel.topleft)
+        y = panel.top + 8
+        for label, avg, p99 in rows:
+            surface.blit(font.render(label, True, (230, 230, 230)), (panel.left + 8, y))
+            for col, text in enumerate((avg, p99), start=1):
+                text_surf = font.render(text, True, (230, 230, 230))
+                surface.blit(text_surf, (panel.left + 8 + name_w + num_w * col - text_surf.get_width(), y))
+            y += line_h
+
+        # One bar per frame; the scale tops out at two frame budgets.
+        graph = pygame.Rect(panel.left + 8, y + 8, graph_w, _GRAPH_HEIGHT)
+        budget_ms = 1000.0 / settings.TARGET_FPS
+        scale = graph.height / (budget_ms * 2)
+        x = graph.right - len(self.frame_ms)
+        for ms in self.frame_ms:
+            bar_h = min(graph.height, max(1, int(ms * scale)))
+            color = (90, 210, 90) if ms <= budget_ms else (230, 80, 60)
+            pygame.draw.line(surface, color, (x, graph.bottom), (x, graph.bottom - bar_h))
+            x += 1
+        budget_y = graph.bottom - int(budget_ms * scale)
+        pygame.draw.line(surface, (240, 240, 120), (graph.left, budget_y), (graph.right, budget_y))
+
+
+def _average(values) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+PROFILER = FrameProfiler(getattr(settings, "PROFILER_HISTORY", 300))
+PROFILER.enabled = PROFILER.overlay = bool(getattr(settings, "PROFILER_ENABLED", False))
+
+
+def scope(name: str):
+    """Context manager timing its block into `name` for this frame."""
+    if not PROFILER.enabled:
+        return _NULL
+    return _Scope(PROFILER, name)
+
+
+def laps(prefix: str = ""):
+    """Lap timer: each lap(name) records the time since the previous lap as prefix + name."""
+    if not PROFILER.enabled:
+        return _NULL
+    return _Laps(PROFILER, prefix)
+
+
+def begin_frame():
+    PROFILER.begin_frame()
+
+
+def end_frame():
+    PROFILER.end_frame()
+
+
+def toggle():
+    """Turn profiling and the overlay on or off together; turning on starts a fresh window."""
+    PROFILER.enabled = PROFILER.overlay = not PROFILER.enabled
+    if PROFILER.enabled:
+        PROFILER.reset()
+
+
+def draw_overlay(surface: pygame.Surface):
+    PROFILER.draw_overlay(surface)
+
+
+def dump_csv(path: str | None = None) -> str:
+    return PROFILER.dump_csv(path)
@@ -0,0 +1,415 @@
+"""Record a play session's input stream and replay it deterministically for perf regression runs.
+
+    python replay.py record session.krp           play normally; every frame is recorded
+    python replay.py play session.krp --draw      re-run it (headless) and print frame times
+    python replay.py play session.krp --csv a.csv
+    python replay.py play session.krp --draw --profile p.csv   per-subsystem times (see profiler.py)
+    python replay.py compare a.csv b.csv          frame-time histograms side by side
+
+A recording holds the rng seed, screen size, zoom and whether the story intro was playing, then per
+frame: the real frame time fed to the fixed-step simulation, the frame's clock value, whether it was
+an intro frame, the UI events (mouse events with the cursor position), one InputSnapshot per
+simulation step and the player's position afterwards (used to detect desyncs).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import struct
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+
+import pygame
+
+import profiler
+import settings
+from controls import InputSnapshot, InputSource, RecordedInput
+from game import (
+    draw_game_interpolated,
+    draw_intro,
+    handle_events,
+    reset_round,
+    run,
+    start_game,
+    step_simulation,
+    update_intro,
+)
+from game_state import GameState, create_game_state
+from headless import init_headless
+from profiler import percentile
+
+MAGIC = b"KGREPLAY"
+VERSION = 4
+# magic, version, seed, start ticks, sim hz, max steps, screen w, screen h, camera zoom, intro active
+_HEADER = struct.Struct("<8sHIIHHHHf?")
+# frame dt, clock ticks, event count, step count, intro frame, player x, player y
+_FRAME = struct.Struct("<dIHH?ff")
+# event code, key or button, x, y, wheel y
+_EVENT = struct.Struct("<Bihhh")
+# move x, move y, flags, aim x, aim y
+_SNAPSHOT = struct.Struct("<bbBff")
+
+_EVENT_CODES = {
+    pygame.QUIT: 1,
+    pygame.KEYDOWN: 2,
+    pygame.KEYUP: 3,
+    pygame.MOUSEBUTTONDOWN: 4,
+    pygame.MOUSEBUTTONUP: 5,
+    pygame.MOUSEWHEEL: 6,
+    pygame.MOUSEMOTION: 7,
+}
+_EVENT_TYPES = {code: kind for kind, code in _EVENT_CODES.items()}
+
+_FLAG_SPRINT = 1
+_FLAG_BLOCK = 2
+_FLAG_SWING = 4
+_FLAG_FIRE = 8
+_FLAG_DODGE = 16
+_FLAG_AIM = 32
+_FLAG_RAISE_SHIELD = 64
+
+# Frame-time histogram bucket upper edges (ms)
+HISTOGRAM_EDGES_MS = (4.0, 8.0, 12.0, 16.7, 20.0, 25.0, 33.3, 50.0, 100.0, float("inf"))
+
+
+def _clamp_i16(v: float) -> int:
+    return max(-32768, min(32767, int(v)))
+
+
+def encode_event(event: pygame.event.Event) -> bytes | None:
+    code = _EVENT_CODES.get(event.type)
+    if code is None:
+        return None
+    value = getattr(event, "key", getattr(event, "button", 0))
+    x, y = getattr(event, "pos", (0, 0))
+    return _EVENT.pack(code, int(value), _clamp_i16(x), _clamp_i16(y), _clamp_i16(getattr(event, "y", 0) if code == 6 else 0))
+
+
+def decode_event(data: bytes, offset: int) -> pygame.event.Event:
+    code, value, x, y, wheel_y = _EVENT.unpack_from(data, offset)
+    kind = _EVENT_TYPES[code]
+    if kind in (pygame.KEYDOWN, pygame.KEYUP):
+        return pygame.event.Event(kind, key=value, mod=0)
+    if kind in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        return pygame.event.Event(kind, button=value, pos=(x, y))
+    if kind == pygame.MOUSEWHEEL:
+        return pygame.event.Event(kind, x=0, y=wheel_y, pos=(x, y))
+    if kind == pygame.MOUSEMOTION:
+        return pygame.event.Event(kind, pos=(x, y), rel=(0, 0), buttons=(0, 0, 0))
+    return pygame.event.Event(kind)
+
+
+def encode_snapshot(snap: InputSnapshot) -> bytes:
+    flags = (
+        (_FLAG_SPRINT if snap.sprint else 0)
+        | (_FLAG_BLOCK if snap.block else 0)
+        | (_FLAG_SWING if snap.swing else 0)
+        | (_FLAG_FIRE if snap.fire else 0)
+        | (_FLAG_DODGE if snap.dodge else 0)
+        | (_FLAG_AIM if snap.aim is not None else 0)
+        | (_FLAG_RAISE_SHIELD if snap.raise_shield else 0)
+    )
+    aim = snap.aim if snap.aim is not None else pygame.Vector2(0, 0)
+    return _SNAPSHOT.pack(int(snap.move.x), int(snap.move.y), flags, aim.x, aim.y)
+
+
+def decode_snapshot(data: bytes, offset: int) -> InputSnapshot:
+    mx, my, flags, ax, ay = _SNAPSHOT.unpack_from(data, offset)
+    return InputSnapshot(
+        move=pygame.Vector2(mx, my),
+        sprint=bool(flags & _FLAG_SPRINT),
+        block=bool(flags & _FLAG_BLOCK),
+        swing=bool(flags & _FLAG_SWING),
+        fire=bool(flags & _FLAG_FIRE),
+        dodge=bool(flags & _FLAG_DODGE),
+        aim=pygame.Vector2(ax, ay) if flags & _FLAG_AIM else None,
+        raise_shield=bool(flags & _FLAG_RAISE_SHIELD),
+    )
+
+
+class RecordingInput(InputSource):
+    """Passes another source through and keeps the snapshots handed out this frame."""
+
+    def __init__(self, inner: InputSource):
+        super().__init__()
+        self.inner = inner
+        self.frame_snapshots: list[InputSnapshot] = []
+
+    def queue_action(self, action: str):
+        self.inner.queue_action(action)
+
+    def poll_events(self) -> list[pygame.event.Event]:
+        return self.inner.poll_events()
+
+    def key_mods(self) -> int:
+        return self.inner.key_mods()
+
+    def snapshot(self, state) -> InputSnapshot:
+        snap = self.inner.snapshot(state)
+        self.frame_snapshots.append(snap)
+        return snap
+
+
+class ReplayRecorder:
+    """Hooked into game.run: wraps the input source and writes one record per gameplay frame."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.frame_ticks = 0
+        self.frames = 0
+        self._file = None
+        self._zip = zlib.compressobj(6)
+        self._input: RecordingInput | None = None
+        self._events: list[bytes] = []
+        self._frame_dt = 0.0
+        self._intro_frame = False
+
+    def attach(self, state: GameState):
+        """Call before start_game: the clock is frozen per frame so replays see the same values.
+
+        Every frame must then go through begin_frame/end_frame, intro frames included, or the
+        frozen clock stops advancing.
+        """
+        self.frame_ticks = pygame.time.get_ticks()
+        state.get_ticks = lambda: self.frame_ticks
+        if state.intro_active:
+            state.intro_line_start = self.frame_ticks / 1000.0
+        self._input = RecordingInput(state.input_source)
+        state.input_source = self._input
+        self._file = open(self.path, "wb")
+        zoom = float(getattr(state, "camera_zoom", 1.0))
+        self._file.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                state.rng_seed,
+                self.frame_ticks,
+                int(getattr(settings, "SIM_HZ", 0)),
+                int(getattr(settings, "SIM_MAX_STEPS", 8)),
+                state.screen.get_width(),
+                state.screen.get_height(),
+                zoom,
+                state.intro_active,
+            )
+        )
+
+    def begin_frame(self, state: GameState, events: list[pygame.event.Event], frame_dt: float, intro: bool = False):
+        self.frame_ticks = pygame.time.get_ticks()
+        self._frame_dt = frame_dt
+        self._intro_frame = intro
+        self._events = [data for data in (encode_event(e) for e in events) if data is not None]
+        self._input.frame_snapshots = []
+
+    def end_frame(self, state: GameState):
+        snaps = self._input.frame_snapshots
+        player = state.player
+        out = [
+            _FRAME.pack(
+                self._frame_dt, self.frame_ticks, len(self._events), len(snaps), self._intro_frame, player.pos.x, player.pos.y
+            )
+        ]
+        out.extend(self._events)
+        out.extend(encode_snapshot(snap) for snap in snaps)
+        self._file.write(self._zip.compress(b"".join(out)))
+        self.frames += 1
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.write(self._zip.flush())
+        self._file.close()
+        self._file = None
+
+
+@dataclass
+class ReplayFrame:
+    dt: float
+    ticks: int
+    events: list[pygame.event.Event]
+    snapshots: list[InputSnapshot]
+    player_pos: tuple[float, float]
+    intro: bool = False
+
+
+@dataclass
+class Replay:
+    seed: int
+    start_ticks: int
+    sim_hz: int
+    max_steps: int
+    screen_size: tuple[int, int]
+    camera_zoom: float
+    intro_active: bool = False
+    frames: list[ReplayFrame] = field(default_factory=list)
+
+
+def load_replay(path: str) -> Replay:
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        body = zlib.decompress(f.read())
+    magic, version, seed, start_ticks, sim_hz, max_steps, w, h, zoom, intro_active = _HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} replay")
+    rec = Replay(seed, start_ticks, sim_hz, max_steps, (w, h), zoom, intro_active)
+    offset = 0
+    while offset < len(body):
+        dt, ticks, n_events, n_snaps, intro, px, py = _FRAME.unpack_from(body, offset)
+        offset += _FRAME.size
+        events = []
+        for _ in range(n_events):
+            events.append(decode_event(body, offset))
+            offset += _EVENT.size
+        snaps = []
+        for _ in range(n_snaps):
+            snaps.append(decode_snapshot(body, offset))
+            offset += _SNAPSHOT.size
+        rec.frames.append(ReplayFrame(dt, ticks, events, snaps, (px, py), intro))
+    return rec
+
+
+@dataclass
+class ReplayResult:
+    frame_ms: list[float]
+    steps: int = 0
+    desync_frame: int | None = None
+
+
+def play_replay(rec: Replay, draw: bool = False) -> ReplayResult:
+    """Drive a fresh game from a recording as fast as possible, timing each frame.
+
+    Needs pygame initialised with a display (the dummy driver is fine). Stops checking for
+    desyncs after the first frame whose player position differs from the recording.
+    """
+    settings.SIM_HZ = rec.sim_hz
+    settings.SIM_MAX_STEPS = rec.max_steps
+    screen = pygame.display.set_mode(rec.screen_size)
+    state = create_game_state(screen, seed=rec.seed)
+    state.camera_zoom = rec.camera_zoom
+    ticks = [rec.start_ticks]
+    state.get_ticks = lambda: ticks[0]
+    if rec.intro_active:
+        state.intro_active = True
+        state.intro_line_start = rec.start_ticks / 1000.0
+    source = RecordedInput([snap for frame in rec.frames for snap in frame.snapshots])
+    state.input_source = source
+    start_game(state)
+
+    result = ReplayResult(frame_ms=[])
+    for i, frame in enumerate(rec.frames):
+        ticks[0] = frame.ticks
+        started = time.perf_counter()
+        profiler.begin_frame()
+        if frame.intro:
+            # Same as run(): intro frames only advance the intro (its last one calls reset_round).
+            update_intro(state, frame.events)
+            if draw and state.intro_active:
+                draw_intro(state)
+        else:
+            with profiler.scope("events"):
+                handle_events(state, frame.events)
+            with profiler.scope("update"):
+                result.steps += step_simulation(state, frame.dt)
+            if draw:
+                with profiler.scope("draw"):
+                    draw_game_interpolated(state)
+        profiler.end_frame()
+        result.frame_ms.append((time.perf_counter() - started) * 1000.0)
+        if result.desync_frame is None:
+            pos = struct.unpack("<ff", struct.pack("<ff", state.player.pos.x, state.player.pos.y))
+            if pos != frame.player_pos:
+                result.desync_frame = i
+        if state.game_over:
+            reset_round(state)
+        if not state.running:
+            break
+    return result
+
+
+def histogram(frame_ms: list[float]) -> list[int]:
+    counts = [0] * len(HISTOGRAM_EDGES_MS)
+    for ms in frame_ms:
+        for i, edge in enumerate(HISTOGRAM_EDGES_MS):
+            if ms <= edge:
+                counts[i] += 1
+                break
+    return counts
+
+
+def format_histogram(columns: dict[str, list[float]]) -> str:
+    """Frame-time buckets and percentiles, one column per run."""
+    names = list(columns)
+    lines = ["bucket (ms)  " + "".join(f"{name:>14}" for name in names)]
+    hists = {name: histogram(values) for name, values in columns.items()}
+    low = 0.0
+    for i, edge in enumerate(HISTOGRAM_EDGES_MS):
+        label = f"{low:g}-{edge:g}" if edge != float("inf") else f">{low:g}"
+        lines.append(f"{label:<13}" + "".join(f"{hists[name][i]:>14}" for name in names))
+        low = edge
+    for q in (0.5, 0.95, 0.99, 1.0):
+        label = "max" if q == 1.0 else f"p{int(q * 100)}"
+        lines.append(f"{label:<13}" + "".join(f"{percentile(columns[name], q):>14.2f}" for name in names))
+    return "\n".join(lines)
+
+
+def write_frame_csv(path: str, frame_ms: list[float]):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame", "ms"])
+        for i, ms in enumerate(frame_ms):
+            writer.writerow([i, f"{ms:.3f}"])
+
+
+def read_frame_csv(path: str) -> list[float]:
+    with open(path, newline="") as f:
+        return [float(row["ms"]) for row in csv.DictReader(f)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python replay.py", description="Record and replay play sessions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    record = sub.add_parser("record", help="play the game and record the session")
+    record.add_argument("path")
+    play = sub.add_parser("play", help="replay a session headless and report frame times")
+    play.add_argument("path")
+    play.add_argument("--draw", action="store_true", help="also draw every frame (offscreen)")
+    play.add_argument("--csv", default=None, help="write per-frame times (ms) to this CSV")
+    play.add_argument("--profile", default=None, help="write per-subsystem frame times to this CSV")
+    compare = sub.add_parser("compare", help="compare frame-time CSVs from earlier replays")
+    compare.add_argument("csvs", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        recorder = ReplayRecorder(args.path)
+        try:
+            run(recorder=recorder)
+        finally:
+            recorder.close()
+        return 0
+
+    if args.command == "play":
+        init_headless()
+        rec = load_replay(args.path)
+        if args.profile:
+            profiler.PROFILER.enabled = True
+            profiler.PROFILER.history = len(rec.frames) or 1
+            profiler.PROFILER.reset()
+        result = play_replay(rec, draw=args.draw)
+        print(f"{len(result.frame_ms)} frames, {result.steps} steps, seed {rec.seed}")
+        if result.desync_frame is not None:
+            print(f"warning: replay diverged from the recording at frame {result.desync_frame}")
+        print(format_histogram({"this run": result.frame_ms}))
+        if args.csv:
+            write_frame_csv(args.csv, result.frame_ms)
+        if args.profile:
+            profiler.dump_csv(args.profile)
+        return 1 if result.desync_frame is not None else 0
+
+    print(format_histogram({path: read_frame_csv(path) for path in args.csvs}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,12 +4,61 @@
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 TARGET_FPS = 60
+# Simulation runs in fixed steps of 1/SIM_HZ seconds, independent of the render rate (0 = one
+# variable step per frame, as before). A slow frame runs at most SIM_MAX_STEPS steps; the rest
+# of the backlog is dropped so the game slows down instead of spiralling.
+SIM_HZ = 120
+SIM_MAX_STEPS = 8
+# Draw moving things between the last two simulation steps so motion stays smooth.
+RENDER_INTERPOLATION = True
+# Resolution the world is drawn at, as a fraction of the window; below 1.0 the world is drawn
+# into a smaller layer and scaled up to the window. The HUD is always drawn at full resolution.
+RENDER_SCALE = 1.0
+# Filter used when the world layer has to be resized (zoom != 1): nearest is much cheaper.
+RENDER_SMOOTH_SCALE = False
+# Frame profiler: F3 toggles the timing overlay, F4 dumps the recorded frames to CSV.
+PROFILER_ENABLED = False
+PROFILER_HISTORY = 300  # frames kept for averages, p99 and the graph
 # Levels
 FIELD_LEVEL_INDEX = 4
 
 # Field world size (big overworld; rendered in tiles)
 FIELD_WORLD_WIDTH = 36000
 FIELD_WORLD_HEIGHT = 24000
+# Memory for cached map overview surfaces (MB)
+FIELD_MAP_CACHE_MB = 24
+# Memory for map overlay pyramid tiles (MB)
+FIELD_MAP_TILE_CACHE_MB = 64
+# Memory for the shrunk world tiles that zoomed-in map tiles are painted from (MB)
+FIELD_MAP_DETAIL_CACHE_MB = 16
+# Time per frame spent painting world detail into zoomed-in map tiles (ms)
+FIELD_MAP_DETAIL_BUDGET_MS = 6.0
+# Keep the drawn ground between frames and only redraw the strips the camera uncovers
+FIELD_BACKGROUND_SCROLL = True
+# Memory for cached field tiles (MB). The budget grows toward the max when zoomed out.
+FIELD_TILE_CACHE_MB = 96
+FIELD_TILE_CACHE_MAX_MB = 384
+# Memory for the half/quarter resolution and zoom-scaled tile copies used when zoomed out (MB)
+FIELD_TILE_LOD_CACHE_MB = 48
+# Background threads that draw field tiles (0 = draw them on the main thread, as before)
+FIELD_TILE_WORKERS = 2
+# Tiles warmed around the view: extra ring width (in tiles), how far ahead of the player's
+# velocity to look (seconds), and how long prefetching may spend per frame queueing them (ms).
+# Prefetching needs the worker threads; with FIELD_TILE_WORKERS = 0 only on-screen tiles are drawn.
+FIELD_TILE_PREFETCH_RING = 1
+FIELD_TILE_PREFETCH_LOOKAHEAD = 0.35
+FIELD_TILE_PREFETCH_BUDGET_MS = 3.0
+# Finished tiles are also saved to disk (per generator version) so later runs can skip drawing them.
+# Tiles are stored uncompressed (1.6 MB each, about 3.5 GB if the whole field gets explored) because
+# loading one then beats drawing it; `python -m world bench` compares the two on your machine.
+# Each version gets its own sub-directory and old ones are never deleted automatically; to reclaim
+# the space, delete the sub-directories you no longer need (or the whole cache directory).
+FIELD_TILE_DISK_CACHE = True
+FIELD_TILE_DISK_CACHE_DIR = ".tile_cache"
+# Stream tiles from the bundle written by `python -m world bake` (used when present and up to date).
+# Off by default: the bundle holds every tile uncompressed, about 3.5 GB for the full field.
+FIELD_TILE_BUNDLE = False
+FIELD_TILE_BUNDLE_PATH = "field_tiles.bundle"
 
 # Items
 ITEM_RUSTY_SWORD = "Rusty Sword"
@@ -19,6 +68,10 @@ ITEM_OLD_BOW = "Old Bow"
 # Radii
 PLAYER_RADIUS = 40
 PIG_RADIUS = 40
+# Cell size of the grid used to find nearby pigs
+PIG_GRID_CELL_SIZE = PIG_RADIUS * 4
+# Cell size of the index over static solids (houses, table, arena walls)
+COLLISION_CELL_SIZE = 512
 
 # Health
 PLAYER_MAX_HEALTH = 100
@@ -36,6 +89,11 @@ ALLY_RETURN_DISTANCE = 520
 FIELD_PIG_SPAWN_VIEW_PADDING = 900
 FIELD_PIG_SPAWN_PER_TICK = 4
 
+# Memory for pre-rendered pig sprites (MB)
+PIG_SPRITE_CACHE_MB = 32
+# Memory for pre-rendered player poses and dodge-roll frames (MB)
+PLAYER_SPRITE_CACHE_MB = 16
+
 # Sword
 SWORD_LENGTH = 64
 SWORD_WIDTH = 14
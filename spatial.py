@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import math
+
+import pygame
+
+
+class SpatialHash:
+    """Uniform grid over objects with `pos` and `radius`, for queries that only visit nearby cells.
+
+    Objects are keyed by identity (pig dataclasses aren't hashable). Cells are only updated when an
+    object crosses into a new one; queries check the live positions, and return objects in the order
+    they were last synced so results match a scan of the source list.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = float(cell_size)
+        self._cells: dict[tuple[int, int], dict[int, object]] = {}
+        self._where: dict[int, tuple[int, int]] = {}
+        self._order: dict[int, int] = {}
+        self.max_radius = 0.0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, obj) -> bool:
+        return id(obj) in self._where
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def update(self, obj):
+        """Insert obj, or move it to the cell its position is in now."""
+        key = id(obj)
+        cell = self._cell(obj.pos.x, obj.pos.y)
+        self.max_radius = max(self.max_radius, float(obj.radius))
+        old = self._where.get(key)
+        if old == cell:
+            return
+        if old is not None:
+            bucket = self._cells[old]
+            del bucket[key]
+            if not bucket:
+                del self._cells[old]
+        self._cells.setdefault(cell, {})[key] = obj
+        self._where[key] = cell
+        if key not in self._order:
+            self._order[key] = len(self._order)
+
+    def remove(self, obj):
+        key = id(obj)
+        cell = self._where.pop(key, None)
+        self._order.pop(key, None)
+        if cell is None:
+            return
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+
+    def sync(self, objs):
+        """Make the grid hold exactly objs (in that order), moving only the ones that changed cell."""
+        order = {}
+        for i, obj in enumerate(objs):
+            order[id(obj)] = i
+            self.update(obj)
+        for key in [k for k in self._where if k not in order]:
+            cell = self._where.pop(key)
+            bucket = self._cells[cell]
+            del bucket[key]
+            if not bucket:
+                del self._cells[cell]
+        self._order = order
+
+    def clear(self):
+        self._cells.clear()
+        self._where.clear()
+        self._order.clear()
+        self.max_radius = 0.0
+
+    def _gather(self, left: float, top: float, right: float, bottom: float) -> list:
+        cx0, cy0 = self._cell(left, top)
+        cx1, cy1 = self._cell(right, bottom)
+        found = []
+        # Few objects relative to a wide query: walking the occupied cells is cheaper.
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            for (cx, cy), bucket in self._cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found.extend(bucket.values())
+            return found
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket.values())
+        return found
+
+    def _sorted(self, objs: list) -> list:
+        order = self._order
+        objs.sort(key=lambda o: order.get(id(o), 0))
+        return objs
+
+    def neighbors(self, obj, reach: float) -> list:
+        """Unfiltered, unordered objects in the cells within reach of obj's cell (obj included)."""
+        cell = self._where.get(id(obj))
+        if cell is None:
+            return []
+        ring = max(1, math.ceil(reach / self.cell_size))
+        cx, cy = cell
+        cells = self._cells
+        found = []
+        for y in range(cy - ring, cy + ring + 1):
+            for x in range(cx - ring, cx + ring + 1):
+                bucket = cells.get((x, y))
+                if bucket:
+                    found.extend(bucket.values())
+        return found
+
+    def query_radius(self, pos: pygame.Vector2, radius: float) -> list:
+        """Objects whose circle overlaps the circle (pos, radius); radius 0 finds circles containing pos."""
+        reach = radius + self.max_radius
+        candidates = self._gather(pos.x - reach, pos.y - reach, pos.x + reach, pos.y + reach)
+        hits = []
+        for obj in candidates:
+            limit = radius + obj.radius
+            if (obj.pos - pos).length_squared() <= limit * limit:
+                hits.append(obj)
+        return self._sorted(hits)
+
+    def query_rect(self, rect: pygame.Rect) -> list:
+        """Objects whose position lies inside rect (same test as Rect.collidepoint)."""
+        candidates = self._gather(rect.left, rect.top, rect.right, rect.bottom)
+        hits = [obj for obj in candidates if rect.collidepoint(obj.pos.x, obj.pos.y)]
+        return self._sorted(hits)
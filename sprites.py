@@ -0,0 +1,693 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, replace
+
+import pygame
+
+import settings
+from combat import get_swing_dir, swing_ease, swing_reach_multiplier, sword_polygon_points
+from surface_cache import SurfaceCache, surface_bytes
+
+# Quantization of the pig pose; each distinct bucket tuple is one cached sprite.
+PIG_FACING_BUCKETS = 32
+PIG_WALK_BUCKETS = 8
+PIG_REACH_STEPS = 16
+
+PLAYER_ARM_BUCKETS = 32
+PLAYER_REACH_STEPS = 8
+PLAYER_LEG_STEP = 6
+PLAYER_BOB_STEP = 2
+PLAYER_SHIELD_STEP = 4
+PLAYER_DODGE_ANGLE_STEP = 15
+PLAYER_DODGE_SQUASH_STEPS = 8
+
+# (body, outline, snout) per variant. Evil and boss pigs look like normal ones for now; give them
+# their own entry (and a case in pig_sprite_variant) once their colours differ.
+PIG_PALETTES = {
+    "normal": ((255, 160, 180), (200, 120, 140), (255, 140, 160)),
+    "ally": ((140, 220, 255), (60, 140, 200), (180, 245, 255)),
+}
+
+
+def _sprite_entry_bytes(entry: tuple[pygame.Surface, tuple[int, int]]) -> int:
+    return surface_bytes(entry[0])
+
+
+# Entries are (sprite, origin): where the pig/player center sits inside the cropped sprite.
+_PIG_SPRITES = SurfaceCache(int(getattr(settings, "PIG_SPRITE_CACHE_MB", 32) * 1024 * 1024), sizeof=_sprite_entry_bytes)
+_PLAYER_SPRITES = SurfaceCache(int(getattr(settings, "PLAYER_SPRITE_CACHE_MB", 16) * 1024 * 1024), sizeof=_sprite_entry_bytes)
+# Equipment the player sprites were drawn with; they're dropped when it changes.
+_PLAYER_SPRITE_EQUIPMENT: list = [None]
+
+
+def pig_sprite_variant(pig) -> str:
+    if getattr(pig, "is_ally", False):
+        return "ally"
+    return "normal"
+
+
+def _direction_bucket(vec: pygame.Vector2) -> int:
+    if vec.length_squared() == 0:
+        return 0
+    angle = math.atan2(vec.y, vec.x)
+    return round(angle / math.tau * PIG_FACING_BUCKETS) % PIG_FACING_BUCKETS
+
+
+def _bucket_direction(bucket: int) -> pygame.Vector2:
+    return pygame.Vector2(1, 0).rotate(bucket * 360.0 / PIG_FACING_BUCKETS)
+
+
+def pig_sprite_key(pig) -> tuple:
+    """Cache key for the pig's current look: variant, size, facing, legs and sword pose."""
+    facing = pig.facing if pig.facing.length_squared() > 0 else pygame.Vector2(1, 0)
+    if pig.swing_timer > 0:
+        draw_dir = get_swing_dir(pig.swing_base_dir, pig.swing_timer, pig.swing_time, pig.facing)
+        reach = round(swing_reach_multiplier(pig.swing_timer, pig.swing_time) * PIG_REACH_STEPS)
+    else:
+        draw_dir = facing
+        reach = PIG_REACH_STEPS
+    # Legs freeze while attacking
+    moving = pig.windup_timer <= 0 and pig.swing_timer <= 0
+    walk = round(pig.walk_cycle / math.tau * PIG_WALK_BUCKETS) % PIG_WALK_BUCKETS if moving else -1
+    return (
+        pig_sprite_variant(pig),
+        int(pig.radius),
+        _direction_bucket(facing),
+        _direction_bucket(draw_dir),
+        walk,
+        reach,
+        pig.swing_timer > 0,
+    )
+
+
+def _draw_pig(screen: pygame.Surface, pp: pygame.Vector2, key: tuple):
+    """Procedural pig drawing (upright pink pig with head, snout, ears, arms, legs and a sword)."""
+    variant, radius, facing_bucket, dir_bucket, walk, reach, swinging = key
+    PINK, DARK_PINK, SNOUT = PIG_PALETTES[variant]
+    pig_leg_swing = int(12 * math.sin(walk * math.tau / PIG_WALK_BUCKETS)) if walk >= 0 else 0
+
+    # Body dimensions
+    body_w = int(radius * 1.8)
+    body_h = int(radius * 1.2)
+    body_rect = pygame.Rect(int(pp.x - body_w / 2), int(pp.y - body_h / 2), body_w, body_h)
+
+    # Draw body (oval)
+    pygame.draw.ellipse(screen, PINK, body_rect)
+    pygame.draw.ellipse(screen, DARK_PINK, body_rect, 2)
+
+    # Head above body
+    head_offset = pygame.Vector2(0, -body_h * 0.6)
+    head_center = pp + head_offset
+    head_radius = int(body_h * 0.5)
+    pygame.draw.circle(screen, PINK, (int(head_center.x), int(head_center.y)), head_radius)
+    pygame.draw.circle(screen, DARK_PINK, (int(head_center.x), int(head_center.y)), head_radius, 2)
+
+    # Snout (in front of head based on facing)
+    snout_dir = _bucket_direction(facing_bucket)
+    snout_center = head_center + snout_dir * (head_radius * 0.5)
+    pygame.draw.circle(screen, SNOUT, (int(snout_center.x), int(snout_center.y)), int(head_radius * 0.4))
+    pygame.draw.circle(screen, (100, 40, 40), (int(snout_center.x), int(snout_center.y)), int(head_radius * 0.12))
+
+    # Ears (two small triangles)
+    ear_offset = pygame.Vector2(head_radius * 0.6, -head_radius * 0.6)
+    left_ear = [
+        (int(head_center.x - ear_offset.x), int(head_center.y + ear_offset.y)),
+        (int(head_center.x - ear_offset.x - 6), int(head_center.y + ear_offset.y - 12)),
+        (int(head_center.x - ear_offset.x + 6), int(head_center.y + ear_offset.y - 12)),
+    ]
+    right_ear = [
+        (int(head_center.x + ear_offset.x), int(head_center.y + ear_offset.y)),
+        (int(head_center.x + ear_offset.x - 6), int(head_center.y + ear_offset.y - 12)),
+        (int(head_center.x + ear_offset.x + 6), int(head_center.y + ear_offset.y - 12)),
+    ]
+    pygame.draw.polygon(screen, PINK, left_ear)
+    pygame.draw.polygon(screen, PINK, right_ear)
+    pygame.draw.polygon(screen, DARK_PINK, left_ear, 1)
+    pygame.draw.polygon(screen, DARK_PINK, right_ear, 1)
+
+    # Eyes
+    eye_offset = pygame.Vector2(head_radius * 0.3, -head_radius * 0.1)
+    left_eye = head_center + pygame.Vector2(-eye_offset.x, eye_offset.y)
+    right_eye = head_center + pygame.Vector2(eye_offset.x, eye_offset.y)
+    pygame.draw.circle(screen, (30, 30, 30), (int(left_eye.x), int(left_eye.y)), 3)
+    pygame.draw.circle(screen, (30, 30, 30), (int(right_eye.x), int(right_eye.y)), 3)
+
+    # Tail (curly)
+    tail_base = pp + pygame.Vector2(body_w / 2, -body_h * 0.2)
+    pygame.draw.arc(screen, DARK_PINK, (int(tail_base.x), int(tail_base.y), 14, 14), 3.14, 5.0, 3)
+
+    # Legs
+    leg_y = int(pp.y + body_h * 0.35)
+    left_leg_start = (int(pp.x - body_w * 0.28), leg_y - 6)
+    left_leg_end = (int(pp.x - body_w * 0.28 + pig_leg_swing), int(leg_y + radius * 0.5))
+    right_leg_start = (int(pp.x + body_w * 0.28), leg_y - 6)
+    right_leg_end = (int(pp.x + body_w * 0.28 - pig_leg_swing), int(leg_y + radius * 0.5))
+    pygame.draw.line(screen, DARK_PINK, left_leg_start, left_leg_end, 8)
+    pygame.draw.line(screen, DARK_PINK, right_leg_start, right_leg_end, 8)
+
+    # Arms and sword
+    pig_draw_dir = _bucket_direction(dir_bucket)
+    pig_swing_reach = reach / PIG_REACH_STEPS
+    # Arm origin slightly above body center
+    arm_origin = pp + pygame.Vector2(0, -body_h * 0.1)
+    arm_len = int(settings.SWORD_LENGTH * 0.5 * pig_swing_reach)
+    grip_end = arm_origin + pig_draw_dir * arm_len
+    # Draw arm
+    pygame.draw.line(screen, DARK_PINK, (int(arm_origin.x), int(arm_origin.y)), (int(grip_end.x), int(grip_end.y)), 6)
+
+    # Draw sword swing polygon or idle sword
+    if swinging:
+        es_pts = sword_polygon_points(
+            arm_origin,
+            pig_draw_dir,
+            settings.PIG_SWING_DISTANCE * pig_swing_reach,
+            settings.SWORD_LENGTH * pig_swing_reach,
+            settings.SWORD_WIDTH,
+        )
+        pygame.draw.polygon(screen, (220, 200, 180), es_pts)
+    else:
+        # idle sword: simple line + pommel
+        tip = grip_end + pig_draw_dir * settings.SWORD_LENGTH
+        pygame.draw.line(screen, (120, 80, 40), (int(grip_end.x), int(grip_end.y)), (int(tip.x), int(tip.y)), 6)
+        perp = pygame.Vector2(-pig_draw_dir.y, pig_draw_dir.x)
+        cross_left = grip_end + perp * int(settings.SWORD_LENGTH * 0.18)
+        cross_right = grip_end - perp * int(settings.SWORD_LENGTH * 0.18)
+        pygame.draw.line(screen, (220, 180, 70), (int(cross_left.x), int(cross_left.y)), (int(cross_right.x), int(cross_right.y)), 4)
+        pygame.draw.circle(screen, (80, 50, 30), (int(arm_origin.x), int(arm_origin.y)), 5)
+
+
+def _render_pig_sprite(key: tuple) -> tuple[pygame.Surface, tuple[int, int]]:
+    radius = key[1]
+    # Big enough for the body plus a fully extended sword in any direction.
+    half = int(radius * 2 + max(settings.SWORD_LENGTH * 1.5, settings.PIG_SWING_DISTANCE + settings.SWORD_LENGTH))
+    half += settings.SWORD_WIDTH + 8
+    scratch = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+    _draw_pig(scratch, pygame.Vector2(half, half), key)
+    bounds = scratch.get_bounding_rect()
+    sprite = scratch.subsurface(bounds).copy()
+    return sprite, (half - bounds.x, half - bounds.y)
+
+
+def get_pig_sprite(pig) -> tuple[pygame.Surface, tuple[int, int]]:
+    """Pre-rendered sprite for the pig's current pose and the pig center's offset inside it."""
+    return _get_pig_sprite(pig_sprite_key(pig))
+
+
+def _get_pig_sprite(key: tuple) -> tuple[pygame.Surface, tuple[int, int]]:
+    entry = _PIG_SPRITES.get(key)
+    if entry is None:
+        entry = _render_pig_sprite(key)
+        _PIG_SPRITES.put(key, entry)
+    return entry
+
+
+def _get_scaled_sprite(cache: SurfaceCache, key, scale: float, get) -> tuple[pygame.Surface, tuple[int, int]]:
+    """(sprite, origin) from get(), shrunk by scale (see RENDER_SCALE) and cached next to the full-size one."""
+    if scale == 1.0:
+        return get()
+    scaled_key = ("scaled", key, scale)
+    entry = cache.get(scaled_key)
+    if entry is None:
+        sprite, (ox, oy) = get()
+        size = (max(1, round(sprite.get_width() * scale)), max(1, round(sprite.get_height() * scale)))
+        entry = (pygame.transform.smoothscale(sprite, size), (round(ox * scale), round(oy * scale)))
+        cache.put(scaled_key, entry)
+    return entry
+
+
+def draw_pig_sprite(surface: pygame.Surface, pig, pos: pygame.Vector2, scale: float = 1.0):
+    """Draw the pig centered on the screen position pos with a single blit (scale: pixels per world pixel)."""
+    key = pig_sprite_key(pig)
+    sprite, (ox, oy) = _get_scaled_sprite(_PIG_SPRITES, key, scale, lambda: _get_pig_sprite(key))
+    surface.blit(sprite, (int(pos.x) - ox, int(pos.y) - oy))
+
+
+def pig_sprite_cache_stats() -> dict:
+    """Hit/miss/eviction counters and memory use of the pig sprite cache."""
+    return _PIG_SPRITES.stats()
+
+
+@dataclass(frozen=True)
+class PlayerPose:
+    """Quantized player look; equal poses draw identical sprites."""
+
+    equipment: tuple
+    dodging: bool
+    leg_swing: int
+    bob: int
+    boot_face: tuple[int, int]
+    arm_bucket: int
+    reach: int
+    arms_locked: bool
+    bow_drawn: bool
+    blocking: bool
+    shield_offset: tuple[int, int]
+    pupil: int
+
+
+def player_equipment(player) -> tuple:
+    return (
+        bool(player.head_item),
+        bool(player.armor_equipped),
+        player.weapon_item == settings.ITEM_RUSTY_SWORD,
+        bool(player.bow_equipped),
+        getattr(player, "shield_item", "") == settings.ITEM_RUSTY_SHIELD,
+    )
+
+
+def _player_arm_ends(p: pygame.Vector2, arm_dir: pygame.Vector2, bob: int, arms_locked: bool):
+    """Shoulder and hand positions for both arms."""
+    body_width = int(settings.PLAYER_RADIUS * 1.4)
+    body_height = int(settings.PLAYER_RADIUS * 1.8)
+    body_top = int(p.y - body_height // 2 + bob)
+    arm_len = int(settings.PLAYER_SWING_DISTANCE * 0.8)
+    shoulder_y = body_top + int(body_height * 0.2)
+    arm_x_offset = body_width // 2 - 4  # keep close to torso without being flush
+    arm_drop_vec = pygame.Vector2(0, settings.PLAYER_RADIUS * 0.05)
+
+    left_arm_start = pygame.Vector2(p.x - arm_x_offset, shoulder_y)
+    if arms_locked:
+        # Freeze shield arm during sword swings
+        left_arm_end_vec = left_arm_start + pygame.Vector2(0, arm_len * 0.6)
+    else:
+        # left arm swings opposite to right
+        left_arm_dir = pygame.Vector2(-arm_dir.x, arm_dir.y * 0.9)
+        left_arm_end_vec = left_arm_start + left_arm_dir.normalize() * int(arm_len * 0.9) + arm_drop_vec
+    right_arm_start = pygame.Vector2(p.x + arm_x_offset, shoulder_y)
+    right_arm_end_vec = right_arm_start + arm_dir * arm_len + arm_drop_vec
+    return left_arm_start, left_arm_end_vec, right_arm_start, right_arm_end_vec
+
+
+def _arm_bucket_direction(bucket: int) -> pygame.Vector2:
+    return pygame.Vector2(1, 0).rotate(bucket * 360.0 / PLAYER_ARM_BUCKETS)
+
+
+def player_pose(player, move: pygame.Vector2, time_tick: int) -> PlayerPose:
+    """Work out this frame's pose (also updates the swing reach / shield anchor the player carries)."""
+    leg_swing = 0
+    move_speed = player.speed if player.health > 0 else 0
+    keys_down = move.x != 0 or move.y != 0
+    if move_speed > 0 and keys_down:
+        leg_swing = int(18 * math.sin(time_tick * 0.011))
+    leg_swing = int(round(leg_swing / PLAYER_LEG_STEP)) * PLAYER_LEG_STEP
+    # small idle bob for breathing / animation
+    bob = int(round(math.sin(time_tick * 0.004) * 2 / PLAYER_BOB_STEP)) * PLAYER_BOB_STEP
+
+    move_dir = pygame.Vector2(move)
+
+    walking_vertical = (
+        keys_down
+        and move_dir.length_squared() > 0
+        and move_dir.y != 0
+        and abs(move_dir.y) >= abs(move_dir.x)
+    )
+    if walking_vertical:
+        boot_face = (0, -1)
+    elif keys_down and move_dir.length_squared() > 0 and move_dir.x != 0:
+        boot_face = (1 if move_dir.x > 0 else -1, 0)
+    else:
+        look_x = float(player.facing.x)
+        if abs(look_x) >= 0.25:
+            boot_face = (1 if look_x > 0 else -1, 0)
+        else:
+            boot_face = (1, 0)
+
+    attack_dir = (
+        get_swing_dir(player.swing_base_dir, player.swing_timer, settings.PLAYER_SWING_TIME, player.facing)
+        if player.swing_timer > 0
+        else (player.facing if player.facing.length_squared() > 0 else pygame.Vector2(1, 0))
+    )
+
+    # Idle pose: arms hang down with ~30 deg outward angle, with light swing tied to legs
+    rest_angle = math.radians(30)
+    sway_angle = math.radians(leg_swing * 0.3)
+    arm_angle = rest_angle + sway_angle
+    idle_arm_dir = pygame.Vector2(math.sin(arm_angle), math.cos(arm_angle))  # right arm points down/out
+    if move_dir.length_squared() > 0:
+        # bias arm slightly toward movement direction without opening the armpit too wide
+        idle_arm_dir = idle_arm_dir.lerp(move_dir.normalize(), 0.25)
+    if idle_arm_dir.length_squared() == 0:
+        idle_arm_dir = pygame.Vector2(0.5, 1)
+    idle_arm_dir = idle_arm_dir.normalize()
+
+    swing_progress = swing_ease(player.swing_timer, settings.PLAYER_SWING_TIME) if player.swing_timer > 0 else 0.0
+    swing_reach = swing_reach_multiplier(player.swing_timer, settings.PLAYER_SWING_TIME) if player.swing_timer > 0 else 1.0
+    arm_dir = pygame.Vector2(idle_arm_dir)
+    reach_mult = 1.0
+
+    if player.swing_timer > 0:
+        target_dir = pygame.Vector2(attack_dir)
+        if target_dir.length_squared() == 0:
+            target_dir = pygame.Vector2(1, 0)
+        target_dir = target_dir.normalize()
+        arm_dir = idle_arm_dir.lerp(target_dir, swing_progress).normalize()
+        reach_mult = swing_reach
+        player.last_swing_reach = reach_mult
+    elif player.swing_recover_timer > 0:
+        recover_blend = swing_ease(player.swing_recover_timer, settings.PLAYER_SWING_RECOVER_TIME)
+        arm_dir = pygame.Vector2(player.last_attack_dir).lerp(idle_arm_dir, recover_blend)
+        if arm_dir.length_squared() == 0:
+            arm_dir = pygame.Vector2(idle_arm_dir)
+        arm_dir = arm_dir.normalize()
+        reach_mult = player.last_swing_reach + (1.0 - player.last_swing_reach) * recover_blend
+    # else: arm_dir stays at idle, reach_mult at 1
+
+    arm_bucket = round(math.atan2(arm_dir.y, arm_dir.x) / math.tau * PLAYER_ARM_BUCKETS) % PLAYER_ARM_BUCKETS
+    arms_locked = player.swing_timer > 0 or player.swing_recover_timer > 0
+    equipment = player_equipment(player)
+    blocking = bool(player.is_blocking)
+
+    shield_offset = (0, 0)
+    if equipment[4]:
+        if arms_locked:
+            # Keep the shield locked in place during sword swings so it doesn't slide when attacking
+            shield_offset = (
+                int(round(player.shield_anchor_offset.x / PLAYER_SHIELD_STEP)) * PLAYER_SHIELD_STEP,
+                int(round(player.shield_anchor_offset.y / PLAYER_SHIELD_STEP)) * PLAYER_SHIELD_STEP,
+            )
+        else:
+            # Shift toward torso when blocking but stop halfway instead of centering on the body
+            shift_toward_body = 0.5 if blocking else 0.25
+            center = pygame.Vector2(0, 0)
+            left_arm_end_vec = _player_arm_ends(center, _arm_bucket_direction(arm_bucket), bob, False)[1]
+            player.shield_anchor_offset = left_arm_end_vec + (center - left_arm_end_vec) * shift_toward_body
+
+    # Eyes: only look left/right when facing that way.
+    look_x = float(player.facing.x)
+    pupil = 0 if abs(look_x) < 0.35 else (1 if look_x > 0 else -1)
+
+    return PlayerPose(
+        equipment=equipment,
+        dodging=bool(player.is_dodging),
+        leg_swing=leg_swing,
+        bob=bob,
+        boot_face=boot_face,
+        arm_bucket=arm_bucket,
+        reach=round(reach_mult * PLAYER_REACH_STEPS),
+        arms_locked=arms_locked,
+        bow_drawn=player.bow_cooldown > 0,
+        blocking=blocking,
+        shield_offset=shield_offset,
+        pupil=pupil,
+    )
+
+
+def _draw_player(screen: pygame.Surface, p: pygame.Vector2, pose: PlayerPose):
+    """Procedural player drawing: legs, boots, body, arms, weapon, shield and head."""
+    has_head_item, armor_equipped, has_sword, bow_equipped, has_shield = pose.equipment
+    bob = pose.bob
+    hip_y = p.y + settings.PLAYER_RADIUS * 0.6
+    leg_len = settings.PLAYER_RADIUS + 16
+    leg_swing = pose.leg_swing
+    leg_thickness = 12
+    left_hip = (int(p.x - 18), int(hip_y))
+    left_foot = (int(p.x - 20 + leg_swing), int(hip_y + leg_len))
+    right_hip = (int(p.x + 18), int(hip_y))
+    right_foot = (int(p.x + 20 - leg_swing), int(hip_y + leg_len))
+    pygame.draw.line(screen, (60, 0, 0), left_hip, left_foot, leg_thickness)
+    pygame.draw.line(screen, (60, 0, 0), right_hip, right_foot, leg_thickness)
+
+    # Small boots at the feet (wide, short) for more character.
+    boot_w, boot_h = 18, 8
+    boot_col = (35, 25, 20)
+    boot_outline = (10, 10, 10)
+    boot_highlight = (80, 60, 45)
+    boot_face_dir = pygame.Vector2(pose.boot_face)
+
+    def draw_boot(fx: int, fy: int):
+        boot = pygame.Rect(int(fx - boot_w / 2), int(fy - boot_h / 2), boot_w, boot_h)
+        pygame.draw.rect(screen, boot_col, boot, border_radius=3)
+        pygame.draw.rect(screen, boot_outline, boot, 2, border_radius=3)
+
+        toe_len = max(4, int(boot_h * 0.9))
+        toe = None
+        if boot_face_dir.x > 0.1:
+            toe = pygame.Rect(boot.right - 2, boot.top + 1, toe_len, max(1, boot.height - 2))
+        elif boot_face_dir.x < -0.1:
+            toe = pygame.Rect(boot.left - toe_len + 2, boot.top + 1, toe_len, max(1, boot.height - 2))
+        elif boot_face_dir.y < -0.1:
+            toe = pygame.Rect(boot.left + 1, boot.top - toe_len + 2, max(1, boot.width - 2), toe_len)
+        elif boot_face_dir.y > 0.1:
+            toe = pygame.Rect(boot.left + 1, boot.bottom - 2, max(1, boot.width - 2), toe_len)
+
+        if toe is not None:
+            pygame.draw.rect(screen, boot_col, toe, border_radius=3)
+            pygame.draw.rect(screen, boot_outline, toe, 2, border_radius=3)
+
+        # Highlight on the "front" edge so the boot reads as facing a direction.
+        if boot_face_dir.x > 0.1:
+            pygame.draw.line(screen, boot_highlight, (boot.right - 2, boot.top + 2), (boot.right - 2, boot.bottom - 2), 2)
+        elif boot_face_dir.x < -0.1:
+            pygame.draw.line(screen, boot_highlight, (boot.left + 2, boot.top + 2), (boot.left + 2, boot.bottom - 2), 2)
+        elif boot_face_dir.y < -0.1:
+            pygame.draw.line(screen, boot_highlight, (boot.left + 2, boot.top + 2), (boot.right - 2, boot.top + 2), 2)
+        else:
+            pygame.draw.line(screen, boot_highlight, (boot.left + 2, boot.bottom - 2), (boot.right - 2, boot.bottom - 2), 2)
+
+    for fx, fy in (left_foot, right_foot):
+        draw_boot(int(fx), int(fy))
+
+    base_body_color = (120, 200, 120) if pose.dodging else (200, 90, 80)
+    head_center = pygame.Vector2(p.x, p.y - settings.PLAYER_RADIUS * 0.85 + bob)
+    head_radius = settings.PLAYER_RADIUS // 2
+    body_width = int(settings.PLAYER_RADIUS * 1.4)
+    body_height = int(settings.PLAYER_RADIUS * 1.8)
+    body_rect = pygame.Rect(
+        int(p.x - body_width // 2),
+        int(p.y - body_height // 2 + bob),
+        body_width,
+        body_height,
+    )
+    leg_center = (int(p.x), int(p.y + settings.PLAYER_RADIUS * 0.6))
+    leg_radius = settings.PLAYER_RADIUS // 2 + 6
+
+    head_color = (235, 205, 160) if has_head_item else (200, 180, 160)
+    body_color = (170, 100, 90) if not armor_equipped else (150, 120, 80)
+    leg_color = (100, 60, 50)
+    arm_color = (170, 110, 80)
+    shoulder_y = body_rect.top + int(body_height * 0.2)
+    arm_dir = _arm_bucket_direction(pose.arm_bucket)
+    reach_mult = pose.reach / PLAYER_REACH_STEPS
+
+    # legs
+    pygame.draw.circle(screen, leg_color, leg_center, leg_radius)
+    # Body with simple outline and trim
+    outline_rect = body_rect.inflate(6, 6)
+    pygame.draw.rect(screen, (60, 40, 40), outline_rect, border_radius=6)
+    pygame.draw.rect(screen, base_body_color, body_rect, border_radius=6)
+    inner_body = body_rect.inflate(-8, -8)
+    pygame.draw.rect(screen, body_color, inner_body, border_radius=4)
+    panel_rect = inner_body.inflate(
+        -int(inner_body.width * 0.35),
+        -int(inner_body.height * 0.2),
+    )
+    pygame.draw.rect(screen, (210, 160, 160) if not armor_equipped else (190, 150, 90), panel_rect, border_radius=4)
+    belt_rect = pygame.Rect(inner_body.left, inner_body.centery + 6, inner_body.width, 10)
+    pygame.draw.rect(screen, (60, 40, 20), belt_rect, border_radius=4)
+    hem_rect = pygame.Rect(inner_body.left, inner_body.bottom - 10, inner_body.width, 8)
+    pygame.draw.rect(screen, (80, 40, 40), hem_rect, border_radius=3)
+
+    left_arm_start, left_arm_end_vec, right_arm_start, right_arm_end_vec = _player_arm_ends(
+        p, arm_dir, bob, pose.arms_locked
+    )
+    pygame.draw.line(screen, arm_color, left_arm_start, left_arm_end_vec, 8)
+    pygame.draw.line(screen, arm_color, right_arm_start, right_arm_end_vec, 8)
+
+    # Weapon held in right hand (moves with arm/facing)
+    sword_dir = arm_dir
+    grip_len = int(settings.SWORD_LENGTH * 0.3 * reach_mult)
+    blade_len = int(settings.SWORD_LENGTH * reach_mult)
+    grip_end = right_arm_end_vec + sword_dir * grip_len
+    blade_tip = grip_end + sword_dir * blade_len
+    cross_half = int(settings.SWORD_LENGTH * 0.18)
+    perp = pygame.Vector2(-sword_dir.y, sword_dir.x)
+    cross_left = grip_end + perp * cross_half
+    cross_right = grip_end - perp * cross_half
+    bow_base_left = right_arm_end_vec + perp * cross_half
+    bow_base_right = right_arm_end_vec - perp * cross_half
+    bow_tip = right_arm_end_vec + sword_dir * (settings.SWORD_LENGTH * 0.9)
+    bow_points = [
+        (int(bow_base_left.x), int(bow_base_left.y)),
+        (int(bow_base_right.x), int(bow_base_right.y)),
+        (int(bow_tip.x), int(bow_tip.y)),
+    ]
+
+    # Draw sword only if it's equipped
+    if has_sword:
+        # If bow is equipped and active, show bow animation instead
+        if bow_equipped and pose.bow_drawn:
+            pygame.draw.polygon(screen, (200, 200, 255), bow_points, 2)
+            pygame.draw.circle(screen, (80, 50, 30), right_arm_end_vec, 6)  # hand/pommel
+        else:
+            # Zelda-like sword visuals
+            pygame.draw.line(screen, (120, 80, 40), right_arm_end_vec, grip_end, 8)  # grip
+            pygame.draw.line(screen, (220, 180, 70), cross_left, cross_right, 6)  # crossguard
+            pygame.draw.line(screen, (180, 210, 255), grip_end, blade_tip, 8)  # blade
+            pygame.draw.circle(screen, (80, 50, 30), right_arm_end_vec, 6)  # pommel/hand
+    elif bow_equipped:
+        # Draw bow when equipped (idle or firing)
+        if pose.bow_drawn:
+            pygame.draw.polygon(screen, (200, 200, 255), bow_points, 2)
+        else:
+            # idle bow as a filled triangle
+            pygame.draw.polygon(screen, (180, 200, 230), bow_points)
+    if armor_equipped:
+        # Simple chest plate overlay plus shoulder pads
+        pygame.draw.rect(screen, (200, 170, 90), inner_body.inflate(-10, -10), 4, border_radius=6)
+        pad_radius = 10
+        pad_offset = body_width // 2 - 6
+        pygame.draw.circle(screen, (180, 150, 80), (int(p.x - pad_offset), shoulder_y), pad_radius)
+        pygame.draw.circle(screen, (180, 150, 80), (int(p.x + pad_offset), shoulder_y), pad_radius)
+    else:
+        # Cloth collar/trim when not armored
+        collar = pygame.Rect(inner_body.left, inner_body.top - 6, inner_body.width, 8)
+        pygame.draw.rect(screen, (220, 200, 200), collar, border_radius=4)
+    if has_shield:
+        # Zelda-like shield: equilateral top linked to a lower triangle, always visible on left arm
+        body_center = pygame.Vector2(p.x, p.y)
+        if pose.arms_locked:
+            shield_anchor = body_center + pygame.Vector2(pose.shield_offset)
+        else:
+            # Shift toward torso when blocking but stop halfway instead of centering on the body
+            shift_toward_body = 0.5 if pose.blocking else 0.25
+            shield_anchor = left_arm_end_vec + (body_center - left_arm_end_vec) * shift_toward_body
+
+        base_half = 28  # smaller shield
+        top_height = base_half * math.sqrt(3)  # equilateral triangle height for side = base_half*2
+        bottom_height = 72  # slightly shorter lower point
+
+        base_offset_y = 6
+        base_left = shield_anchor + pygame.Vector2(-base_half, base_offset_y)
+        base_right = shield_anchor + pygame.Vector2(base_half, base_offset_y)
+
+        # Equilateral top triangle (pointing upward/left-ish), shares base with bottom
+        top_tip = shield_anchor + pygame.Vector2(-base_half * 0.1, base_offset_y - top_height)
+
+        # Bottom triangle (pointing downward, slightly inset toward center)
+        bottom_tip = shield_anchor + pygame.Vector2(-base_half * 0.12, base_offset_y + bottom_height)
+
+        main_color = (96, 140, 200)
+        accent_color = (150, 200, 255)
+        outline_color = (60, 100, 160)
+
+        pygame.draw.polygon(screen, main_color, [top_tip, base_left, base_right])
+        pygame.draw.polygon(screen, accent_color, [base_left, base_right, bottom_tip])
+        pygame.draw.lines(
+            screen,
+            outline_color,
+            False,
+            [top_tip, base_left, bottom_tip, base_right, top_tip],
+            4,
+        )
+        pygame.draw.line(screen, outline_color, base_left, base_right, 3)
+
+    # Draw head last so arms/weapons don't cut across it.
+    pygame.draw.circle(screen, head_color, head_center, head_radius)
+    pupil_dir = pygame.Vector2(pose.pupil, 0)
+    eye_sep = head_radius * 0.45
+    eye_drop = head_radius * 0.12
+    eye_r = max(3, int(head_radius * 0.20))
+    pupil_r = max(2, int(eye_r * 0.65))
+    pupil_max = max(0.0, eye_r - pupil_r - 1.0)
+    pupil_off = pupil_dir * pupil_max
+    for side in (-1, 1):
+        eye_center = head_center + pygame.Vector2(side * eye_sep, eye_drop)
+        pygame.draw.circle(screen, (250, 250, 250), (int(eye_center.x), int(eye_center.y)), eye_r)
+        pupil_center = eye_center + pupil_off
+        pygame.draw.circle(screen, (20, 20, 20), (int(pupil_center.x), int(pupil_center.y)), pupil_r)
+
+
+def _render_player_sprite(pose: PlayerPose) -> tuple[pygame.Surface, tuple[int, int]]:
+    # Big enough for a fully extended arm, sword and shield in any direction.
+    half = int(settings.PLAYER_RADIUS + settings.PLAYER_SWING_DISTANCE * 0.8 + settings.SWORD_LENGTH * 1.4 + 20)
+    scratch = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+    _draw_player(scratch, pygame.Vector2(half, half), pose)
+    bounds = scratch.get_bounding_rect()
+    return scratch.subsurface(bounds).copy(), (half - bounds.x, half - bounds.y)
+
+
+def _render_player_dodge_sprite(pose: PlayerPose, angle: int, squash: int) -> tuple[pygame.Surface, tuple[int, int]]:
+    layer_size = max(220, int(settings.PLAYER_RADIUS * 7))
+    layer = pygame.Surface((layer_size, layer_size), pygame.SRCALPHA)
+    _draw_player(layer, pygame.Vector2(layer_size / 2, layer_size / 2), pose)
+    rotated = pygame.transform.rotozoom(layer, angle, 1.0)
+    knee_bend = squash / PLAYER_DODGE_SQUASH_STEPS
+    squash_x = 1.0 + 0.10 * knee_bend
+    squash_y = 1.0 - 0.22 * knee_bend
+    scaled_w = max(1, int(rotated.get_width() * squash_x))
+    scaled_h = max(1, int(rotated.get_height() * squash_y))
+    bent = pygame.transform.smoothscale(rotated, (scaled_w, scaled_h))
+    bounds = bent.get_bounding_rect()
+    return bent.subsurface(bounds).copy(), (scaled_w // 2 - bounds.x, scaled_h // 2 - bounds.y)
+
+
+def _get_player_sprite(key: tuple, render) -> tuple[pygame.Surface, tuple[int, int]]:
+    entry = _PLAYER_SPRITES.get(key)
+    if entry is None:
+        entry = render()
+        _PLAYER_SPRITES.put(key, entry)
+    return entry
+
+
+def _player_dodge_frame(player) -> tuple[int, int, float]:
+    """Roll angle and squash step for the current point in the dodge, plus the knee dip."""
+    dur = max(0.001, settings.DODGE_DURATION)
+    t = 1.0 - max(0.0, min(1.0, player.dodge_timer / dur))
+    phase = 0.5 - 0.5 * math.cos(math.pi * t)
+    roll_dir = pygame.Vector2(getattr(player, "dodge_dir", pygame.Vector2(0, 0)))
+    if roll_dir.length_squared() == 0:
+        roll_dir = pygame.Vector2(getattr(player, "facing", pygame.Vector2(0, -1)))
+    if roll_dir.length_squared() == 0:
+        roll_dir = pygame.Vector2(0, -1)
+    roll_dir = roll_dir.normalize()
+
+    # Rotate the sprite so the head leads the roll direction (head-first).
+    face_deg = math.degrees(math.atan2(roll_dir.x, -roll_dir.y))  # 0=up, 90=right, 180=down, -90=left
+
+    # Spin direction: pick a consistent "forward tumble" feel.
+    if abs(roll_dir.x) >= abs(roll_dir.y):
+        spin_sign = 1.0 if roll_dir.x < 0 else -1.0
+    else:
+        spin_sign = -1.0 if roll_dir.y > 0 else 1.0
+
+    tumble_deg = phase * 360.0 * spin_sign
+    angle = (-face_deg) + tumble_deg
+    angle = int(round(angle / PLAYER_DODGE_ANGLE_STEP)) * PLAYER_DODGE_ANGLE_STEP % 360
+    squash = int(round(math.sin(math.pi * t) * PLAYER_DODGE_SQUASH_STEPS))
+    return angle, squash, squash / PLAYER_DODGE_SQUASH_STEPS
+
+
+def draw_player_sprite(
+    surface: pygame.Surface,
+    player,
+    pos: pygame.Vector2,
+    move: pygame.Vector2,
+    time_tick: int,
+    scale: float = 1.0,
+):
+    """Draw the player centered on the screen position pos from the pose cache (scale: pixels per world pixel)."""
+    pose = player_pose(player, move, time_tick)
+    if pose.equipment != _PLAYER_SPRITE_EQUIPMENT[0]:
+        # New gear: the old poses won't be seen again.
+        _PLAYER_SPRITES.clear()
+        _PLAYER_SPRITE_EQUIPMENT[0] = pose.equipment
+    if not player.is_dodging:
+        sprite, (ox, oy) = _get_scaled_sprite(
+            _PLAYER_SPRITES, pose, scale, lambda: _get_player_sprite(pose, lambda: _render_player_sprite(pose))
+        )
+        surface.blit(sprite, (int(pos.x) - ox, int(pos.y) - oy))
+        return
+    # Rolling: legs and breathing are frozen so every roll reuses the same pre-rotated frames.
+    pose = replace(pose, leg_swing=0, bob=0)
+    angle, squash, knee_bend = _player_dodge_frame(player)
+    key = ("dodge", pose, angle, squash)
+    sprite, (ox, oy) = _get_scaled_sprite(
+        _PLAYER_SPRITES, key, scale, lambda: _get_player_sprite(key, lambda: _render_player_dodge_sprite(pose, angle, squash))
+    )
+    surface.blit(sprite, (int(pos.x) - ox, int(pos.y + knee_bend * 6 * scale) - oy))
+
+
+def player_sprite_cache_stats() -> dict:
+    """Hit/miss/eviction counters and memory use of the player sprite cache."""
+    return _PLAYER_SPRITES.stats()
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import pygame
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Pixel memory held by a surface."""
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfaceCache:
+    """LRU of surfaces bounded by the bytes they hold rather than how many there are.
+
+    Entries are surfaces by default; pass `sizeof` to store something else (e.g. a surface
+    plus its metadata) and say how many bytes it holds.
+    """
+
+    def __init__(self, budget_bytes: int, sizeof: Callable[[Any], int] = surface_bytes):
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizeof = sizeof
+        self.budget_bytes = max(0, int(budget_bytes))
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        # Membership checks (e.g. prefetch deciding what to warm) don't count as hits or misses.
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Any | None:
+        surface = self._entries.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return surface
+
+    def put(self, key: Hashable, surface: Any):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.used_bytes -= self._sizeof(old)
+        self._entries[key] = surface
+        self.used_bytes += self._sizeof(surface)
+        self._evict()
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        """Snapshot of the entries, oldest first (doesn't touch recency or stats)."""
+        return list(self._entries.items())
+
+    def pop(self, key: Hashable) -> Any | None:
+        surface = self._entries.pop(key, None)
+        if surface is not None:
+            self.used_bytes -= self._sizeof(surface)
+        return surface
+
+    def set_budget(self, budget_bytes: int):
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._evict()
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone is over budget.
+        while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+            _key, surface = self._entries.popitem(last=False)
+            self.used_bytes -= self._sizeof(surface)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.used_bytes = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,21 +1,78 @@
 from __future__ import annotations
 
-from collections import OrderedDict
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import hashlib
+import heapq
+import itertools
 import math
+import mmap
+import os
+import queue
 import random
+import struct
+import sys
+import threading
+import time
+import traceback
 from typing import Tuple
 
 import pygame
 
 import settings
-
-
-_FIELD_MAP_CACHE: dict[tuple[int, int, int, int], pygame.Surface] = {}
+from surface_cache import SurfaceCache
+
+
+_FIELD_MAP_CACHE = SurfaceCache(int(settings.FIELD_MAP_CACHE_MB * 1024 * 1024))
+_FIELD_MAP_PREBUILDS: dict[tuple, dict] = {}
+_FIELD_MAP_TILES = SurfaceCache(int(settings.FIELD_MAP_TILE_CACHE_MB * 1024 * 1024))
+# World tiles shrunk for the map's detail levels, kept apart so they never push out the field view's tiles.
+_FIELD_MAP_DETAIL_TILES = SurfaceCache(int(settings.FIELD_MAP_DETAIL_CACHE_MB * 1024 * 1024))
+# Detail map tiles still waiting on world tiles, and a version stamped whenever a map tile is repainted
+# (both only for tiles still in _FIELD_MAP_TILES).
+_FIELD_MAP_TILE_MISSING: dict[tuple, list[tuple[int, int]]] = {}
+_FIELD_MAP_TILE_VERSIONS: dict[tuple, int] = {}
+_FIELD_MAP_VERSION_SEQ = itertools.count(1)
+# Seconds the last main-thread detail render took (used to keep synchronous mode inside the budget).
+_FIELD_MAP_DETAIL_COST = [0.0]
 _FIELD_FEATURE_CACHE: dict[tuple[int, int], dict] = {}
-_FIELD_TILE_CACHE: "OrderedDict[tuple[int, int, int, int, int], pygame.Surface]" = OrderedDict()
+_FIELD_BIOME_EDGES: dict[tuple[int, int], tuple[list[float], list[float]]] = {}
+_FIELD_FEATURE_LOCK = threading.Lock()
+_FIELD_TILE_CACHE = SurfaceCache(int(settings.FIELD_TILE_CACHE_MB * 1024 * 1024))
+# Mip and zoom-scaled copies of field tiles, kept apart so they never push out the full tiles they come from.
+_FIELD_TILE_LOD_CACHE = SurfaceCache(int(settings.FIELD_TILE_LOD_CACHE_MB * 1024 * 1024))
+_FIELD_PLACEHOLDER_TILES: dict[tuple[int, int], pygame.Surface] = {}
+
+# Background tile generation: requests go into a priority heap, workers render them and
+# hand finished surfaces back through the ready queue (only the main thread touches the cache).
+_FIELD_TILE_COND = threading.Condition()
+_FIELD_TILE_REQUESTS: list[tuple[float, int, tuple[int, ...]]] = []
+_FIELD_TILE_PENDING: dict[tuple[int, ...], dict] = {}
+_FIELD_TILE_READY: "queue.SimpleQueue[tuple[tuple[int, ...], pygame.Surface]]" = queue.SimpleQueue()
+_FIELD_TILE_THREADS: list[threading.Thread] = []
+# Tiles whose generation raised, with the frame it happened (not re-queued for a while after).
+_FIELD_TILE_FAILED: dict[tuple[int, ...], int] = {}
+_FIELD_TILE_SEQ = itertools.count()
+_FIELD_TILE_FRAME = [0]
+_FIELD_CAMERA_TRACK: dict[str, pygame.Vector2 | None] = {"cam": None, "dir": pygame.Vector2(0, 0)}
+
+_FIELD_TILE_DISK_STATE: dict[str, str | None] = {"dir": None}
+_FIELD_TILE_STORES: dict[tuple[int, int, int], "FieldTileStore | None"] = {}
+_FIELD_TILE_BUNDLES: dict[tuple[int, int, int], "FieldTileBundle | None"] = {}
 
 FIELD_TILE_SIZE = 640
-FIELD_TILE_CACHE_MAX = 64
+# Mip levels kept per tile when zoomed out: full, half and quarter resolution.
+FIELD_TILE_LOD_LEVELS = 3
+# Queued tiles that haven't been asked for again within this many frames are dropped.
+FIELD_TILE_REQUEST_TTL_FRAMES = 30
+
+# Map overlay pyramid: tile size in pixels, levels (1x, 2x, 4x, 8x the whole-field fit), and the
+# first level built from world tiles rather than the upscaled overview.
+FIELD_MAP_TILE_SIZE = 256
+FIELD_MAP_LEVELS = 4
+FIELD_MAP_DETAIL_LEVEL = 2
+# Smallest world tile (in pixels) shrunk for the map's detail levels.
+FIELD_MAP_DETAIL_MIN_PIXELS = 16
 
 ENV_MARGIN = 24
 
@@ -124,22 +181,38 @@ def _snow_boundary_x(y: float, field_width: int, field_height: int, biomes: dict
     return base + jitter
 
 
+def _field_biome_edges(field_width: int, field_height: int, biomes: dict) -> tuple[list[float], list[float]]:
+    """Volcano edge for every integer column and snow edge for every integer row, computed once."""
+    key = (field_width, field_height)
+    edges = _FIELD_BIOME_EDGES.get(key)
+    if edges is None:
+        volcano = [_volcano_boundary_y(x, field_width, field_height, biomes) for x in range(int(biomes["volcano"]["w"]) + 1)]
+        snow = [_snow_boundary_x(y, field_width, field_height, biomes) for y in range(int(biomes["snow"]["h"]) + 1)]
+        edges = _FIELD_BIOME_EDGES[key] = (volcano, snow)
+    return edges
+
+
 def _is_in_volcano(x: float, y: float, field_width: int, field_height: int, biomes: dict) -> bool:
-    if _in_center_clear(x, y, biomes):
-        return False
     v = biomes["volcano"]
     if x < 0 or x > v["w"]:
         return False
-    return y >= _volcano_boundary_y(x, field_width, field_height, biomes)
+    # Tile generation asks at integer points thousands of times per tile; look those edges up.
+    if isinstance(x, int):
+        edge = _field_biome_edges(field_width, field_height, biomes)[0][x]
+    else:
+        edge = _volcano_boundary_y(x, field_width, field_height, biomes)
+    return y >= edge and not _in_center_clear(x, y, biomes)
 
 
 def _is_in_snow(x: float, y: float, field_width: int, field_height: int, biomes: dict) -> bool:
-    if _in_center_clear(x, y, biomes):
-        return False
     s = biomes["snow"]
     if y < 0 or y > s["h"]:
         return False
-    return x >= _snow_boundary_x(y, field_width, field_height, biomes)
+    if isinstance(y, int):
+        edge = _field_biome_edges(field_width, field_height, biomes)[1][y]
+    else:
+        edge = _snow_boundary_x(y, field_width, field_height, biomes)
+    return x >= edge and not _in_center_clear(x, y, biomes)
 
 
 def _clamp_rect_in_bounds(rect: pygame.Rect, width: int, height: int, margin: int = ENV_MARGIN) -> pygame.Rect:
@@ -213,11 +286,13 @@ def _draw_tree(surface: pygame.Surface, center: pygame.Vector2, size: int):
     pygame.draw.circle(surface, (20, 90, 40), (int(center.x + size * 0.18), int(center.y + size * 0.08)), int(size * 0.26), 2)
 
 
-def _draw_river_tile(tile: pygame.Surface, points_world: list[pygame.Vector2], width: int, tile_world: pygame.Rect):
-    local_pts = []
-    for p in points_world:
-        local_pts.append((int(p.x - tile_world.left), int(p.y - tile_world.top)))
-    if len(local_pts) < 2:
+def _draw_river_tile(tile: pygame.Surface, runs_world: list[list[pygame.Vector2]], width: int, tile_world: pygame.Rect):
+    runs = []
+    for run in runs_world:
+        local_pts = [(int(p.x - tile_world.left), int(p.y - tile_world.top)) for p in run]
+        if len(local_pts) >= 2:
+            runs.append(local_pts)
+    if not runs:
         return
 
     bank_outer = (25, 80, 40)
@@ -226,14 +301,16 @@ def _draw_river_tile(tile: pygame.Surface, points_world: list[pygame.Vector2], w
     water_dark = (25, 85, 150)
     shine = (170, 235, 255)
 
-    # Banks
-    pygame.draw.lines(tile, bank_outer, False, local_pts, width + 18)
-    pygame.draw.lines(tile, bank_inner, False, local_pts, width + 10)
-    # Water
-    pygame.draw.lines(tile, water_dark, False, local_pts, width + 4)
-    pygame.draw.lines(tile, water, False, local_pts, width)
-    # Small highlight stripe
-    pygame.draw.lines(tile, shine, False, local_pts, max(2, width // 5))
+    # Each pass covers every run before the next, as if the river were drawn in one piece.
+    for color, line_w in (
+        (bank_outer, width + 18),  # banks
+        (bank_inner, width + 10),
+        (water_dark, width + 4),  # water
+        (water, width),
+        (shine, max(2, width // 5)),  # small highlight stripe
+    ):
+        for local_pts in runs:
+            pygame.draw.lines(tile, color, False, local_pts, line_w)
 
 
 def _draw_mountain_tile(tile: pygame.Surface, center_world: pygame.Vector2, size: int, tile_world: pygame.Rect):
@@ -500,11 +577,11 @@ def get_field_environment_surface(field_width: int, field_height: int) -> pygame
         tiny = pygame.Surface((1, 1))
         tiny.fill((58, 145, 62))
         return tiny
-    key = (field_width, field_height)
-    cached = _FIELD_MAP_CACHE.get((0, 0, field_width, field_height))
+    key = ("environment", field_width, field_height)
+    cached = _FIELD_MAP_CACHE.get(key)
     if cached is None or cached.get_size() != (field_width, field_height):
         cached = build_field_environment_surface(field_width, field_height)
-        _FIELD_MAP_CACHE[(0, 0, field_width, field_height)] = cached
+        _FIELD_MAP_CACHE.put(key, cached)
     return cached
 
 
@@ -513,7 +590,16 @@ def _get_field_features(field_width: int, field_height: int) -> dict:
     cached = _FIELD_FEATURE_CACHE.get(key)
     if cached is not None:
         return cached
+    # Tile workers can ask for the features at the same time; only build them once.
+    with _FIELD_FEATURE_LOCK:
+        cached = _FIELD_FEATURE_CACHE.get(key)
+        if cached is None:
+            cached = _build_field_features(field_width, field_height)
+            _FIELD_FEATURE_CACHE[key] = cached
+    return cached
 
+
+def _build_field_features(field_width: int, field_height: int) -> dict:
     road_w = 120
     main_h = pygame.Rect(0, int(field_height * 0.58 - road_w / 2), field_width, road_w)
     main_v = pygame.Rect(int(field_width * 0.34 - road_w / 2), 0, road_w, field_height)
@@ -650,11 +736,90 @@ def _get_field_features(field_width: int, field_height: int) -> dict:
         "rivers": rivers,
         "mountains": mountain_peaks,
         "biomes": _get_field_biomes(field_width, field_height),
+        # Per tile size: which features each tile has to look at (see _get_field_tile_index).
+        "tile_index": {},
     }
-    _FIELD_FEATURE_CACHE[key] = features
     return features
 
 
+def _tiles_touching(rect: pygame.Rect, tile_size: int):
+    for ty in range(rect.top // tile_size, (rect.bottom - 1) // tile_size + 1):
+        for tx in range(rect.left // tile_size, (rect.right - 1) // tile_size + 1):
+            yield tx, ty
+
+
+def _build_field_tile_index(f: dict, tile_size: int) -> dict[tuple[int, int], dict]:
+    """Bucket the static features by the tiles they can touch (lists keep the drawing order)."""
+    index: dict[tuple[int, int], dict] = {}
+
+    def bucket(tx: int, ty: int) -> dict:
+        b = index.get((tx, ty))
+        if b is None:
+            b = {"houses": [], "walls": [], "farms": [], "ruins": [], "rivers": [], "river_near": [], "mountains": [], "mountain_near": []}
+            index[(tx, ty)] = b
+        return b
+
+    for i, r in enumerate(f["house_rects"]):
+        for t in _tiles_touching(r, tile_size):
+            bucket(*t)["houses"].append((i, r))
+    for wall in f["arena_walls"]:
+        for t in _tiles_touching(wall, tile_size):
+            bucket(*t)["walls"].append(wall)
+    for r in f["farms"]:
+        for t in _tiles_touching(r, tile_size):
+            bucket(*t)["farms"].append(r)
+    for i, r in enumerate(f["ruins"]):
+        for t in _tiles_touching(r, tile_size):
+            bucket(*t)["ruins"].append((i, r))
+
+    for rv in f.get("rivers", []):
+        # Only the runs of segments that can reach a tile are drawn into it.
+        pts: list[pygame.Vector2] = rv["points"]
+        reach = int(rv["width"]) // 2 + 12
+        segments: dict[tuple[int, int], list[int]] = {}
+        for i in range(len(pts) - 1):
+            a, b = pts[i], pts[i + 1]
+            seg = pygame.Rect(int(min(a.x, b.x)) - reach, int(min(a.y, b.y)) - reach, int(abs(a.x - b.x)) + reach * 2 + 2, int(abs(a.y - b.y)) + reach * 2 + 2)
+            for t in _tiles_touching(seg, tile_size):
+                segments.setdefault(t, []).append(i)
+        for t, seg_ids in segments.items():
+            runs: list[list[pygame.Vector2]] = []
+            for i in seg_ids:
+                if runs and runs[-1][-1] is pts[i]:
+                    runs[-1].append(pts[i + 1])
+                else:
+                    runs.append([pts[i], pts[i + 1]])
+            bucket(*t)["rivers"].append((runs, int(rv["width"])))
+        for t in _tiles_touching(rv["bounds"].inflate(140, 140), tile_size):
+            bucket(*t)["river_near"].append(rv)
+
+    for peak in f.get("mountains", []):
+        p: pygame.Vector2 = peak["pos"]
+        size = int(peak["size"])
+        reach = pygame.Rect(int(p.x) - size * 2 - 1, int(p.y) - size * 2 - 1, size * 4 + 3, size * 4 + 3)
+        for t in _tiles_touching(reach, tile_size):
+            bucket(*t)["mountains"].append(peak)
+        for t in _tiles_touching(pygame.Rect(int(p.x) - 241, int(p.y) - 241, 483, 483), tile_size):
+            bucket(*t)["mountain_near"].append(peak)
+    return index
+
+
+def _get_field_tile_index(field_width: int, field_height: int, tile_size: int) -> dict[tuple[int, int], dict]:
+    f = _get_field_features(field_width, field_height)
+    indexes: dict[int, dict] = f["tile_index"]
+    index = indexes.get(tile_size)
+    if index is None:
+        with _FIELD_FEATURE_LOCK:
+            index = indexes.get(tile_size)
+            if index is None:
+                index = _build_field_tile_index(f, tile_size)
+                indexes[tile_size] = index
+    return index
+
+
+_EMPTY_TILE_BUCKET = {"houses": (), "walls": (), "farms": (), "ruins": (), "rivers": (), "river_near": (), "mountains": (), "mountain_near": ()}
+
+
 def _draw_grass_tile(tile: pygame.Surface, tile_world: pygame.Rect):
     grass_base = (58, 145, 62)
     grass_light = (76, 175, 80)
@@ -854,18 +1019,14 @@ def _draw_tree_tile(surface: pygame.Surface, pos_world: pygame.Vector2, size: in
     _draw_tree(surface, local, size)
 
 
-def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, tile_y: int, tile_size: int = FIELD_TILE_SIZE) -> pygame.Surface:
-    key = (field_width, field_height, tile_size, tile_x, tile_y)
-    cached = _FIELD_TILE_CACHE.get(key)
-    if cached is not None:
-        _FIELD_TILE_CACHE.move_to_end(key)
-        return cached
-
+def _render_field_tile(field_width: int, field_height: int, tile_x: int, tile_y: int, tile_size: int = FIELD_TILE_SIZE) -> pygame.Surface:
+    """Draw one field tile from scratch (no caching; safe to call from worker threads)."""
     tile_world = pygame.Rect(tile_x * tile_size, tile_y * tile_size, tile_size, tile_size)
     tile = pygame.Surface((tile_size, tile_size))
     _draw_grass_tile(tile, tile_world)
 
     f = _get_field_features(field_width, field_height)
+    near = _get_field_tile_index(field_width, field_height, tile_size).get((tile_x, tile_y), _EMPTY_TILE_BUCKET)
     biomes = f.get("biomes")
     if biomes is not None:
         tile_rng = random.Random((tile_x * 92821) ^ (tile_y * 68917) ^ _biome_seed(field_width, field_height) ^ 7331)
@@ -884,7 +1045,6 @@ def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, ti
     lane_join: pygame.Rect = f["lane_join"]
     pond_rect: pygame.Rect = f["pond"]
     arena: pygame.Rect = f["arena"]
-    arena_walls: list[pygame.Rect] = f["arena_walls"]
     arena_door: pygame.Rect = f["arena_door"]
 
     def draw_rect(func, rect: pygame.Rect, *args, **kwargs):
@@ -902,7 +1062,7 @@ def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, ti
     draw_rect(_draw_road, lane)
     draw_rect(_draw_road, lane_join)
 
-    for i, r in enumerate(f["house_rects"]):
+    for i, r in near["houses"]:
         if not tile_world.colliderect(r):
             continue
         roof = (160, 80, 80) if i % 2 == 0 else (140, 90, 60)
@@ -914,7 +1074,7 @@ def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, ti
         pygame.draw.rect(tile, (55, 70, 60), yard, 3, border_radius=18)
     wall_fill = (130, 130, 140)
     wall_edge = (80, 80, 90)
-    for wall in arena_walls:
+    for wall in near["walls"]:
         if not tile_world.colliderect(wall):
             continue
         w = wall.move(-tile_world.left, -tile_world.top)
@@ -924,7 +1084,7 @@ def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, ti
         d = arena_door.move(-tile_world.left, -tile_world.top)
         pygame.draw.rect(tile, wall_edge, d.inflate(12, 8), 3)
 
-    for r in f["farms"]:
+    for r in near["farms"]:
         if not tile_world.colliderect(r):
             continue
         _draw_farm(tile, r.move(-tile_world.left, -tile_world.top))
@@ -935,8 +1095,7 @@ def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, ti
         pygame.draw.ellipse(tile, (170, 220, 255), pr.inflate(-18, -18), 4)
         pygame.draw.ellipse(tile, (20, 70, 120), pr, 4)
 
-    ruins = f["ruins"]
-    for idx, rr in enumerate(ruins):
+    for idx, rr in near["ruins"]:
         if not tile_world.colliderect(rr):
             continue
         rlocal = rr.move(-tile_world.left, -tile_world.top)
@@ -964,14 +1123,11 @@ def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, ti
         pygame.draw.polygon(tile, (70, 50, 70), roof, 5)
 
     # Rivers (decor)
-    for rv in f.get("rivers", []):
-        bounds: pygame.Rect = rv["bounds"]
-        if not tile_world.colliderect(bounds):
-            continue
-        _draw_river_tile(tile, rv["points"], int(rv["width"]), tile_world)
+    for runs, width in near["rivers"]:
+        _draw_river_tile(tile, runs, width, tile_world)
 
     # Mountains (decor)
-    for peak in f.get("mountains", []):
+    for peak in near["mountains"]:
         p: pygame.Vector2 = peak["pos"]
         size = int(peak["size"])
         if not tile_world.collidepoint(p.x, p.y):
@@ -981,8 +1137,8 @@ def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, ti
         _draw_mountain_tile(tile, p, size, tile_world)
 
     rng = random.Random((tile_x * 92821) ^ (tile_y * 68917) ^ (field_width * 37) ^ (field_height * 97) ^ 1337)
-    rivers = f.get("rivers", [])
-    mountains = f.get("mountains", [])
+    rivers = near["river_near"]
+    mountains = near["mountain_near"]
     tree_attempts = 10
     for _ in range(tree_attempts):
         x = rng.randrange(tile_world.left, tile_world.right)
@@ -1040,19 +1196,422 @@ def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, ti
         pygame.draw.circle(tile, rock_color, local, 20)
         pygame.draw.circle(tile, (180, 180, 180), (local[0] - 6, local[1] - 8), 8)
 
-    _FIELD_TILE_CACHE[key] = tile
-    _FIELD_TILE_CACHE.move_to_end(key)
-    while len(_FIELD_TILE_CACHE) > FIELD_TILE_CACHE_MAX:
-        _FIELD_TILE_CACHE.popitem(last=False)
     return tile
 
 
+def _field_tile_generator_version() -> str:
+    # Any edit to this module (where all tile drawing lives) produces a new version.
+    with open(__file__, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def _field_tile_disk_dir() -> str | None:
+    """Directory for this generator version's tiles (older versions are left where they are)."""
+    if not settings.FIELD_TILE_DISK_CACHE:
+        return None
+    cached = _FIELD_TILE_DISK_STATE["dir"]
+    if cached is not None:
+        return cached
+    root = settings.FIELD_TILE_DISK_CACHE_DIR
+    if not os.path.isabs(root):
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), root)
+    version = _field_tile_generator_version()
+    path = os.path.join(root, version)
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        return None
+    _FIELD_TILE_DISK_STATE["dir"] = path
+    return path
+
+
+def _field_surface_from_rgbx(data: mmap.mmap, start: int, size: tuple[int, int]) -> pygame.Surface:
+    """Surface over a copy of one raw RGBX record in a mapped file (disk cache and bundle share the layout)."""
+    with memoryview(data) as view:
+        pixels = bytearray(view[start : start + size[0] * size[1] * 4])
+    return pygame.image.frombuffer(pixels, size, "RGBX")
+
+
+class FieldTileStore:
+    """Disk cache for one world size: raw RGBX tiles appended to a single memory-mapped file.
+
+    Layout: a fixed header, a slot table with one uint32 per tile (0 = not stored yet, otherwise
+    record number + 1), then fixed-size records of tile_size * tile_size * 4 bytes. Loading a tile
+    is a slice of the map, so nothing has to be decompressed. A record is written before its slot
+    entry, so an interrupted write is never read back.
+    """
+
+    MAGIC = b"KGTC"
+    FORMAT = 1
+    HEADER = struct.Struct("<4sHIII")
+    SLOT = struct.Struct("<I")
+
+    def __init__(self, path: str, cols: int, rows: int, tile_size: int):
+        self.path = path
+        self.cols = cols
+        self.rows = rows
+        self.tile_size = tile_size
+        self.record_size = tile_size * tile_size * 4
+        self._table_offset = self.HEADER.size
+        self._data_offset = self._table_offset + cols * rows * self.SLOT.size
+        self._lock = threading.Lock()
+        self._map: mmap.mmap | None = None
+        mode = "r+b" if os.path.exists(path) else "w+b"
+        self._file = open(path, mode)
+        header = self._file.read(self.HEADER.size)
+        expected = (self.MAGIC, self.FORMAT, cols, rows, tile_size)
+        if len(header) != self.HEADER.size or self.HEADER.unpack(header) != expected:
+            # New file, or one written for another layout: start it over.
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(self.HEADER.pack(*expected))
+            self._file.write(b"\0" * (self._data_offset - self._table_offset))
+            self._file.flush()
+        self._file.seek(self._table_offset)
+        table = self._file.read(self._data_offset - self._table_offset)
+        self._slots = [entry[0] for entry in self.SLOT.iter_unpack(table)]
+        self._records = max(self._slots, default=0)
+
+    def _slot_index(self, tile_x: int, tile_y: int) -> int | None:
+        if 0 <= tile_x < self.cols and 0 <= tile_y < self.rows:
+            return tile_y * self.cols + tile_x
+        return None
+
+    def load(self, tile_x: int, tile_y: int) -> pygame.Surface | None:
+        index = self._slot_index(tile_x, tile_y)
+        if index is None:
+            return None
+        with self._lock:
+            slot = self._slots[index]
+            if slot == 0:
+                return None
+            start = self._data_offset + (slot - 1) * self.record_size
+            if self._map is None or len(self._map) < start + self.record_size:
+                # The file has grown since it was last mapped.
+                if self._map is not None:
+                    self._map.close()
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return _field_surface_from_rgbx(self._map, start, (self.tile_size, self.tile_size))
+
+    def save(self, tile_x: int, tile_y: int, tile: pygame.Surface):
+        index = self._slot_index(tile_x, tile_y)
+        if index is None or tile.get_size() != (self.tile_size, self.tile_size):
+            return
+        data = pygame.image.tobytes(tile, "RGBX")
+        with self._lock:
+            if self._slots[index]:
+                return
+            record = self._records
+            self._file.seek(self._data_offset + record * self.record_size)
+            self._file.write(data)
+            self._file.flush()
+            self._file.seek(self._table_offset + index * self.SLOT.size)
+            self._file.write(self.SLOT.pack(record + 1))
+            self._file.flush()
+            self._slots[index] = record + 1
+            self._records = record + 1
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+
+def _get_field_tile_store(field_width: int, field_height: int, tile_size: int) -> FieldTileStore | None:
+    """The disk cache for this world size and generator version (None when disabled or unavailable)."""
+    key = (field_width, field_height, tile_size)
+    with _FIELD_FEATURE_LOCK:
+        if key not in _FIELD_TILE_STORES:
+            store = None
+            base = _field_tile_disk_dir()
+            if base is not None:
+                cols = (field_width + tile_size - 1) // tile_size
+                rows = (field_height + tile_size - 1) // tile_size
+                path = os.path.join(base, f"{field_width}x{field_height}_{tile_size}.tiles")
+                try:
+                    store = FieldTileStore(path, cols, rows, tile_size)
+                except (OSError, ValueError, struct.error):
+                    store = None
+            _FIELD_TILE_STORES[key] = store
+        return _FIELD_TILE_STORES[key]
+
+
+def _load_field_tile_from_disk(key: tuple[int, int, int, int, int]) -> pygame.Surface | None:
+    field_width, field_height, tile_size, tile_x, tile_y = key
+    store = _get_field_tile_store(field_width, field_height, tile_size)
+    if store is None:
+        return None
+    try:
+        return store.load(tile_x, tile_y)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_field_tile_to_disk(key: tuple[int, int, int, int, int], tile: pygame.Surface):
+    field_width, field_height, tile_size, tile_x, tile_y = key
+    store = _get_field_tile_store(field_width, field_height, tile_size)
+    if store is None:
+        return
+    try:
+        store.save(tile_x, tile_y, tile)
+    except OSError:
+        pass
+
+
+class FieldTileBundle:
+    """Read-only view of a baked tile bundle (see `python -m world bake`).
+
+    Layout: a fixed header, the map overview as raw RGBX, then one raw RGBX record of
+    tile_size * tile_size * 4 bytes per tile in row-major order, so a tile is a slice of the map.
+    """
+
+    MAGIC = b"KGTB"
+    FORMAT = 2
+    HEADER = struct.Struct("<4sH16sIIIIIIIQQ")
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            fmt,
+            version,
+            self.field_width,
+            self.field_height,
+            self.tile_size,
+            self.cols,
+            self.rows,
+            self.map_width,
+            self.map_height,
+            self._map_offset,
+            self._tiles_offset,
+        ) = self.HEADER.unpack_from(self._data, 0)
+        if magic != self.MAGIC or fmt != self.FORMAT:
+            raise ValueError(f"{path} is not a field tile bundle")
+        self.record_size = self.tile_size * self.tile_size * 4
+        if len(self._data) < self._tiles_offset + self.cols * self.rows * self.record_size:
+            raise ValueError(f"{path} is truncated")
+        self.version = version.decode("ascii")
+
+    def matches(self, field_width: int, field_height: int, tile_size: int) -> bool:
+        return (
+            self.version == _field_tile_generator_version()
+            and (self.field_width, self.field_height, self.tile_size) == (field_width, field_height, tile_size)
+        )
+
+    def load_tile(self, tile_x: int, tile_y: int) -> pygame.Surface | None:
+        if not (0 <= tile_x < self.cols and 0 <= tile_y < self.rows):
+            return None
+        start = self._tiles_offset + (tile_y * self.cols + tile_x) * self.record_size
+        return _field_surface_from_rgbx(self._data, start, (self.tile_size, self.tile_size))
+
+    def load_overview(self, target_size: tuple[int, int]) -> pygame.Surface | None:
+        if self.map_width == 0 or (self.map_width, self.map_height) != tuple(target_size):
+            return None
+        return _field_surface_from_rgbx(self._data, self._map_offset, (self.map_width, self.map_height))
+
+
+def _field_tile_bundle_path() -> str:
+    path = settings.FIELD_TILE_BUNDLE_PATH
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    return path
+
+
+def _get_field_tile_bundle(field_width: int, field_height: int, tile_size: int) -> FieldTileBundle | None:
+    """The baked bundle, if streaming is on and there is one for this world size and generator version."""
+    if not settings.FIELD_TILE_BUNDLE:
+        return None
+    key = (field_width, field_height, tile_size)
+    with _FIELD_FEATURE_LOCK:
+        if key not in _FIELD_TILE_BUNDLES:
+            bundle = None
+            path = _field_tile_bundle_path()
+            if os.path.exists(path):
+                try:
+                    bundle = FieldTileBundle(path)
+                except (OSError, ValueError, struct.error):
+                    bundle = None
+                if bundle is not None and not bundle.matches(field_width, field_height, tile_size):
+                    bundle = None
+            _FIELD_TILE_BUNDLES[key] = bundle
+        return _FIELD_TILE_BUNDLES[key]
+
+
+def _load_or_render_field_tile(key: tuple[int, int, int, int, int]) -> pygame.Surface:
+    field_width, field_height, tile_size, tile_x, tile_y = key
+    bundle = _get_field_tile_bundle(field_width, field_height, tile_size)
+    if bundle is not None:
+        tile = bundle.load_tile(tile_x, tile_y)
+        if tile is not None:
+            return tile
+    tile = _load_field_tile_from_disk(key)
+    if tile is None:
+        tile = _render_field_tile(field_width, field_height, tile_x, tile_y, tile_size)
+        _save_field_tile_to_disk(key, tile)
+    return tile
+
+
+def _store_field_tile(key: tuple[int, int, int, int, int], tile: pygame.Surface):
+    _FIELD_TILE_CACHE.put(key, tile)
+
+
+def _get_field_tile_surface(field_width: int, field_height: int, tile_x: int, tile_y: int, tile_size: int = FIELD_TILE_SIZE) -> pygame.Surface:
+    key = (field_width, field_height, tile_size, tile_x, tile_y)
+    cached = _FIELD_TILE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    tile = _load_or_render_field_tile(key)
+    _store_field_tile(key, tile)
+    return tile
+
+
+def field_tile_lod(scale: float) -> int:
+    """Mip level whose resolution is closest to `scale` screen pixels per world pixel."""
+    if scale >= 1.0:
+        return 0
+    return max(0, min(FIELD_TILE_LOD_LEVELS - 1, int(round(math.log2(1.0 / scale)))))
+
+
+def _get_field_lod_tile(key: tuple[int, int, int, int, int], lod: int) -> pygame.Surface | None:
+    """Tile at 1/2**lod resolution, halved down from the next finer level (None until the base tile is cached)."""
+    if lod <= 0:
+        return _FIELD_TILE_CACHE.get(key)
+    lod_key = key + (lod,)
+    tile = _FIELD_TILE_LOD_CACHE.get(lod_key)
+    if tile is None:
+        finer = _get_field_lod_tile(key, lod - 1)
+        if finer is None:
+            return None
+        size = max(1, key[2] >> lod)
+        tile = pygame.transform.smoothscale(finer, (size, size))
+        _FIELD_TILE_LOD_CACHE.put(lod_key, tile)
+    return tile
+
+
+def _shrink_field_tile(tile: pygame.Surface, lod: int) -> pygame.Surface:
+    """Copy of a tile at 1/2**lod resolution (safe to call from worker threads)."""
+    if lod <= 0:
+        return tile
+    size = max(1, tile.get_width() >> lod)
+    return pygame.transform.smoothscale(tile, (size, size))
+
+
+def _get_field_scaled_tile(key: tuple[int, int, int, int, int], lod: int, pixels: int) -> pygame.Surface | None:
+    """Tile drawn `pixels` wide, scaled from the nearest mip level (camera zoom only takes a few values)."""
+    scaled_key = key + (lod, pixels)
+    tile = _FIELD_TILE_LOD_CACHE.get(scaled_key)
+    if tile is not None:
+        return tile
+    level = _get_field_lod_tile(key, lod)
+    if level is None or level.get_width() == pixels:
+        return level
+    tile = pygame.transform.smoothscale(level, (pixels, pixels))
+    _FIELD_TILE_LOD_CACHE.put(scaled_key, tile)
+    return tile
+
+
+def _fit_field_tile_cache(wanted_tiles: int, tile_size: int):
+    """Size the tile cache for the current working set (more tiles are on screen when zoomed out)."""
+    tile_bytes = tile_size * tile_size * 4
+    floor = settings.FIELD_TILE_CACHE_MB * 1024 * 1024
+    ceiling = max(floor, settings.FIELD_TILE_CACHE_MAX_MB * 1024 * 1024)
+    _FIELD_TILE_CACHE.set_budget(min(ceiling, max(floor, int(wanted_tiles * 1.5 * tile_bytes))))
+
+
+def field_tile_cache_stats() -> dict:
+    """Hit/miss/eviction counters and memory use of the field tile cache."""
+    return _FIELD_TILE_CACHE.stats()
+
+
+def field_lod_tile_cache_stats() -> dict:
+    """Hit/miss/eviction counters and memory use of the mip and zoom-scaled tile cache."""
+    return _FIELD_TILE_LOD_CACHE.stats()
+
+
 def get_field_map_surface(target_size: tuple[int, int], field_width: int, field_height: int) -> pygame.Surface:
     """Scaled 'image' of the environment for the map overlay."""
-    key = (target_size[0], target_size[1], field_width, field_height)
+    key = ("map", target_size[0], target_size[1], field_width, field_height)
     cached = _FIELD_MAP_CACHE.get(key)
     if cached is not None:
         return cached
+    surface = None
+    job = _FIELD_MAP_PREBUILDS.pop(key, None)
+    if job is not None:
+        job["thread"].join()
+        surface = job["surface"]
+    if surface is None:
+        bundle = _get_field_tile_bundle(field_width, field_height, FIELD_TILE_SIZE)
+        if bundle is not None:
+            surface = bundle.load_overview(target_size)
+    if surface is None:
+        source = _closest_larger_field_map(target_size, field_width, field_height)
+        if source is not None:
+            # A resize: shrink an overview we already have instead of drawing the map again.
+            surface = pygame.transform.smoothscale(source, target_size)
+    if surface is None:
+        surface = _render_field_map_surface(target_size, field_width, field_height)
+    _FIELD_MAP_CACHE.put(key, surface)
+    return surface
+
+
+def prebuild_field_map_surface(target_size: tuple[int, int], field_width: int, field_height: int):
+    """Start drawing the map overview on a background thread so the first map open doesn't stall."""
+    key = ("map", target_size[0], target_size[1], field_width, field_height)
+    if key in _FIELD_MAP_CACHE or key in _FIELD_MAP_PREBUILDS:
+        return
+    job: dict = {"surface": None}
+
+    def build():
+        bundle = _get_field_tile_bundle(field_width, field_height, FIELD_TILE_SIZE)
+        surface = bundle.load_overview(target_size) if bundle is not None else None
+        job["surface"] = surface or _render_field_map_surface(target_size, field_width, field_height)
+
+    # get_field_map_surface collects the result (the cache itself is only touched on the main thread).
+    job["thread"] = threading.Thread(target=build, name="field-map-prebuild", daemon=True)
+    _FIELD_MAP_PREBUILDS[key] = job
+    job["thread"].start()
+
+
+def _closest_larger_field_map(target_size: tuple[int, int], field_width: int, field_height: int) -> pygame.Surface | None:
+    best = None
+    for key, surface in _FIELD_MAP_CACHE.items():
+        if key[0] != "map" or key[3:] != (field_width, field_height):
+            continue
+        w, h = surface.get_size()
+        if w < target_size[0] or h < target_size[1]:
+            continue
+        # Only a map of (nearly) the same shape can be shrunk without stretching it.
+        if abs(w * target_size[1] - h * target_size[0]) > 0.01 * h * target_size[0]:
+            continue
+        if best is None or w * h < best.get_width() * best.get_height():
+            best = surface
+    return best
+
+
+def field_map_cache_stats() -> dict:
+    """Hit/miss/eviction counters and memory use of the map overview cache."""
+    return _FIELD_MAP_CACHE.stats()
+
+
+def _polyline_min_table(points: list[tuple[int, int]], length: int) -> list[float | None]:
+    """Smallest v the (u, v) polyline reaches at each integer u in [0, length); None where it doesn't reach."""
+    table: list[float | None] = [None] * length
+    for (u0, v0), (u1, v1) in zip(points, points[1:]):
+        if u1 < u0:
+            u0, v0, u1, v1 = u1, v1, u0, v0
+        for u in range(max(0, u0), min(length - 1, u1) + 1):
+            v = min(v0, v1) if u1 == u0 else v0 + (v1 - v0) * (u - u0) / (u1 - u0)
+            if table[u] is None or v < table[u]:
+                table[u] = v
+    return table
+
+
+def _render_field_map_surface(target_size: tuple[int, int], field_width: int, field_height: int) -> pygame.Surface:
     surface = pygame.Surface(target_size)
     w, h = target_size
     grass_base = (58, 145, 62)
@@ -1067,8 +1626,9 @@ def get_field_map_surface(target_size: tuple[int, int], field_width: int, field_
     biomes = _get_field_biomes(field_width, field_height)
     rng = random.Random(_biome_seed(field_width, field_height) ^ 9001)
 
+    # Biomes are drawn straight onto the map; the edge tables answer "is this point inside?"
+    # for the drawn outlines, so placement never has to read pixels back.
     # Volcano biome (bottom-left).
-    volcano = pygame.Surface((w, h), pygame.SRCALPHA)
     v_ash = (42, 38, 44)
     v_ash_dark = (28, 26, 30)
     v_lava = (255, 120, 40)
@@ -1083,24 +1643,30 @@ def get_field_map_surface(target_size: tuple[int, int], field_width: int, field_
         yw = _volcano_boundary_y(xw, field_width, field_height, biomes)
         v_boundary.append((int(xw * sx), int(yw * sy)))
     v_poly = [(0, h), (0, int((field_height - float(biomes["volcano"]["h"])) * sy))] + v_boundary + [(int(vw_world * sx), h)]
-    pygame.draw.polygon(volcano, v_ash, v_poly)
-    pygame.draw.lines(volcano, v_ash_dark, False, v_boundary, 6)
+    pygame.draw.polygon(surface, v_ash, v_poly)
+    pygame.draw.lines(surface, v_ash_dark, False, v_boundary, 6)
+    v_right = int(vw_world * sx)
+    v_top = _polyline_min_table(v_boundary, w)
+
+    def in_volcano(x: int, y: int) -> bool:
+        top = v_top[x] if x <= v_right else None
+        return top is not None and y >= top
 
     # Lava cracks (deterministic, within the biome)
     def _draw_map_lava_crack(points: list[tuple[int, int]], base_w: int):
         if len(points) < 2:
             return
-        pygame.draw.lines(volcano, v_ash_dark, False, points, base_w + 5)
-        pygame.draw.lines(volcano, v_lava, False, points, base_w)
-        pygame.draw.lines(volcano, v_lava_hot, False, points, max(2, base_w // 2))
+        pygame.draw.lines(surface, v_ash_dark, False, points, base_w + 5)
+        pygame.draw.lines(surface, v_lava, False, points, base_w)
+        pygame.draw.lines(surface, v_lava_hot, False, points, max(2, base_w // 2))
         for (px, py) in points:
-            pygame.draw.circle(volcano, v_lava, (px, py), max(2, base_w // 2))
-            pygame.draw.circle(volcano, v_lava_hot, (px, py), max(2, base_w // 3))
+            pygame.draw.circle(surface, v_lava, (px, py), max(2, base_w // 2))
+            pygame.draw.circle(surface, v_lava_hot, (px, py), max(2, base_w // 3))
 
     for _ in range(10):
         x = rng.randrange(0, max(1, int(w * 0.36)))
         y = rng.randrange(max(0, int(h * 0.60)), h)
-        if volcano.get_at((x, y)).a == 0:
+        if not in_volcano(x, y):
             continue
         base_w = rng.randrange(6, 10)
         segs = rng.randrange(4, 7)
@@ -1114,7 +1680,7 @@ def get_field_map_surface(target_size: tuple[int, int], field_width: int, field_
             nxt = cur + pygame.Vector2(math.cos(cur_ang), math.sin(cur_ang)) * step_len
             nx = int(max(0, min(w - 1, nxt.x)))
             ny = int(max(0, min(h - 1, nxt.y)))
-            if volcano.get_at((nx, ny)).a == 0:
+            if not in_volcano(nx, ny):
                 break
             if (nx, ny) != pts[-1]:
                 pts.append((nx, ny))
@@ -1132,7 +1698,7 @@ def get_field_map_surface(target_size: tuple[int, int], field_width: int, field_
                 nxt = cur + pygame.Vector2(math.cos(branch_ang), math.sin(branch_ang)) * (step_len * 0.85)
                 nx = int(max(0, min(w - 1, nxt.x)))
                 ny = int(max(0, min(h - 1, nxt.y)))
-                if volcano.get_at((nx, ny)).a == 0:
+                if not in_volcano(nx, ny):
                     break
                 if (nx, ny) != bpts[-1]:
                     bpts.append((nx, ny))
@@ -1143,16 +1709,13 @@ def get_field_map_surface(target_size: tuple[int, int], field_width: int, field_
     for _ in range(160):
         x = rng.randrange(0, int(w * 0.40))
         y = rng.randrange(int(h * 0.58), h)
-        if volcano.get_at((x, y)).a == 0:
+        if not in_volcano(x, y):
             continue
         r = rng.randrange(2, 6)
         col = (55, 50, 58) if rng.random() < 0.6 else (32, 30, 34)
-        pygame.draw.circle(volcano, col, (x, y), r)
-
-    surface.blit(volcano, (0, 0))
+        pygame.draw.circle(surface, col, (x, y), r)
 
     # Snow/ice biome (top-right).
-    snow = pygame.Surface((w, h), pygame.SRCALPHA)
     s_base = (200, 232, 250)
     s_ice = (160, 210, 245)
     s_shadow = (120, 170, 210)
@@ -1164,22 +1727,26 @@ def get_field_map_surface(target_size: tuple[int, int], field_width: int, field_
         xw = _snow_boundary_x(yw, field_width, field_height, biomes)
         s_boundary.append((int(xw * sx), int(yw * sy)))
     s_poly = [(w, 0), (int((field_width - float(biomes["snow"]["w"])) * sx), 0)] + s_boundary + [(w, int(sh_world * sy))]
-    pygame.draw.polygon(snow, s_base, s_poly)
-    pygame.draw.lines(snow, s_shadow, False, s_boundary, 5)
+    pygame.draw.polygon(surface, s_base, s_poly)
+    pygame.draw.lines(surface, s_shadow, False, s_boundary, 5)
+    s_bottom = int(sh_world * sy)
+    s_left = _polyline_min_table([(y, x) for x, y in s_boundary], h)
+
+    def in_snow(x: int, y: int) -> bool:
+        left = s_left[y] if y <= s_bottom else None
+        return left is not None and x >= left
 
     # Ice patches
     for _ in range(26):
         x = rng.randrange(max(0, int(w * 0.66)), w)
         y = rng.randrange(0, int(h * 0.32))
-        if snow.get_at((x, y)).a == 0:
+        if not in_snow(x, y):
             continue
         rw = rng.randrange(18, 52)
         rh = rng.randrange(10, 34)
         rect = pygame.Rect(x - rw // 2, y - rh // 2, rw, rh)
-        pygame.draw.ellipse(snow, s_ice, rect)
-        pygame.draw.ellipse(snow, s_shadow, rect, 2)
-
-    surface.blit(snow, (0, 0))
+        pygame.draw.ellipse(surface, s_ice, rect)
+        pygame.draw.ellipse(surface, s_shadow, rect, 2)
 
     # Wide open space in the middle: paint grass back over the biomes so it reads as a central plain.
     center = pygame.Vector2(int(biomes["clear"]["cx"] * sx), int(biomes["clear"]["cy"] * sy))
@@ -1187,23 +1754,536 @@ def get_field_map_surface(target_size: tuple[int, int], field_width: int, field_
     clear_rect.center = (int(center.x), int(center.y))
     pygame.draw.ellipse(surface, grass_base, clear_rect)
     pygame.draw.ellipse(surface, grass_light, clear_rect.inflate(-24, -24), 2)
-
-    _FIELD_MAP_CACHE[key] = surface
     return surface
 
 
-def blit_field_environment(screen: pygame.Surface, cam: pygame.Vector2, field_width: int, field_height: int):
-    screen_w, screen_h = screen.get_width(), screen.get_height()
+def _get_field_placeholder_tile(tile_size: int, tile_top: int) -> pygame.Surface:
+    """Plain grass shown while the real tile is still being generated."""
+    key = (tile_size, (-tile_top) % 40)
+    tile = _FIELD_PLACEHOLDER_TILES.get(key)
+    if tile is None:
+        tile = pygame.Surface((tile_size, tile_size))
+        _draw_grass_tile(tile, pygame.Rect(0, tile_top, tile_size, tile_size))
+        _FIELD_PLACEHOLDER_TILES[key] = tile
+    return tile
+
+
+def _field_tile_worker():
+    while True:
+        with _FIELD_TILE_COND:
+            while True:
+                while not _FIELD_TILE_REQUESTS:
+                    _FIELD_TILE_COND.wait()
+                priority, _seq, key = heapq.heappop(_FIELD_TILE_REQUESTS)
+                info = _FIELD_TILE_PENDING.get(key)
+                # Skip stale heap entries (re-queued with a new priority, or already being drawn).
+                if info is None or info["busy"] or info["priority"] != priority:
+                    continue
+                if _FIELD_TILE_FRAME[0] - info["frame"] > FIELD_TILE_REQUEST_TTL_FRAMES:
+                    del _FIELD_TILE_PENDING[key]
+                    continue
+                info["busy"] = True
+                break
+        try:
+            if len(key) > 5:
+                # Map detail request: shrink here so only the small copy reaches the main thread.
+                tile = _shrink_field_tile(_load_or_render_field_tile(key[:5]), key[5])
+            else:
+                tile = _load_or_render_field_tile(key)
+            _FIELD_TILE_READY.put((key, tile))
+        except Exception:
+            # Keep the worker alive; the tile stays on placeholder grass until it is retried.
+            sys.stderr.write(f"Field tile {key} failed to generate:\n{traceback.format_exc()}")
+            with _FIELD_TILE_COND:
+                _FIELD_TILE_FAILED[key] = _FIELD_TILE_FRAME[0]
+        with _FIELD_TILE_COND:
+            _FIELD_TILE_PENDING.pop(key, None)
+
+
+def start_field_tile_workers(count: int | None = None):
+    """Start the background tile generators, replacing any that have died (no-op if all are running)."""
+    if count is None:
+        count = int(settings.FIELD_TILE_WORKERS)
+    _FIELD_TILE_THREADS[:] = [worker for worker in _FIELD_TILE_THREADS if worker.is_alive()]
+    while len(_FIELD_TILE_THREADS) < count:
+        worker = threading.Thread(target=_field_tile_worker, name=f"field-tiles-{len(_FIELD_TILE_THREADS)}", daemon=True)
+        worker.start()
+        _FIELD_TILE_THREADS.append(worker)
+
+
+def request_field_tile(key: tuple[int, ...], priority: float):
+    """Queue a tile for background generation; lower priority values are drawn first.
+
+    A sixth key entry asks for the tile shrunk to mip level `lod` for the map (see _fill_field_map_tile).
+    """
+    with _FIELD_TILE_COND:
+        failed = _FIELD_TILE_FAILED.get(key)
+        if failed is not None:
+            if _FIELD_TILE_FRAME[0] - failed <= FIELD_TILE_REQUEST_TTL_FRAMES:
+                return
+            del _FIELD_TILE_FAILED[key]
+        info = _FIELD_TILE_PENDING.get(key)
+        if info is not None:
+            info["frame"] = _FIELD_TILE_FRAME[0]
+            if info["busy"] or info["priority"] <= priority:
+                return
+        _FIELD_TILE_PENDING[key] = {"priority": priority, "frame": _FIELD_TILE_FRAME[0], "busy": False}
+        heapq.heappush(_FIELD_TILE_REQUESTS, (priority, next(_FIELD_TILE_SEQ), key))
+        _FIELD_TILE_COND.notify()
+
+
+def _pump_field_tile_workers() -> bool:
+    """Once per drawn frame: start the workers, advance the request clock and take in finished tiles."""
+    if settings.FIELD_TILE_WORKERS <= 0:
+        return False
+    start_field_tile_workers()
+    _FIELD_TILE_FRAME[0] += 1
+    collect_ready_field_tiles()
+    return True
+
+
+def collect_ready_field_tiles() -> int:
+    """Move finished tiles from the workers into the tile cache. Returns how many arrived."""
+    count = 0
+    while True:
+        try:
+            key, tile = _FIELD_TILE_READY.get_nowait()
+        except queue.Empty:
+            return count
+        if len(key) > 5:
+            _FIELD_MAP_DETAIL_TILES.put(key, tile)
+        else:
+            _store_field_tile(key, tile)
+        count += 1
+
+
+def _field_tile_priority(tile_x: int, tile_y: int, tile_size: int, view_center: pygame.Vector2, move_dir: pygame.Vector2) -> float:
+    # Distance from the view center (in tiles), shrunk for tiles in the direction the camera is moving.
+    offset = pygame.Vector2((tile_x + 0.5) * tile_size, (tile_y + 0.5) * tile_size) - view_center
+    dist = offset.length() / tile_size
+    if dist > 0 and move_dir.length_squared() > 0:
+        ahead = max(0.0, move_dir.dot(offset) / (dist * tile_size))
+        dist *= 1.0 - 0.6 * ahead
+    return dist
+
+
+def _track_camera_direction(cam: pygame.Vector2) -> pygame.Vector2:
+    last = _FIELD_CAMERA_TRACK["cam"]
+    _FIELD_CAMERA_TRACK["cam"] = pygame.Vector2(cam)
+    if last is not None:
+        delta = cam - last
+        if delta.length_squared() > 0.25:
+            _FIELD_CAMERA_TRACK["dir"] = delta.normalize()
+        elif delta.length_squared() == 0:
+            _FIELD_CAMERA_TRACK["dir"] = pygame.Vector2(0, 0)
+    return pygame.Vector2(_FIELD_CAMERA_TRACK["dir"])
+
+
+def _field_layer_origin(cam: pygame.Vector2, scale: float) -> tuple[int, int]:
+    if scale == 1.0:
+        return int(cam.x), int(cam.y)
+    return round(cam.x * scale), round(cam.y * scale)
+
+
+def _draw_field_area(
+    target: pygame.Surface,
+    area: pygame.Rect,
+    origin: tuple[int, int],
+    field_width: int,
+    field_height: int,
+    scale: float,
+    move_dir: pygame.Vector2,
+    placeholders: dict | None = None,
+):
+    """Draw the tiles covering `area` of `target` (whose top-left sits at `origin` in scaled world pixels).
+
+    Tiles still being generated are drawn as placeholders and recorded in `placeholders`.
+    """
+    tile_size = FIELD_TILE_SIZE
+    full_res = scale == 1.0
+    lod = field_tile_lod(scale)
+    pixels = tile_size if full_res else int(math.ceil(tile_size * scale))
+    step = tile_size * scale
+    ox, oy = origin
+    start_x = max(0, int((ox + area.left) // step))
+    start_y = max(0, int((oy + area.top) // step))
+    end_x = min((field_width - 1) // tile_size, int((ox + area.right - 1) // step))
+    end_y = min((field_height - 1) // tile_size, int((oy + area.bottom - 1) // step))
+    background = settings.FIELD_TILE_WORKERS > 0
+    view_center = pygame.Vector2((ox + target.get_width() / 2) / scale, (oy + target.get_height() / 2) / scale)
+
+    clip = target.get_clip()
+    target.set_clip(area)
+    target.fill((0, 0, 0), area)
+    for ty in range(start_y, end_y + 1):
+        for tx in range(start_x, end_x + 1):
+            key = (field_width, field_height, tile_size, tx, ty)
+            if not background:
+                tile = _get_field_tile_surface(field_width, field_height, tx, ty, tile_size=tile_size)
+                if not full_res:
+                    tile = _get_field_scaled_tile(key, lod, pixels)
+            else:
+                tile = _FIELD_TILE_CACHE.get(key) if full_res else _get_field_scaled_tile(key, lod, pixels)
+            if full_res:
+                pos = (tx * tile_size - ox, ty * tile_size - oy)
+            else:
+                pos = (round(tx * step) - ox, round(ty * step) - oy)
+            if tile is None:
+                request_field_tile(key, _field_tile_priority(tx, ty, tile_size, view_center, move_dir))
+                tile = _get_field_placeholder_tile(pixels, ty * tile_size)
+                if placeholders is not None:
+                    placeholders[key] = pygame.Rect(pos, (pixels, pixels))
+            target.blit(tile, pos)
+    target.set_clip(clip)
+
+
+class FieldBackgroundLayer:
+    """Persistent copy of the ground under the camera.
+
+    Camera moves scroll the existing pixels and only the newly exposed strips are drawn
+    from tiles; placeholder tiles are patched once their real tile is ready.
+    """
+
+    def __init__(self):
+        self.surface: pygame.Surface | None = None
+        self._signature: tuple | None = None
+        self._origin = (0, 0)
+        self._placeholders: dict[tuple[int, int, int, int, int], pygame.Rect] = {}
+
+    def invalidate(self):
+        self.surface = None
+
+    def draw(
+        self,
+        screen: pygame.Surface,
+        cam: pygame.Vector2,
+        field_width: int,
+        field_height: int,
+        scale: float,
+        move_dir: pygame.Vector2,
+    ):
+        size = screen.get_size()
+        origin = _field_layer_origin(cam, scale)
+        signature = (size, field_width, field_height, scale)
+        redraw: list[pygame.Rect] = []
+        if self.surface is None or signature != self._signature:
+            self.surface = pygame.Surface(size)
+            self._signature = signature
+            self._placeholders.clear()
+            redraw.append(self.surface.get_rect())
+        else:
+            dx = origin[0] - self._origin[0]
+            dy = origin[1] - self._origin[1]
+            width, height = size
+            if abs(dx) >= width or abs(dy) >= height:
+                self._placeholders.clear()
+                redraw.append(self.surface.get_rect())
+            elif dx or dy:
+                self.surface.scroll(-dx, -dy)
+                bounds = self.surface.get_rect()
+                for key, rect in list(self._placeholders.items()):
+                    rect.move_ip(-dx, -dy)
+                    if not rect.colliderect(bounds):
+                        del self._placeholders[key]
+                if dx:
+                    redraw.append(pygame.Rect(width - dx, 0, dx, height) if dx > 0 else pygame.Rect(0, 0, -dx, height))
+                if dy:
+                    redraw.append(pygame.Rect(0, height - dy, width, dy) if dy > 0 else pygame.Rect(0, 0, width, -dy))
+        self._origin = origin
+
+        if self._placeholders:
+            self._patch_placeholders(origin, field_width, field_height, scale, move_dir)
+        for area in redraw:
+            _draw_field_area(self.surface, area, origin, field_width, field_height, scale, move_dir, self._placeholders)
+        screen.blit(self.surface, (0, 0))
+
+    def _patch_placeholders(
+        self,
+        origin: tuple[int, int],
+        field_width: int,
+        field_height: int,
+        scale: float,
+        move_dir: pygame.Vector2,
+    ):
+        bounds = self.surface.get_rect()
+        for key, rect in list(self._placeholders.items()):
+            if key not in _FIELD_TILE_CACHE:
+                # Still waiting; ask again so the request doesn't expire while it's on screen.
+                tx, ty = key[3], key[4]
+                view_center = pygame.Vector2((origin[0] + bounds.width / 2) / scale, (origin[1] + bounds.height / 2) / scale)
+                request_field_tile(key, _field_tile_priority(tx, ty, key[2], view_center, move_dir))
+                continue
+            del self._placeholders[key]
+            _draw_field_area(self.surface, rect.clip(bounds), origin, field_width, field_height, scale, move_dir, self._placeholders)
+
+
+_FIELD_BACKGROUND = FieldBackgroundLayer()
+
+
+def blit_field_environment(
+    screen: pygame.Surface,
+    cam: pygame.Vector2,
+    field_width: int,
+    field_height: int,
+    *,
+    scale: float = 1.0,
+):
+    """Draw the field tiles under the camera; `scale` is screen pixels per world pixel (camera zoom)."""
+    scale = scale if scale > 0 else 1.0
+    move_dir = pygame.Vector2(0, 0)
+    if _pump_field_tile_workers():
+        move_dir = _track_camera_direction(cam)
+
+    if settings.FIELD_BACKGROUND_SCROLL:
+        _FIELD_BACKGROUND.draw(screen, cam, field_width, field_height, scale, move_dir)
+    else:
+        origin = _field_layer_origin(cam, scale)
+        _draw_field_area(screen, screen.get_rect(), origin, field_width, field_height, scale, move_dir)
+
+
+def _field_tile_range(rect: pygame.Rect, tile_size: int, field_width: int, field_height: int) -> tuple[int, int, int, int]:
+    start_x = max(0, rect.left // tile_size)
+    start_y = max(0, rect.top // tile_size)
+    end_x = min((field_width - 1) // tile_size, (rect.right - 1) // tile_size)
+    end_y = min((field_height - 1) // tile_size, (rect.bottom - 1) // tile_size)
+    return start_x, start_y, end_x, end_y
+
+
+def prefetch_field_tiles(
+    cam: pygame.Vector2,
+    screen_size: tuple[int, int],
+    field_width: int,
+    field_height: int,
+    *,
+    velocity: pygame.Vector2 | None = None,
+    zoom: float = 1.0,
+):
+    """Warm a ring of tiles around the view, stretched toward where the player is heading."""
+    started = time.perf_counter()
+    budget = float(settings.FIELD_TILE_PREFETCH_BUDGET_MS) / 1000.0
     tile_size = FIELD_TILE_SIZE
-    start_x = max(0, int(cam.x) // tile_size)
-    start_y = max(0, int(cam.y) // tile_size)
-    end_x = min((field_width - 1) // tile_size, int((cam.x + screen_w) // tile_size) + 1)
-    end_y = min((field_height - 1) // tile_size, int((cam.y + screen_h) // tile_size) + 1)
+    ring = max(0, int(settings.FIELD_TILE_PREFETCH_RING))
+    zoom = zoom if zoom > 0 else 1.0
+    view = pygame.Rect(int(cam.x), int(cam.y), max(1, int(screen_size[0] / zoom)), max(1, int(screen_size[1] / zoom)))
+    warm = view.inflate(ring * tile_size * 2, ring * tile_size * 2)
+    if velocity is not None and velocity.length_squared() > 0:
+        ahead = velocity * float(settings.FIELD_TILE_PREFETCH_LOOKAHEAD)
+        warm.union_ip(warm.move(int(ahead.x), int(ahead.y)))
+
+    # Budget the cache so the warmed ring (plus the view) fits with some slack.
+    start_x, start_y, end_x, end_y = _field_tile_range(warm, tile_size, field_width, field_height)
+    _fit_field_tile_cache((end_x - start_x + 1) * (end_y - start_y + 1), tile_size)
+    if settings.FIELD_TILE_WORKERS <= 0:
+        # Without workers a single tile render can already take longer than the whole budget,
+        # so off-screen tiles are left to be drawn when they actually come into view.
+        return
 
+    visible = _field_tile_range(view, tile_size, field_width, field_height)
+    view_center = pygame.Vector2(view.center)
+    move_dir = velocity.normalize() if velocity is not None and velocity.length_squared() > 0 else pygame.Vector2(0, 0)
+    todo: list[tuple[float, int, int]] = []
     for ty in range(start_y, end_y + 1):
         for tx in range(start_x, end_x + 1):
-            tile = _get_field_tile_surface(field_width, field_height, tx, ty, tile_size=tile_size)
-            screen.blit(tile, (tx * tile_size - int(cam.x), ty * tile_size - int(cam.y)))
+            if visible[0] <= tx <= visible[2] and visible[1] <= ty <= visible[3]:
+                continue
+            if (field_width, field_height, tile_size, tx, ty) in _FIELD_TILE_CACHE:
+                continue
+            todo.append((_field_tile_priority(tx, ty, tile_size, view_center, move_dir), tx, ty))
+    todo.sort()
+
+    for priority, tx, ty in todo:
+        if time.perf_counter() - started > budget:
+            break
+        # Offset so anything on screen is always drawn before the prefetch ring.
+        request_field_tile((field_width, field_height, tile_size, tx, ty), 1000.0 + priority)
+
+
+def _field_map_level(zoom: float) -> int:
+    """Pyramid level to draw `zoom` from (always scaling tiles down, never up)."""
+    if zoom <= 1.0:
+        return 0
+    return min(FIELD_MAP_LEVELS - 1, math.ceil(math.log2(zoom) - 1e-6))
+
+
+def _field_map_level_rect(map_size: tuple[int, int], level: int, col: int, row: int) -> pygame.Rect:
+    """Pixels of map tile (col, row) within the whole map drawn at 2**level times the overview size."""
+    size = FIELD_MAP_TILE_SIZE
+    level_w, level_h = map_size[0] << level, map_size[1] << level
+    return pygame.Rect(col * size, row * size, size, size).clip(pygame.Rect(0, 0, level_w, level_h))
+
+
+def _build_field_map_tile(key: tuple, map_size: tuple[int, int], field_width: int, field_height: int) -> pygame.Surface:
+    _, _w, _h, _fw, _fh, level, col, row = key
+    rect = _field_map_level_rect(map_size, level, col, row)
+    factor = 1 << level
+    overview = get_field_map_surface(map_size, field_width, field_height)
+    src = pygame.Rect(rect.x // factor, rect.y // factor, max(1, math.ceil(rect.w / factor)), max(1, math.ceil(rect.h / factor)))
+    src = src.clip(overview.get_rect())
+    tile = pygame.transform.smoothscale(overview.subsurface(src), (src.w * factor, src.h * factor))
+    if tile.get_size() != rect.size:
+        tile = tile.subsurface(pygame.Rect((0, 0), rect.size)).copy()
+    if level >= FIELD_MAP_DETAIL_LEVEL:
+        # The upscaled overview is only a stand-in; world tiles are painted over it as they become available.
+        sx = (map_size[0] << level) / field_width
+        sy = (map_size[1] << level) / field_height
+        tile_size = FIELD_TILE_SIZE
+        tx0, tx1 = int(rect.left / sx) // tile_size, int((rect.right - 1) / sx) // tile_size
+        ty0, ty1 = int(rect.top / sy) // tile_size, int((rect.bottom - 1) / sy) // tile_size
+        _FIELD_MAP_TILE_MISSING[key] = [
+            (tx, ty)
+            for ty in range(max(0, ty0), min((field_height - 1) // tile_size, ty1) + 1)
+            for tx in range(max(0, tx0), min((field_width - 1) // tile_size, tx1) + 1)
+        ]
+    return tile
+
+
+def _field_map_detail_lod(pixels: int, tile_size: int) -> int:
+    """Smallest mip of a world tile that is still at least `pixels` wide."""
+    lod = 0
+    while (tile_size >> (lod + 1)) >= max(pixels, FIELD_MAP_DETAIL_MIN_PIXELS):
+        lod += 1
+    return lod
+
+
+def _get_field_map_detail_source(world_key: tuple[int, int, int, int, int], lod: int) -> pygame.Surface | None:
+    """A world tile shrunk to `lod` for the map, if it (or a field view copy to shrink) is already around."""
+    detail_key = world_key + (lod,)
+    if detail_key in _FIELD_MAP_DETAIL_TILES:
+        return _FIELD_MAP_DETAIL_TILES.get(detail_key)
+    # The field view may have this tile (or one of its mips) cached already; only peek, never add to it.
+    for view_lod in range(min(lod, FIELD_TILE_LOD_LEVELS - 1), -1, -1):
+        if view_lod:
+            view_key, view_cache = world_key + (view_lod,), _FIELD_TILE_LOD_CACHE
+        else:
+            view_key, view_cache = world_key, _FIELD_TILE_CACHE
+        if view_key in view_cache:
+            source = _shrink_field_tile(view_cache.get(view_key), lod - view_lod)
+            _FIELD_MAP_DETAIL_TILES.put(detail_key, source)
+            return source
+    return None
+
+
+def _fill_field_map_tile(key: tuple, tile: pygame.Surface, field_width: int, field_height: int, deadline: float) -> bool:
+    """Paint the world tiles that have arrived into a detail map tile; True if anything changed."""
+    missing = _FIELD_MAP_TILE_MISSING.get(key)
+    if not missing:
+        return False
+    _, map_w, map_h, _fw, _fh, level, col, row = key
+    rect = _field_map_level_rect((map_w, map_h), level, col, row)
+    sx = (map_w << level) / field_width
+    sy = (map_h << level) / field_height
+    tile_size = FIELD_TILE_SIZE
+    lod = _field_map_detail_lod(math.ceil(tile_size * max(sx, sy)) + 1, tile_size)
+    background = settings.FIELD_TILE_WORKERS > 0
+    changed = False
+    still_missing = []
+    for tx, ty in missing:
+        world_key = (field_width, field_height, tile_size, tx, ty)
+        priority = 500.0 + abs(tx - (rect.centerx / sx) / tile_size) + abs(ty - (rect.centery / sy) / tile_size)
+        if time.perf_counter() > deadline:
+            if background and world_key + (lod,) not in _FIELD_MAP_DETAIL_TILES:
+                request_field_tile(world_key + (lod,), priority)
+            still_missing.append((tx, ty))
+            continue
+        source = _get_field_map_detail_source(world_key, lod)
+        if source is None and background:
+            request_field_tile(world_key + (lod,), priority)
+            still_missing.append((tx, ty))
+            continue
+        if source is None:
+            # Drawing on the main thread: only start a tile the last one suggests still fits. The estimate
+            # decays while it blocks so one slow tile can't hold the detail back for good.
+            started = time.perf_counter()
+            if started + _FIELD_MAP_DETAIL_COST[0] > deadline:
+                _FIELD_MAP_DETAIL_COST[0] *= 0.9
+                still_missing.append((tx, ty))
+                continue
+            source = _shrink_field_tile(_load_or_render_field_tile(world_key), lod)
+            _FIELD_MAP_DETAIL_COST[0] = time.perf_counter() - started
+            _FIELD_MAP_DETAIL_TILES.put(world_key + (lod,), source)
+        left = round(tx * tile_size * sx) - rect.left
+        top = round(ty * tile_size * sy) - rect.top
+        width = round((tx + 1) * tile_size * sx) - rect.left - left
+        height = round((ty + 1) * tile_size * sy) - rect.top - top
+        tile.blit(pygame.transform.smoothscale(source, (max(1, width), max(1, height))), (left, top))
+        changed = True
+    if still_missing:
+        _FIELD_MAP_TILE_MISSING[key] = still_missing
+    else:
+        _FIELD_MAP_TILE_MISSING.pop(key, None)
+    return changed
+
+
+def _prune_field_map_tile_state():
+    """Forget the bookkeeping of map tiles that have been evicted from _FIELD_MAP_TILES."""
+    for state in (_FIELD_MAP_TILE_MISSING, _FIELD_MAP_TILE_VERSIONS):
+        for key in [key for key in state if key not in _FIELD_MAP_TILES]:
+            del state[key]
+
+
+def blit_field_map(
+    screen: pygame.Surface,
+    map_rect: pygame.Rect,
+    center_world: pygame.Vector2,
+    zoom: float,
+    field_width: int,
+    field_height: int,
+) -> bool:
+    """Draw the map overview into `map_rect`, `zoom` times the whole-field fit and centred on `center_world`.
+
+    Zoomed in, only the visible tiles of a pyramid level are scaled and drawn; the closer
+    levels are built from the world tiles so zooming in shows real detail. Returns True while
+    some of that detail is still on its way (drawing the same view again would look different).
+    """
+    map_size = map_rect.size
+    scale_x = map_rect.width / field_width * zoom
+    scale_y = map_rect.height / field_height * zoom
+    origin_x = map_rect.centerx - center_world.x * scale_x
+    origin_y = map_rect.centery - center_world.y * scale_y
+    if abs(zoom - 1.0) < 0.001:
+        screen.blit(get_field_map_surface(map_size, field_width, field_height), (int(origin_x), int(origin_y)))
+        return False
+
+    _pump_field_tile_workers()
+    deadline = time.perf_counter() + float(settings.FIELD_MAP_DETAIL_BUDGET_MS) / 1000.0
+    level = _field_map_level(zoom)
+    factor = zoom / (1 << level)
+    size = FIELD_MAP_TILE_SIZE
+    level_w, level_h = map_size[0] << level, map_size[1] << level
+    col0 = max(0, int((map_rect.left - origin_x) / factor) // size)
+    row0 = max(0, int((map_rect.top - origin_y) / factor) // size)
+    col1 = min((level_w - 1) // size, int((map_rect.right - origin_x) / factor) // size)
+    row1 = min((level_h - 1) // size, int((map_rect.bottom - origin_y) / factor) // size)
+
+    pending = False
+    for row in range(row0, row1 + 1):
+        for col in range(col0, col1 + 1):
+            key = ("tile", map_size[0], map_size[1], field_width, field_height, level, col, row)
+            tile = _FIELD_MAP_TILES.get(key)
+            if tile is None:
+                tile = _build_field_map_tile(key, map_size, field_width, field_height)
+                _FIELD_MAP_TILES.put(key, tile)
+                _FIELD_MAP_TILE_VERSIONS[key] = next(_FIELD_MAP_VERSION_SEQ)
+            if _fill_field_map_tile(key, tile, field_width, field_height, deadline):
+                _FIELD_MAP_TILE_VERSIONS[key] = next(_FIELD_MAP_VERSION_SEQ)
+            pending = pending or key in _FIELD_MAP_TILE_MISSING
+
+            rect = _field_map_level_rect(map_size, level, col, row)
+            left = round(origin_x + rect.left * factor)
+            top = round(origin_y + rect.top * factor)
+            width = round(origin_x + rect.right * factor) - left
+            height = round(origin_y + rect.bottom * factor) - top
+            if width <= 0 or height <= 0:
+                continue
+            # Zoom moves in wheel steps, so the scaled copies get reused while panning.
+            scaled_key = ("scaled", key, _FIELD_MAP_TILE_VERSIONS.get(key, 0), width, height)
+            scaled = _FIELD_MAP_TILES.get(scaled_key)
+            if scaled is None:
+                scaled = pygame.transform.smoothscale(tile, (width, height))
+                _FIELD_MAP_TILES.put(scaled_key, scaled)
+            screen.blit(scaled, (left, top))
+    _prune_field_map_tile_state()
+    return pending
 
 
 def draw_background(
@@ -1251,3 +2331,268 @@ def get_shopkeeper_rect(screen: pygame.Surface) -> pygame.Rect:
     rect = pygame.Rect(0, 0, w, h)
     rect.midbottom = (t_rect.centerx, t_rect.top - 6)
     return rect
+
+
+def _bake_field_tile(job: tuple[int, int, int, int, int]) -> tuple[int, int, bytes, float]:
+    field_width, field_height, tile_size, tile_x, tile_y = job
+    started = time.perf_counter()
+    tile = _render_field_tile(field_width, field_height, tile_x, tile_y, tile_size)
+    elapsed = time.perf_counter() - started
+    return tile_x, tile_y, pygame.image.tobytes(tile, "RGBX"), elapsed
+
+
+def bake_field_tiles(
+    path: str,
+    field_width: int,
+    field_height: int,
+    *,
+    tile_size: int = FIELD_TILE_SIZE,
+    overview_size: tuple[int, int] | None = None,
+    jobs: int | None = None,
+    timings_path: str | None = None,
+    report=print,
+) -> list[tuple[int, int, float]]:
+    """Render every field tile (across processes) plus the map overview into one bundle file.
+
+    Tiles are stored uncompressed (see FieldTileBundle), so the default field makes a bundle of
+    about 3.5 GB. Returns the (tile_x, tile_y, seconds) generation time of each tile.
+    """
+    cols = (field_width + tile_size - 1) // tile_size
+    rows = (field_height + tile_size - 1) // tile_size
+    jobs_list = [(field_width, field_height, tile_size, tx, ty) for ty in range(rows) for tx in range(cols)]
+    header = FieldTileBundle.HEADER
+    record_size = tile_size * tile_size * 4
+    version = _field_tile_generator_version().encode("ascii")
+    timings: list[tuple[int, int, float]] = []
+    started = time.perf_counter()
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as out:
+        map_w, map_h = overview_size or (0, 0)
+        if map_w <= 0 or map_h <= 0:
+            map_w = map_h = 0
+        map_offset = header.size
+        tiles_offset = map_offset + map_w * map_h * 4
+        out.write(
+            header.pack(
+                FieldTileBundle.MAGIC,
+                FieldTileBundle.FORMAT,
+                version,
+                field_width,
+                field_height,
+                tile_size,
+                cols,
+                rows,
+                map_w,
+                map_h,
+                map_offset,
+                tiles_offset,
+            )
+        )
+        if map_w > 0:
+            overview = _render_field_map_surface((map_w, map_h), field_width, field_height)
+            out.write(pygame.image.tobytes(overview, "RGBX"))
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_bake_field_tile, job) for job in jobs_list]
+            for done, future in enumerate(as_completed(futures), start=1):
+                tile_x, tile_y, pixels, elapsed = future.result()
+                # Tiles finish out of order; each one has a fixed slot.
+                out.seek(tiles_offset + (tile_y * cols + tile_x) * record_size)
+                out.write(pixels)
+                timings.append((tile_x, tile_y, elapsed))
+                if done % 100 == 0 or done == len(futures):
+                    report(f"  {done}/{len(futures)} tiles")
+    os.replace(tmp, path)
+
+    if timings_path:
+        with open(timings_path, "w", encoding="utf-8") as f:
+            f.write("tile_x,tile_y,ms\n")
+            for tile_x, tile_y, elapsed in sorted(timings):
+                f.write(f"{tile_x},{tile_y},{elapsed * 1000:.3f}\n")
+
+    times = sorted(t for _x, _y, t in timings)
+    if times:
+        total = sum(times)
+        report(
+            f"Baked {len(times)} tiles in {time.perf_counter() - started:.1f}s "
+            f"(tile time: mean {total / len(times) * 1000:.1f}ms, "
+            f"p50 {times[len(times) // 2] * 1000:.1f}ms, "
+            f"p95 {times[int(len(times) * 0.95)] * 1000:.1f}ms, max {times[-1] * 1000:.1f}ms)"
+        )
+        report("Slowest tiles:")
+        for tile_x, tile_y, elapsed in sorted(timings, key=lambda t: t[2], reverse=True)[:10]:
+            report(f"  ({tile_x}, {tile_y}) {elapsed * 1000:.1f}ms")
+    report(f"Wrote {path} ({os.path.getsize(path) / (1024 * 1024):.1f} MB)")
+    return timings
+
+
+def _time_summary(times: list[float]) -> str:
+    times = sorted(times)
+    return f"median {times[len(times) // 2] * 1000:.2f}ms, p95 {times[int(len(times) * 0.95)] * 1000:.2f}ms"
+
+
+def benchmark_field_tile_store(field_width: int, field_height: int, count: int = 90, *, tile_size: int = FIELD_TILE_SIZE, report=print) -> dict:
+    """Time drawing tiles against saving them to and loading them from a FieldTileStore.
+
+    Tiles are spread evenly over the field. Loads run after all saves, so they read from the
+    OS page cache rather than a cold disk.
+    """
+    import tempfile
+
+    cols = (field_width + tile_size - 1) // tile_size
+    rows = (field_height + tile_size - 1) // tile_size
+    total = cols * rows
+    picks = [(i * total // count) for i in range(min(count, total))]
+    coords = [(i % cols, i // cols) for i in picks]
+    _get_field_features(field_width, field_height)
+    render_times, save_times, load_times = [], [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FieldTileStore(os.path.join(tmp, "bench.tiles"), cols, rows, tile_size)
+        for tile_x, tile_y in coords:
+            started = time.perf_counter()
+            tile = _render_field_tile(field_width, field_height, tile_x, tile_y, tile_size)
+            render_times.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            store.save(tile_x, tile_y, tile)
+            save_times.append(time.perf_counter() - started)
+        for tile_x, tile_y in coords:
+            started = time.perf_counter()
+            store.load(tile_x, tile_y)
+            load_times.append(time.perf_counter() - started)
+        store.close()
+    report(f"{len(coords)} tiles of {tile_size}px:")
+    report(f"  draw  {_time_summary(render_times)}")
+    report(f"  save  {_time_summary(save_times)}")
+    report(f"  load  {_time_summary(load_times)}")
+    return {"render": render_times, "save": save_times, "load": load_times}
+
+
+class _FlatTileIndex(dict):
+    """Stand-in tile index that hands every tile the full feature lists (the pre-index behaviour)."""
+
+    def __init__(self, bucket: dict):
+        super().__init__()
+        self.bucket = bucket
+
+    def get(self, key, default=None):
+        return self.bucket
+
+
+def benchmark_field_tile_index(
+    field_width: int,
+    field_height: int,
+    count: int = 150,
+    *,
+    landmarks: int = 1,
+    tile_size: int = FIELD_TILE_SIZE,
+    report=print,
+) -> dict:
+    """Time drawing tiles with the per-tile feature index against scanning every feature.
+
+    ``landmarks`` multiplies the houses, farms, ruins and mountains with extra ones at seeded
+    random spots. The cached features are restored afterwards.
+    """
+    f = _get_field_features(field_width, field_height)
+    keys = ("house_rects", "farms", "ruins", "mountains", "tile_index")
+    saved = {k: f[k] for k in keys}
+    rng = random.Random(1)
+    extra = max(0, landmarks - 1)
+    cols = (field_width + tile_size - 1) // tile_size
+    rows = (field_height + tile_size - 1) // tile_size
+    coords = [(rng.randrange(cols), rng.randrange(rows)) for _ in range(count)]
+    try:
+        with _FIELD_FEATURE_LOCK:
+            f["house_rects"] = saved["house_rects"] + [
+                pygame.Rect(rng.randrange(field_width - 200), rng.randrange(field_height - 200), 140, 110)
+                for _ in range(len(saved["house_rects"]) * extra)
+            ]
+            f["farms"] = saved["farms"] + [
+                pygame.Rect(rng.randrange(field_width - 400), rng.randrange(field_height - 300), 360, 240)
+                for _ in range(len(saved["farms"]) * extra)
+            ]
+            f["ruins"] = saved["ruins"] + [
+                pygame.Rect(rng.randrange(field_width - 300), rng.randrange(field_height - 300), 220, 160)
+                for _ in range(len(saved["ruins"]) * extra)
+            ]
+            f["mountains"] = saved["mountains"] + [
+                {"pos": pygame.Vector2(rng.randrange(field_width), rng.randrange(field_height)), "size": rng.randrange(80, 160)}
+                for _ in range(len(saved["mountains"]) * extra)
+            ]
+            indexed = _build_field_tile_index(f, tile_size)
+            flat = _FlatTileIndex(
+                {
+                    "houses": list(enumerate(f["house_rects"])),
+                    "walls": list(f["arena_walls"]),
+                    "farms": list(f["farms"]),
+                    "ruins": list(enumerate(f["ruins"])),
+                    "rivers": [([rv["points"]], int(rv["width"])) for rv in f.get("rivers", [])],
+                    "river_near": list(f.get("rivers", [])),
+                    "mountains": list(f["mountains"]),
+                    "mountain_near": list(f["mountains"]),
+                }
+            )
+        times: dict[str, list[float]] = {"scan": [], "index": []}
+        # Alternate the passes so warm-up and clock drift hit both sides.
+        for name, index in (("scan", flat), ("index", indexed), ("scan", flat), ("index", indexed)):
+            f["tile_index"] = {tile_size: index}
+            for tile_x, tile_y in coords:
+                started = time.perf_counter()
+                _render_field_tile(field_width, field_height, tile_x, tile_y, tile_size)
+                times[name].append(time.perf_counter() - started)
+        total = sum(len(f[k]) for k in ("house_rects", "farms", "ruins", "mountains"))
+    finally:
+        with _FIELD_FEATURE_LOCK:
+            f.update(saved)
+    report(f"{len(coords)} tiles of {tile_size}px, {total} landmarks:")
+    report(f"  scan   {_time_summary(times['scan'])}, mean {sum(times['scan']) / len(times['scan']) * 1000:.2f}ms")
+    report(f"  index  {_time_summary(times['index'])}, mean {sum(times['index']) / len(times['index']) * 1000:.2f}ms")
+    return times
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m world", description="Overworld asset tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bake = sub.add_parser("bake", help="pre-render every field tile and the map overview into a bundle")
+    bake.add_argument("--out", default=_field_tile_bundle_path(), help="bundle file to write")
+    bake.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    bake.add_argument("--width", type=int, default=settings.FIELD_WORLD_WIDTH)
+    bake.add_argument("--height", type=int, default=settings.FIELD_WORLD_HEIGHT)
+    # Default overview size matches the map overlay rect in game.draw_game.
+    bake.add_argument(
+        "--overview-size",
+        default=f"{int(settings.SCREEN_WIDTH * 0.985)}x{int(settings.SCREEN_HEIGHT * 0.975)}",
+        help="map overview size as WxH (0x0 to skip)",
+    )
+    bake.add_argument("--timings", default=None, help="optional CSV file for per-tile generation times")
+    bench = sub.add_parser("bench", help="time drawing a tile against loading it from the disk cache")
+    bench.add_argument("--tiles", type=int, default=90, help="tiles to draw, save and load")
+    bench.add_argument("--width", type=int, default=settings.FIELD_WORLD_WIDTH)
+    bench.add_argument("--height", type=int, default=settings.FIELD_WORLD_HEIGHT)
+    bench_index = sub.add_parser("bench-index", help="time drawing tiles with the feature index against a full scan")
+    bench_index.add_argument("--tiles", type=int, default=150, help="tiles to draw per pass")
+    bench_index.add_argument("--landmarks", type=int, default=1, help="multiply the houses, farms, ruins and mountains")
+    bench_index.add_argument("--width", type=int, default=settings.FIELD_WORLD_WIDTH)
+    bench_index.add_argument("--height", type=int, default=settings.FIELD_WORLD_HEIGHT)
+    args = parser.parse_args(argv)
+
+    if args.command == "bake":
+        map_w, map_h = (int(v) for v in args.overview_size.lower().split("x"))
+        print(f"Baking {args.width}x{args.height} field into {args.out} ...")
+        bake_field_tiles(
+            args.out,
+            args.width,
+            args.height,
+            overview_size=(map_w, map_h),
+            jobs=args.jobs,
+            timings_path=args.timings,
+        )
+    elif args.command == "bench":
+        benchmark_field_tile_store(args.width, args.height, args.tiles)
+    elif args.command == "bench-index":
+        benchmark_field_tile_index(args.width, args.height, args.tiles, landmarks=args.landmarks)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())